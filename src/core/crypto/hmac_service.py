@@ -1,10 +1,35 @@
 import hmac
 import hashlib
 import logging
-from typing import Tuple
+import os
+from typing import Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Chain HMAC algorithms. SHA-256 is hardware accelerated (SHA-NI / ARMv8 SHA2)
+# through OpenSSL; SHA3-256 is kept so events written before the switch still
+# verify. The algorithm used is stored per event in ``hmac_alg``.
+HMAC_ALG_SHA256 = "sha256"
+HMAC_ALG_SHA3_256 = "sha3-256"
+HMAC_ALGORITHMS = {
+    HMAC_ALG_SHA256: hashlib.sha256,
+    HMAC_ALG_SHA3_256: hashlib.sha3_256,
+}
+# Rows that predate the hmac_alg column were written with SHA3-256.
+LEGACY_HMAC_ALG = HMAC_ALG_SHA3_256
+DEFAULT_HMAC_ALG = os.getenv("CONVERT_HMAC_ALG", HMAC_ALG_SHA256)
+if DEFAULT_HMAC_ALG not in HMAC_ALGORITHMS:
+    raise ValueError(f"Unsupported CONVERT_HMAC_ALG: {DEFAULT_HMAC_ALG}")
+
+
+def hmac_digestmod(alg: str):
+    """Return the hashlib constructor for a stored ``hmac_alg`` value."""
+    try:
+        return HMAC_ALGORITHMS[alg]
+    except KeyError:
+        raise ValueError(f"Unsupported HMAC algorithm: {alg}") from None
+
+
 class HMACService:
     def __init__(self, master_keys: dict[str, bytes]):
         """
@@ -22,14 +47,16 @@ class HMACService:
         self.current_version = sorted(master_keys.keys())[-1]
         logger.info(f"HMACService initialized. Active Key Version: {self.current_version}")
 
-    def _hkdf_expand(self, pseudo_random_key: bytes, info: bytes, length: int = 32) -> bytes:
+    def _hkdf_expand(
+        self, pseudo_random_key: bytes, info: bytes, length: int = 32, hmac_alg: str = DEFAULT_HMAC_ALG
+    ) -> bytes:
         """
-        HKDF-Expand (RFC 5869) using HMAC-SHA3-256.
+        HKDF-Expand (RFC 5869) using HMAC with the given algorithm.
         """
+        digestmod = hmac_digestmod(hmac_alg)
         t = b""
         okm = b""
         i = 0
-        digest_size = hashlib.sha3_256().digest_size
         
         while len(okm) < length:
             i += 1
@@ -37,12 +64,14 @@ class HMACService:
                 raise ValueError("Cannot expand to more than 255 blocks")
             
             msg = t + info + bytes([i])
-            t = hmac.new(pseudo_random_key, msg, hashlib.sha3_256).digest()
+            t = hmac.new(pseudo_random_key, msg, digestmod).digest()
             okm += t
             
         return okm[:length]
 
-    def _derive_stream_key(self, master_key: bytes, stream_id: str) -> bytes:
+    def _derive_stream_key(
+        self, master_key: bytes, stream_id: str, hmac_alg: str = DEFAULT_HMAC_ALG
+    ) -> bytes:
         """
         Derive a unique key for a specific stream using HKDF.
         Salt is empty (or could be stream_type if needed).
@@ -51,40 +80,103 @@ class HMACService:
         # HKDF-Extract (Salt=None -> 0s)
         # For simplicity and since master_key is high entropy, we can use it directly as PRK 
         # or strictly follow RFC. Let's follow RFC with 0-salt.
-        salt = bytes([0] * hashlib.sha3_256().digest_size)
-        prk = hmac.new(salt, master_key, hashlib.sha3_256).digest()
+        digestmod = hmac_digestmod(hmac_alg)
+        salt = bytes(digestmod().digest_size)
+        prk = hmac.new(salt, master_key, digestmod).digest()
         
         # HKDF-Expand
         info = stream_id.encode('utf-8')
-        return self._hkdf_expand(prk, info, length=32)
+        return self._hkdf_expand(prk, info, length=32, hmac_alg=hmac_alg)
 
-    def sign(self, payload_bytes: bytes, stream_id: str, key_version: str | None = None) -> Tuple[str, str]:
+    def sign(
+        self,
+        payload_bytes: bytes,
+        stream_id: str,
+        key_version: str | None = None,
+        hmac_alg: str = DEFAULT_HMAC_ALG,
+    ) -> Tuple[str, str]:
         """
         Sign payload bytes.
+        ``hmac_alg`` selects the digest for both the stream key and the MAC.
         
         Returns:
             (hmac_hex, key_version_used)
         """
+        digest, version = self.sign_digest(payload_bytes, stream_id, key_version, hmac_alg)
+        return digest.hex(), version
+
+    def sign_digest(
+        self,
+        payload_bytes: bytes,
+        stream_id: str,
+        key_version: str | None = None,
+        hmac_alg: str = DEFAULT_HMAC_ALG,
+    ) -> Tuple[bytes, str]:
+        """
+        Sign payload bytes, returning the raw digest (what BLOB columns store).
+        
+        Returns:
+            (hmac_digest, key_version_used)
+        """
         version = key_version or self.current_version
         if version not in self.master_keys:
             raise ValueError(f"Unknown key version: {version}")
             
-        master_key = self.master_keys[version]
-        stream_key = self._derive_stream_key(master_key, stream_id)
-        
-        hmac_obj = hmac.new(stream_key, payload_bytes, hashlib.sha3_256)
-        return hmac_obj.hexdigest(), version
+        hmac_obj = self._stream_hmac(stream_id, version, hmac_alg)
+        hmac_obj.update(payload_bytes)
+        return hmac_obj.digest(), version
 
-    def verify(self, payload_bytes: bytes, hmac_hex: str, stream_id: str, key_version: str) -> bool:
+    def _stream_hmac(self, stream_id: str, key_version: str, hmac_alg: str) -> "hmac.HMAC":
         """
-        Verify HMAC for a payload.
+        Keyed HMAC object with no message yet. ``.copy()`` it per message to
+        skip the stream key derivation and ipad/opad setup.
+        """
+        master_key = self.master_keys[key_version]
+        stream_key = self._derive_stream_key(master_key, stream_id, hmac_alg)
+        return hmac.new(stream_key, None, hmac_digestmod(hmac_alg))
+
+    def verify(
+        self,
+        payload_bytes: bytes,
+        stored_hmac: bytes | str,
+        stream_id: str,
+        key_version: str,
+        hmac_alg: str = DEFAULT_HMAC_ALG,
+    ) -> bool:
+        """
+        Verify HMAC for a payload against the algorithm it was stored with.
+        ``stored_hmac`` is the raw digest, or its hex form for legacy TEXT rows.
+        """
+        return self.verify_many((payload_bytes,), (stored_hmac,), stream_id, key_version, hmac_alg) == 1
+
+    def verify_many(
+        self,
+        payloads: Sequence[bytes],
+        stored_hmacs: Sequence[bytes | str],
+        stream_id: str,
+        key_version: str,
+        hmac_alg: str = DEFAULT_HMAC_ALG,
+    ) -> int:
+        """
+        Verify a run of payloads signed with the same stream key.
+        Stored HMACs are raw digests (BLOB) or hex strings (legacy TEXT rows).
+        
+        Returns:
+            Number of leading entries that verified (len(payloads) if all did)
         """
         if key_version not in self.master_keys:
             logger.warning(f"Verification failed: Unknown key version {key_version}")
-            return False
-            
-        expected_hmac, _ = self.sign(payload_bytes, stream_id, key_version)
-        return hmac.compare_digest(expected_hmac, hmac_hex)
+            return 0
+        
+        template = self._stream_hmac(stream_id, key_version, hmac_alg)
+        compare_digest = hmac.compare_digest
+        for i, (payload, stored) in enumerate(zip(payloads, stored_hmacs)):
+            h = template.copy()
+            h.update(payload)
+            expected = h.hexdigest() if type(stored) is str else h.digest()
+            if not compare_digest(expected, stored):
+                return i
+        return len(payloads)
 
     def rotate_key(self, new_master_key: bytes) -> str:
         """
@@ -76,6 +76,7 @@ class EncryptedIndexerDB:
         self._key = key
         self._key_source = key_source
         self._conn = None
+        self._cursor = None
         self._secret_box = None
         self._use_sqlcipher = SQLCIPHER_AVAILABLE
     
@@ -102,6 +103,9 @@ class EncryptedIndexerDB:
         # Ensure parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # The cached cursor belongs to the connection being replaced
+        self._cursor = None
+        
         if self._use_sqlcipher and SQLCIPHER_AVAILABLE:
             return self._connect_sqlcipher(key)
         elif PYNACL_AVAILABLE:
@@ -286,6 +290,7 @@ class EncryptedIndexerDB:
         if self._conn:
             self._conn.close()
             self._conn = None
+        self._cursor = None
         self._secret_box = None
     
     def execute(self, sql: str, params: tuple = ()) -> Any:
@@ -294,10 +299,28 @@ class EncryptedIndexerDB:
             self.connect()
         return self._conn.execute(sql, params)
     
+    def cursor(self) -> Any:
+        """
+        Get the cached write cursor for this connection.
+        
+        Reused across calls so hot insert paths do not allocate a new
+        cursor per statement; dropped on close() and on reconnect.
+        """
+        if not self._conn:
+            self.connect()
+        if self._cursor is None:
+            self._cursor = self._conn.cursor()
+        return self._cursor
+    
     def commit(self) -> None:
         """Commit current transaction."""
         if self._conn:
             self._conn.commit()
+    
+    def rollback(self) -> None:
+        """Roll back current transaction."""
+        if self._conn:
+            self._conn.rollback()
 
 
 def get_encryption_key_from_keyring(
@@ -15,7 +15,7 @@ This fallback ensures tests can run immediately.
 
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
 try:
     from docx import Document
@@ -26,6 +26,21 @@ except ImportError:
 from .result import ExtractionResult, TextSegment, ExtractionError
 
 
+def flatten_table(rows: Iterable[List[str]]) -> str:
+    """
+    Flatten table rows into tab-separated, newline-joined text.
+    
+    Cells are trimmed and rows with no text are dropped.
+    """
+    table_text_parts = []
+    for cells in rows:
+        # Strip each cell once; a row is blank iff every stripped cell is
+        stripped = [cell.strip() for cell in cells]
+        if any(stripped):
+            table_text_parts.append("\t".join(stripped))
+    return "\n".join(table_text_parts)
+
+
 class DOCXExtractor:
     """
     Python-docx based DOCX text extractor (fallback).
@@ -44,11 +59,17 @@ class DOCXExtractor:
     VERSION = "1.0.0-python-fallback"
     EXTRACTOR_NAME = "docx_python"
     
-    def __init__(self):
+    def __init__(self, include_core_props: bool = False):
+        """
+        Args:
+            include_core_props: Also parse docProps/core.xml (title, author,
+                dates). Off for indexing, which never reads them.
+        """
         if not PYTHON_DOCX_AVAILABLE:
             raise RuntimeError(
                 "python-docx not available. Install with: pip install python-docx"
             )
+        self._include_core_props = include_core_props
     
     def extract(self, file_path: Path) -> ExtractionResult:
         """
@@ -98,7 +119,7 @@ class DOCXExtractor:
             for idx, para in enumerate(doc.paragraphs):
                 text = para.text.strip()
                 if text:  # Only add non-empty paragraphs
-                    result.segments.append(TextSegment(
+                    result.add_segment(TextSegment(
                         text=text,
                         page=None,
                         section=f"paragraph_{idx}",
@@ -109,15 +130,12 @@ class DOCXExtractor:
             # Extract tables
             table_count = 0
             for table_idx, table in enumerate(doc.tables):
-                table_text_parts = []
-                for row in table.rows:
-                    row_text = "\t".join(cell.text.strip() for cell in row.cells)
-                    if row_text.strip():
-                        table_text_parts.append(row_text)
+                table_text = flatten_table(
+                    [cell.text for cell in row.cells] for row in table.rows
+                )
                 
-                if table_text_parts:
-                    table_text = "\n".join(table_text_parts)
-                    result.segments.append(TextSegment(
+                if table_text:
+                    result.add_segment(TextSegment(
                         text=table_text,
                         page=None,
                         section=f"table_{table_idx}",
@@ -131,22 +149,23 @@ class DOCXExtractor:
                 "table_count": table_count,
             }
             
-            # Try to extract core properties
-            try:
-                core_props = doc.core_properties
-                if core_props.title:
-                    result.metadata["title"] = core_props.title
-                if core_props.author:
-                    result.metadata["author"] = core_props.author
-                if core_props.subject:
-                    result.metadata["subject"] = core_props.subject
-                if core_props.created:
-                    result.metadata["created"] = str(core_props.created)
-                if core_props.modified:
-                    result.metadata["modified"] = str(core_props.modified)
-            except Exception:
-                # Metadata extraction is non-critical
-                pass
+            # Core properties cost a second XML parse; only on request
+            if self._include_core_props:
+                try:
+                    core_props = doc.core_properties
+                    if core_props.title:
+                        result.metadata["title"] = core_props.title
+                    if core_props.author:
+                        result.metadata["author"] = core_props.author
+                    if core_props.subject:
+                        result.metadata["subject"] = core_props.subject
+                    if core_props.created:
+                        result.metadata["created"] = str(core_props.created)
+                    if core_props.modified:
+                        result.metadata["modified"] = str(core_props.modified)
+                except Exception:
+                    # Metadata extraction is non-critical
+                    pass
                 
         except Exception as e:
             result.add_error(
@@ -162,7 +181,7 @@ class DOCXExtractor:
 
 def extract_docx(file_path: Path) -> ExtractionResult:
     """
-    Convenience function for DOCX extraction.
+    Convenience function for DOCX extraction (includes core properties).
     
     Args:
         file_path: Path to DOCX file
@@ -170,5 +189,5 @@ def extract_docx(file_path: Path) -> ExtractionResult:
     Returns:
         ExtractionResult
     """
-    extractor = DOCXExtractor()
+    extractor = DOCXExtractor(include_core_props=True)
     return extractor.extract(file_path)
@@ -9,8 +9,10 @@ Ensures consistent behavior and graceful degradation.
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class TextSegment:
     """
     Single text segment with metadata.
@@ -23,15 +25,18 @@ class TextSegment:
     section: Optional[str] = None
     confidence: float = 1.0  # 0.0-1.0, for OCR or uncertain extractions
     
-    def __post_init__(self):
-        """Validate segment data"""
-        if not isinstance(self.text, str):
-            raise TypeError("text must be a string")
-        if self.confidence < 0.0 or self.confidence > 1.0:
-            raise ValueError("confidence must be between 0.0 and 1.0")
+    # Defined only in debug builds: under python -O the dataclass has no
+    # __post_init__ at all, so extractor hot loops pay nothing for it.
+    if __debug__:
+        def __post_init__(self):
+            """Validate segment data"""
+            if not isinstance(self.text, str):
+                raise TypeError("text must be a string")
+            if not 0.0 <= self.confidence <= 1.0:
+                raise ValueError("confidence must be between 0.0 and 1.0")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionError:
     """
     Extraction error details.
@@ -53,7 +58,7 @@ class ExtractionError:
     FILE_NOT_FOUND = "FILE_NOT_FOUND"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     """
     Standardized extraction result (v2.0 IRON-CLAD).
@@ -83,6 +88,38 @@ class ExtractionResult:
     extractor: str = "unknown"  # "pdf_pymupdf", "docx_rust", etc.
     version: str = "1.0"  # Extractor version
     
+    # Incremental aggregates (maintained by add_segment)
+    _text_parts: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _total_chars: int = field(default=0, init=False, repr=False, compare=False)
+    _total_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _sync_aggregates(self) -> None:
+        """
+        Bring the cached aggregates in line with the public segments list.
+        
+        The cache is valid while every cached part is the very string object
+        its segment still holds; an identity pass catches segments that were
+        replaced, removed, edited in place or swapped in with a new list.
+        Segments appended without add_segment() are folded in.
+        
+        Only the readers (total_text, total_chars) pay for this pass;
+        add_segment() stays O(1) and any drift it leaves is caught here.
+        """
+        parts = self._text_parts
+        segments = self.segments
+        if len(parts) > len(segments) or not all(
+            seg.text is part for seg, part in zip(segments, parts)
+        ):
+            parts = self._text_parts = []
+            self._total_chars = 0
+            self._total_text = None
+        if len(parts) == len(segments):
+            return
+        for seg in segments[len(parts):]:
+            parts.append(seg.text)
+            self._total_chars += len(seg.text)
+        self._total_text = None
+    
     @property
     def success(self) -> bool:
         """True if extraction succeeded without errors"""
@@ -95,13 +132,24 @@ class ExtractionResult:
     
     @property
     def total_text(self) -> str:
-        """Concatenate all segment text"""
-        return "\n\n".join(seg.text for seg in self.segments)
+        """Concatenate all segment text (cached until the next segment)"""
+        self._sync_aggregates()
+        if self._total_text is None:
+            self._total_text = "\n\n".join(self._text_parts)
+        return self._total_text
     
     @property
     def total_chars(self) -> int:
         """Total character count across all segments"""
-        return sum(len(seg.text) for seg in self.segments)
+        self._sync_aggregates()
+        return self._total_chars
+    
+    def add_segment(self, segment: TextSegment) -> None:
+        """Append a segment and update the cached aggregates"""
+        self.segments.append(segment)
+        self._text_parts.append(segment.text)
+        self._total_chars += len(segment.text)
+        self._total_text = None
     
     def add_error(self, code: str, message: str, recoverable: bool = False) -> None:
         """Add an error to the result"""
@@ -111,6 +159,30 @@ class ExtractionResult:
             recoverable=recoverable
         ))
     
+    def to_json(self) -> bytes:
+        """
+        Serialize to JSON bytes.
+        
+        Segments and errors are dataclasses, so orjson walks them in C
+        without building intermediate dicts.
+        """
+        return orjson.dumps(
+            {
+                "segments": self.segments,
+                "metadata": self.metadata,
+                "processing_time_ms": self.processing_time_ms,
+                "file_size_bytes": self.file_size_bytes,
+                "errors": self.errors,
+                "truncated": self.truncated,
+                "extractor": self.extractor,
+                "version": self.version,
+                "success": self.success,
+                "partial_success": self.partial_success,
+                "total_chars": self.total_chars
+            },
+            option=orjson.OPT_NON_STR_KEYS
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -11,12 +11,20 @@ unified data flow for non-blocking file processing.
 import time
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from .extractors.result import ExtractionResult
 from .utils.idempotency import PipelineStatus, EventIdempotency, ProcessingRegistry
 from .registry import ExtractorRegistry
 from .encrypted_storage import EncryptedIndexerDB
 
+# Optional content sniffing for files with unknown suffixes
+try:
+    import magic
+    LIBMAGIC_AVAILABLE = True
+except ImportError:
+    LIBMAGIC_AVAILABLE = False
+
 # Setup logging
 logger = logging.getLogger("indexer.pipeline")
 
@@ -32,6 +40,19 @@ class ExtractionPipeline:
     5. FTS5 Persistence (SQLCipher)
     """
     
+    # Fast path: suffix -> MIME, a single dict lookup for the common case
+    _EXT_MIME = {
+        ".pdf": "application/pdf",
+        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }
+    
+    # Persistence statements (constant text keeps sqlite3's statement cache hot)
+    _SQL_DOC = """
+        INSERT OR REPLACE INTO documents (path, filename, mime_type, total_chars, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _SQL_CONTENT = "INSERT INTO document_content (content) VALUES (?)"
+    
     def __init__(self, db: EncryptedIndexerDB):
         """
         Initialize the pipeline.
@@ -43,10 +64,93 @@ class ExtractionPipeline:
         self.registry = ExtractorRegistry()
         self.idempotency = ProcessingRegistry(ttl_seconds=3600)  # 1 hour TTL
     
-    def process_file(self, filepath: str | Path) -> PipelineStatus:
+    def process_file(
+        self, filepath: str | Path, mime_type: Optional[str] = None
+    ) -> PipelineStatus:
         """
         Process a single file through the pipeline.
         
+        Args:
+            filepath: Path to the file to index
+            mime_type: Already-detected MIME type (detected here if None)
+            
+        Returns:
+            PipelineStatus indicating the result
+        """
+        return self.process_batch([filepath], [mime_type])[0]
+    
+    def process_batch(
+        self,
+        filepaths: List[str | Path],
+        mime_types: Optional[List[Optional[str]]] = None,
+    ) -> List[PipelineStatus]:
+        """
+        Process several files and persist them in a single transaction.
+        
+        Files are extracted one after another; all successful results
+        are then written from the calling thread with one executemany per
+        table and a single commit, so a burst of files costs one fsync
+        instead of one per document.
+        
+        Args:
+            filepaths: Paths of the files to index
+            mime_types: Already-detected MIME types, parallel to filepaths
+                (None entries are detected as usual)
+            
+        Returns:
+            PipelineStatus per input path, in input order
+        """
+        statuses: List[Optional[PipelineStatus]] = [None] * len(filepaths)
+        # (index, path, event_key, result) awaiting persistence
+        pending: List[Tuple[int, Path, int, ExtractionResult]] = []
+        
+        paths = [Path(filepath) for filepath in filepaths]
+        if mime_types is None:
+            mime_types = [None] * len(paths)
+        # Extraction stays serial: PyMuPDF is not thread-safe and the
+        # registry's extractors are shared; large PDFs fan out over worker
+        # processes inside PDFExtractor instead
+        outcomes = map(self._extract_one, paths, mime_types)
+        
+        for idx, (path, (status, event_key, result)) in enumerate(zip(paths, outcomes)):
+            if status is not None:
+                statuses[idx] = status
+            else:
+                pending.append((idx, path, event_key, result))
+        
+        if not pending:
+            return statuses
+        
+        # 5. PERSISTENCE (SQLCipher FTS5)
+        try:
+            self._save_to_fts([(path, result) for _, path, _, result in pending])
+        except Exception as e:
+            # Drop the half-written batch so the next commit cannot persist it
+            self.db.rollback()
+            logger.error(f"❌ [PIPELINE] Database error for batch of {len(pending)}: {e}")
+            for idx, _, event_key, _ in pending:
+                self.idempotency.mark_failed(event_key)
+                statuses[idx] = PipelineStatus.RETRY
+            return statuses
+        
+        # Mark completed only after the commit so a crash re-processes the batch
+        for idx, path, event_key, result in pending:
+            logger.info(f"✅ [PIPELINE] Indexed {path.name} ({result.total_chars} chars)")
+            self.idempotency.mark_completed(event_key)
+            statuses[idx] = PipelineStatus.INDEXED if result.success else PipelineStatus.DEGRADED
+        
+        return statuses
+    
+    def process_file_streaming(self, filepath: str | Path) -> PipelineStatus:
+        """
+        Process a file by streaming segments straight into FTS5.
+        
+        Each page is inserted as it is extracted, inside one transaction,
+        so the document text is never joined into a single string. Pages
+        the extractor had to skip make the result DEGRADED. Only extractors
+        exposing iter_segments() (PDF) stream; everything else goes through
+        process_file().
+        
         Args:
             filepath: Path to the file to index
             
@@ -56,62 +160,128 @@ class ExtractionPipeline:
         path = Path(filepath)
         filename = path.name
         
+        mime_type = self._detect_mime_type(path)
+        extractor = self.registry.get_extractor(mime_type)
+        if extractor is None or not hasattr(extractor, "iter_segments"):
+            return self.process_file(path, mime_type)
+        
         # 1. IDEMPOTENCY CHECK
         event_key = EventIdempotency.generate_key(path)
-        if not self.idempotency.should_process(event_key):
+        if not self.idempotency.try_claim(event_key):
             logger.debug(f"⏭️ [PIPELINE] Skipping duplicate: {filename}")
-            return PipelineStatus.INDEXED  # Already processed
+            return PipelineStatus.INDEXED
+        
+        # 2-5. EXTRACT + PERSIST, page by page
+        total_chars = 0
+        page_errors: List[Tuple[int, str]] = []
+        persisting = False
+        try:
+            cursor = self.db.cursor()
+            for segment in extractor.iter_segments(path, page_errors):
+                persisting = True
+                cursor.execute(self._SQL_CONTENT, (segment.text,))
+                total_chars += len(segment.text)
+                persisting = False
+            
+            persisting = True
+            cursor.execute(
+                self._SQL_DOC,
+                (
+                    str(path.absolute()),
+                    filename,
+                    extractor.EXTRACTOR_NAME,
+                    total_chars,
+                    time.strftime('%Y-%m-%d %H:%M:%S')
+                )
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.idempotency.mark_failed(event_key)
+            if persisting:
+                logger.error(f"❌ [PIPELINE] Database error for {filename}: {e}")
+                return PipelineStatus.RETRY
+            logger.error(f"❌ [PIPELINE] Extraction failed for {filename}: {e}")
+            return PipelineStatus.QUARANTINED
+        
+        for page_no, message in page_errors:
+            logger.warning(f"⚠️ [PIPELINE] Skipped page {page_no} of {filename}: {message}")
+        logger.info(f"✅ [PIPELINE] Streamed {filename} ({total_chars} chars)")
+        self.idempotency.mark_completed(event_key)
+        return PipelineStatus.DEGRADED if page_errors else PipelineStatus.INDEXED
+    
+    def _extract_one(
+        self, path: Path, mime_type: Optional[str] = None
+    ) -> Tuple[Optional[PipelineStatus], Optional[int], Optional[ExtractionResult]]:
+        """
+        Run steps 1-4 for a single file.
         
-        self.idempotency.mark_processing(event_key)
+        Args:
+            path: File to extract
+            mime_type: Already-detected MIME type (detected here if None)
+        
+        Returns:
+            (status, event_key, result). status is set when the file is
+            finished without persistence (skip, degraded, quarantined, retry);
+            otherwise it is None and result is ready to be saved.
+        """
+        filename = path.name
+        event_key: Optional[int] = None
         
         try:
+            # 1. IDEMPOTENCY CHECK
+            event_key = EventIdempotency.generate_key(path)
+            if not self.idempotency.try_claim(event_key):
+                logger.debug(f"⏭️ [PIPELINE] Skipping duplicate: {filename}")
+                return PipelineStatus.INDEXED, event_key, None  # Already processed
+            
             # 2. SECURITY VALIDATION
             # PathGuard/Security check should happen here
             
             # 3. MIME ROUTING
-            mime_type = self._detect_mime_type(path)
+            if mime_type is None:
+                mime_type = self._detect_mime_type(path)
             extractor = self.registry.get_extractor(mime_type)
             
             if not extractor:
                 logger.warning(f"⚠️ [PIPELINE] No extractor for {mime_type}: {filename}")
                 self.idempotency.mark_completed(event_key)
-                return PipelineStatus.DEGRADED
+                return PipelineStatus.DEGRADED, event_key, None
             
             # 4. EXTRACTION
             start_time = time.perf_counter()
             result = extractor.extract(path)
             duration_ms = (time.perf_counter() - start_time) * 1000
+            logger.debug(f"[PIPELINE] Extracted {filename} in {duration_ms:.2f}ms")
             
             if not result.success:
                 logger.error(f"❌ [PIPELINE] Extraction failed for {filename}: {result.errors[0].message}")
                 if any(not err.recoverable for err in result.errors):
                     self.idempotency.mark_failed(event_key)
-                    return PipelineStatus.QUARANTINED
+                    return PipelineStatus.QUARANTINED, event_key, None
             
-            # 5. PERSISTENCE (SQLCipher FTS5)
-            try:
-                self._save_to_fts(path, result)
-                logger.info(f"✅ [PIPELINE] Indexed {filename} ({result.total_chars} chars) in {duration_ms:.2f}ms")
-                self.idempotency.mark_completed(event_key)
-                return PipelineStatus.INDEXED if result.success else PipelineStatus.DEGRADED
-                
-            except Exception as e:
-                logger.error(f"❌ [PIPELINE] Database error for {filename}: {e}")
-                self.idempotency.mark_failed(event_key)
-                return PipelineStatus.RETRY
+            return None, event_key, result
                 
         except Exception as e:
             logger.error(f"🔥 [PIPELINE] Unexpected error processing {filename}: {e}")
-            self.idempotency.mark_failed(event_key)
-            return PipelineStatus.RETRY
+            if event_key is not None:
+                self.idempotency.mark_failed(event_key)
+            return PipelineStatus.RETRY, event_key, None
 
     def _detect_mime_type(self, path: Path) -> str:
-        """Simple MIME detection based on extension for Task 6.5."""
-        ext = path.suffix.lower()
-        if ext == '.pdf':
-            return "application/pdf"
-        if ext == '.docx':
-            return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        """
+        Detect MIME type: suffix lookup first, libmagic for unknown suffixes.
+        """
+        mime_type = self._EXT_MIME.get(path.suffix.lower())
+        if mime_type is not None:
+            return mime_type
+        
+        if LIBMAGIC_AVAILABLE:
+            try:
+                return magic.from_file(str(path), mime=True)
+            except Exception as e:
+                logger.debug(f"[PIPELINE] libmagic failed for {path.name}: {e}")
+        
         return "application/octet-stream"
 
     def get_stats(self) -> dict:
@@ -121,28 +291,32 @@ class ExtractionPipeline:
             "supported_types": self.registry.get_supported_types()
         }
 
-    def _save_to_fts(self, path: Path, result: "ExtractionResult") -> None:
+    def _save_to_fts(self, items: List[Tuple[Path, ExtractionResult]]) -> None:
         """
-        Save extraction result to SQLCipher FTS5 tables via EncryptedIndexerDB.
+        Save extraction results to SQLCipher FTS5 tables via EncryptedIndexerDB.
+        
+        All rows are written with one executemany per table on the cached
+        cursor and a single commit.
         """
+        cursor = self.db.cursor()
+        
         # 1. Insert/Update document metadata
         # Using REPLACE to handle updates to already indexed files
-        sql_doc = """
-        INSERT OR REPLACE INTO documents (path, filename, mime_type, total_chars, created_at)
-        VALUES (?, ?, ?, ?, ?)
-        """
-        params_doc = (
-            str(path.absolute()),
-            path.name,
-            result.extractor,
-            result.total_chars,
-            time.strftime('%Y-%m-%d %H:%M:%S')
-        )
-        self.db.execute(sql_doc, params_doc)
+        created_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        doc_rows = [
+            (
+                str(path.absolute()),
+                path.name,
+                result.extractor,
+                result.total_chars,
+                created_at
+            )
+            for path, result in items
+        ]
+        cursor.executemany(self._SQL_DOC, doc_rows)
         
         # 2. Insert into FTS5 content table
         # We assume the content table is matched via path or just a general search index
-        sql_content = "INSERT INTO document_content (content) VALUES (?)"
-        self.db.execute(sql_content, (result.total_text,))
+        cursor.executemany(self._SQL_CONTENT, [(result.total_text,) for _, result in items])
         
         self.db.commit()
@@ -12,15 +12,22 @@ Features:
 - Strict FIFO ordering
 """
 
+import hashlib
 import json
+import math
 import os
 import sqlite3
+import statistics
 import threading
 import time
 import uuid
+import weakref
 from collections import deque, OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import orjson
 
 # Try to import EventBus for type hints
 try:
@@ -82,6 +89,135 @@ class SecureLRUCache:
             self._cache.clear()
 
 
+class BloomFilter:
+    """
+    Fixed-size Bloom filter used as a "definitely never seen" pre-check.
+    
+    A miss means the key was never added, so the SQLite fallback can be
+    skipped; a hit may be a false positive and must be confirmed.
+    Not internally locked: callers serialize add().
+    
+    Memory: capacity=1M at 0.1% error = ~1.8MB (fixed)
+    """
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self._num_bits = bits
+        self._num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+    
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self._num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self._num_hashes)]
+    
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class _ReadConnection:
+    """
+    Holder for one thread's read connection, kept in a threading.local.
+    
+    The thread's locals are dropped when it exits; a finalizer on the
+    holder then closes the connection, so short-lived threads do not leave
+    connections open for the life of the queue.
+    """
+    
+    __slots__ = ("conn", "__weakref__")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_read_connection(
+    conns: Set[sqlite3.Connection], lock: threading.RLock, conn: sqlite3.Connection
+) -> None:
+    """Finalizer for _ReadConnection: forget and close the connection."""
+    with lock:
+        conns.discard(conn)
+    conn.close()
+
+
+# ===================================================================
+# SQL STATEMENTS
+# ===================================================================
+# Hot statements as constants: identical text on every call keeps them in
+# sqlite3's per-connection statement cache, skipping parse/plan on flush.
+
+SQL_INSERT_BATCH = """
+    INSERT INTO pending_batches 
+    (batch_id, created_at, event_count, events_data, status)
+    VALUES (?, ?, ?, ?, 'pending')
+"""
+
+SQL_INSERT_PROCESSED = """
+    INSERT OR IGNORE INTO processed_events 
+    (event_id, batch_id, processed_at)
+    VALUES (?, ?, ?)
+"""
+
+SQL_EVENT_EXISTS = "SELECT 1 FROM processed_events WHERE event_id = ? LIMIT 1"
+
+SQL_LOAD_PROCESSED_PAGE = """
+    SELECT rowid, event_id FROM processed_events
+    WHERE rowid > ? ORDER BY rowid LIMIT ?
+"""
+
+SQL_GET_PENDING = """
+    SELECT batch_id, created_at, event_count, events_data, attempts
+    FROM pending_batches
+    WHERE status = 'pending'
+    ORDER BY priority DESC, created_at ASC
+    LIMIT 1
+"""
+
+SQL_MARK_PROCESSING = """
+    UPDATE pending_batches 
+    SET status = 'processing', 
+        attempts = attempts + 1,
+        last_attempt = ?
+    WHERE batch_id = ?
+"""
+
+# Done batches leave the hot table: copy to archived_batches, then delete
+SQL_ARCHIVE_BATCH = """
+    INSERT INTO archived_batches 
+    (batch_id, created_at, event_count, events_data, attempts, last_attempt, priority, archived_at)
+    SELECT batch_id, created_at, event_count, events_data, attempts, last_attempt, priority, ?
+    FROM pending_batches WHERE batch_id = ?
+"""
+
+SQL_DELETE_BATCH = "DELETE FROM pending_batches WHERE batch_id = ?"
+
+SQL_COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM pending_batches GROUP BY status"
+
+# Read once at start(); metrics() uses the in-memory count afterwards
+SQL_COUNT_ARCHIVED = "SELECT COUNT(*) FROM archived_batches"
+
+# Oldest rows sit at the low rowids, so the rowid-ordered scan stops early
+SQL_PURGE_PROCESSED = """
+    DELETE FROM processed_events WHERE rowid IN (
+        SELECT rowid FROM processed_events
+        WHERE processed_at < ? ORDER BY rowid LIMIT ?
+    )
+"""
+
+SQL_WAL_CHECKPOINT = "PRAGMA wal_checkpoint(PASSIVE)"
+
+# Per-connection prepared-statement cache (stdlib default: 128)
+STATEMENT_CACHE_SIZE = 256
+
+
 # ===================================================================
 # DATA STRUCTURES
 # ===================================================================
@@ -142,6 +278,20 @@ class IndexerQueue:
     DEFAULT_BATCH_SIZE = 100
     DEFAULT_FLUSH_TIMEOUT_MS = 500
     MAX_BATCH_SIZE = 1000
+    LOAD_PAGE_SIZE = 10000  # processed_events rows per page at start-up
+    FLUSH_LATENCY_WINDOW = 100  # recent flushes kept for avg/median latency
+    MIN_FLUSH_INTERVAL_S = 0.01  # floor for the adaptive flush timer
+    ARRIVAL_EWMA_ALPHA = 0.1  # smoothing for the inter-arrival estimate
+    CHECKPOINT_EVERY_BATCHES = 50  # flushes between background WAL checkpoints
+    CHECKPOINT_WAL_BYTES = 16 * 1024 * 1024  # or sooner once the WAL grows by this much
+    WAL_SIZE_LIMIT = 4 * 1024 * 1024  # journal_size_limit: WAL truncated to this on restart
+    PROCESSED_TTL_S = 24 * 60 * 60  # processed_events rows older than this are purged
+    PURGE_INTERVAL_S = 15 * 60  # minimum spacing of purges from the maintenance thread
+    PURGE_CHUNK_SIZE = 1000  # rows per DELETE, bounding each write-lock hold
+    
+    # events_data BLOB format: version byte + orjson payload. Rows written
+    # before the prefix existed are plain JSON text (first byte "[").
+    EVENTS_FORMAT_ORJSON = b"\x01"
     
     def __init__(
         self,
@@ -161,7 +311,9 @@ class IndexerQueue:
         self.batch_size = min(batch_size, self.MAX_BATCH_SIZE)
         self.flush_timeout_ms = flush_timeout_ms
         
-        # In-memory buffer
+        # In-memory buffer. Producers append without a lock (deque.append is
+        # atomic); only the flusher pops, and always under _buffer_lock,
+        # which is held just for the drain, never across SQLite I/O.
         self._buffer: deque = deque()
         self._buffer_lock = threading.Lock()
         
@@ -169,12 +321,21 @@ class IndexerQueue:
         # MEMORY-SAFE: LRU cache with 10K limit (~1MB) instead of unbounded set
         self._processed_ids: SecureLRUCache = SecureLRUCache(maxsize=10000)
         self._processed_ids_lock = threading.Lock()  # External lock for compound ops
+        # Every ID ever persisted; a miss lets new events skip the SQLite lookup
+        self._seen_filter: BloomFilter = BloomFilter()
         
-        # Metrics
+        # Metrics (_events_received/_events_duplicate are only written under
+        # _processed_ids_lock, which the ingress path already holds)
         self._events_received = 0
         self._events_processed = 0
         self._events_duplicate = 0
-        self._flush_latencies: List[float] = []
+        # archived_batches row count: seeded once at start(), then bumped by
+        # mark_batch_done, so metrics() never scans the archive
+        self._batches_archived = 0
+        self._flush_latencies: deque = deque(maxlen=self.FLUSH_LATENCY_WINDOW)
+        # Inter-arrival EWMA (seconds), written under _processed_ids_lock
+        self._last_arrival: Optional[float] = None
+        self._arrival_gap_ewma: Optional[float] = None
         self._metrics_lock = threading.Lock()
         self._start_time: Optional[float] = None
         
@@ -182,11 +343,31 @@ class IndexerQueue:
         self._running = False
         self._stop_event = threading.Event()
         self._flush_timer: Optional[threading.Timer] = None
+        # Serializes whole flushes (drain + persist) so batches commit in FIFO order
         self._flush_lock = threading.Lock()
+        # Notified after each persisted batch; consumers wait here instead of
+        # polling. The generation lets them query outside the condition.
+        self._batch_available = threading.Condition()
+        self._batch_generation = 0
         
-        # SQLite connection (per-thread for safety)
+        # SQLite: one shared writer connection serialized by _db_lock, plus a
+        # read-only connection per reader thread so WAL readers never wait
+        # on the writer. Writes stay single-writer by design.
         self._db_conn: Optional[sqlite3.Connection] = None
         self._db_lock = threading.Lock()
+        self._read_local = threading.local()
+        self._read_conns: Set[sqlite3.Connection] = set()
+        # Re-entrant: a connection finalizer may fire on a thread that holds it
+        self._read_conns_lock = threading.RLock()
+        
+        # Auto-checkpoint is disabled; flushes schedule a PASSIVE checkpoint
+        # (and, when due, a processed_events purge) on a background thread
+        # so no flush ever stalls on one
+        self._batches_since_checkpoint = 0
+        # -wal file size when the last checkpoint was scheduled
+        self._wal_size_at_checkpoint = 0
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        self._last_purge = 0.0
         
         # EventBus subscription
         self._eventbus: Optional[Any] = None
@@ -208,6 +389,14 @@ class IndexerQueue:
         # Initialize SQLite
         self._init_database()
         
+        with self._db_lock:
+            self._batches_archived = (
+                self._get_connection().execute(SQL_COUNT_ARCHIVED).fetchone()[0]
+            )
+        
+        # Drop expired IDs first so the recovery load below only reads live ones
+        self.purge_processed_events()
+        
         # Load processed event IDs from DB (for crash recovery)
         self._load_processed_ids()
         
@@ -234,9 +423,7 @@ class IndexerQueue:
         
         # Graceful: flush any remaining events
         if graceful:
-            with self._buffer_lock:
-                if len(self._buffer) > 0:
-                    self._flush_buffer()
+            self._flush_buffer()
         
         # Unsubscribe from EventBus
         if self._eventbus and self._subscription_id:
@@ -245,7 +432,22 @@ class IndexerQueue:
             except:
                 pass
         
-        # Close SQLite connection
+        # Let an in-flight checkpoint finish before connections go away
+        checkpoint_thread = self._checkpoint_thread
+        if checkpoint_thread is not None:
+            checkpoint_thread.join()
+            self._checkpoint_thread = None
+        
+        # Close SQLite connections
+        # Dropping the old locals fires finalizers that take
+        # _read_conns_lock, so swap them out before locking
+        self._read_local = threading.local()
+        with self._read_conns_lock:
+            read_conns = list(self._read_conns)
+            self._read_conns.clear()
+        for conn in read_conns:
+            conn.close()
+        
         if self._db_conn:
             self._db_conn.close()
             self._db_conn = None
@@ -282,7 +484,8 @@ class IndexerQueue:
         
         Uses dual-layer idempotency check:
         1. L1: In-memory LRU cache (fast, ~1MB limit)
-        2. L2: SQLite fallback (for old IDs evicted from cache)
+        2. L2: SQLite fallback (for old IDs evicted from cache), only
+           consulted when the Bloom filter reports a possible match
         
         Args:
             event: Event data (dict with event_id)
@@ -290,47 +493,51 @@ class IndexerQueue:
         if not self._running:
             return
         
-        # Extract event_id for idempotency
-        event_id = None
-        if isinstance(event, dict):
-            event_id = event.get("event_id")
-        
-        # Generate event_id if not provided
-        if not event_id:
-            event_id = str(uuid.uuid4())
+        # Extract event_id for idempotency; generate one only if missing
+        # (uuid4().hex skips str()'s hyphen formatting)
+        event_id = event.get("event_id") if isinstance(event, dict) else None
+        event_id = event_id or uuid.uuid4().hex
         
         # DUAL-LAYER IDEMPOTENCY CHECK (Memory-safe)
         # Layer 1: LRU cache check (O(1), covers recent ~10K events)
         with self._processed_ids_lock:
             if event_id in self._processed_ids:
-                with self._metrics_lock:
-                    self._events_duplicate += 1
+                self._events_duplicate += 1
                 return  # Skip duplicate (found in L1 cache)
             
-            # Layer 2: SQLite fallback for old events evicted from cache
-            if self._is_event_in_database(event_id):
-                with self._metrics_lock:
-                    self._events_duplicate += 1
+            # Layer 2: SQLite fallback for old events evicted from cache.
+            # A Bloom miss proves the ID is new, so the query is skipped.
+            if event_id in self._seen_filter and self._is_event_in_database(event_id):
+                self._events_duplicate += 1
                 return  # Skip duplicate (found in L2 database)
             
             # Mark as seen IMMEDIATELY (before adding to buffer)
             # This prevents duplicates from entering buffer before flush
             self._processed_ids.add(event_id)
-        
-        # Add to buffer
-        with self._buffer_lock:
-            self._buffer.append({
-                "event_id": event_id,
-                "received_at": time.time(),
-                "data": event
-            })
-            
-            with self._metrics_lock:
-                self._events_received += 1
+            self._seen_filter.add(event_id)
+            self._events_received += 1
             
-            # Check if we should flush
-            if len(self._buffer) >= self.batch_size:
-                self._flush_buffer()
+            now = time.monotonic()
+            if self._last_arrival is not None:
+                gap = now - self._last_arrival
+                if self._arrival_gap_ewma is None:
+                    self._arrival_gap_ewma = gap
+                else:
+                    self._arrival_gap_ewma += self.ARRIVAL_EWMA_ALPHA * (gap - self._arrival_gap_ewma)
+            self._last_arrival = now
+        
+        # Add to buffer (lock-free append)
+        buffer = self._buffer
+        buffer.append({
+            "event_id": event_id,
+            "received_at": time.time(),
+            "data": event
+        })
+        
+        # Check if we should flush. Never waits: if a flush is already in
+        # flight, that flusher picks these events up before it finishes.
+        if len(buffer) >= self.batch_size:
+            self._flush_buffer(min_events=self.batch_size, blocking=False)
     
     def _is_event_in_database(self, event_id: str) -> bool:
         """
@@ -339,14 +546,8 @@ class IndexerQueue:
         Called when LRU cache misses, for old events that were evicted.
         """
         try:
-            conn = self._get_connection()
-            with self._db_lock:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT 1 FROM processed_events WHERE event_id = ? LIMIT 1",
-                    (event_id,)
-                )
-                return cursor.fetchone() is not None
+            with self._reading() as conn:
+                return conn.execute(SQL_EVENT_EXISTS, (event_id,)).fetchone() is not None
         except Exception:
             # If DB check fails, assume not duplicate (safer for data loss)
             return False
@@ -362,88 +563,291 @@ class IndexerQueue:
         
         if self._running:
             self._flush_timer = threading.Timer(
-                self.flush_timeout_ms / 1000.0,
+                self._next_flush_interval(),
                 self._on_flush_timeout
             )
             self._flush_timer.daemon = True
             self._flush_timer.start()
     
+    def _next_flush_interval(self) -> float:
+        """
+        Timer interval in seconds: min(flush_timeout, sqrt(2 * F0 / lambda)).
+        
+        F0 is the median flush cost and lambda the arrival rate. This is the
+        ski-rental-optimal wait: at low load it flushes well before the fixed
+        timeout, while at high load the batch_size trigger wins anyway.
+        Falls back to flush_timeout_ms until both quantities are known.
+        """
+        default = self.flush_timeout_ms / 1000.0
+        gap = self._arrival_gap_ewma
+        latencies = self._flush_latencies
+        if gap is None or not latencies:
+            return default
+        
+        # Once traffic stops, the time since the last event bounds the gap
+        # from below, so an idle queue relaxes back to the default
+        gap = max(gap, time.monotonic() - self._last_arrival)
+        flush_cost = statistics.median(latencies) / 1000.0
+        return max(self.MIN_FLUSH_INTERVAL_S, min(default, math.sqrt(2.0 * flush_cost * gap)))
+    
     def _on_flush_timeout(self) -> None:
         """Called when flush timeout expires."""
         if not self._running:
             return
         
-        with self._flush_lock:
-            with self._buffer_lock:
-                if len(self._buffer) > 0:
-                    self._flush_buffer()
+        self._flush_buffer()
         
         # Reset timer for next interval
         self._reset_flush_timer()
     
-    def _flush_buffer(self) -> None:
+    def _flush_buffer(self, min_events: int = 1, blocking: bool = True) -> None:
         """
-        Flush current buffer to SQLite as a batch.
+        Flush current buffer to SQLite in batches of at most batch_size.
+        
+        _buffer_lock is held only while a batch is drained; the SQLite
+        write runs after it is released, so appends never wait on disk.
+        Capping each drain keeps batches at batch_size even though producers
+        append during a persist and a failed persist puts its events back.
+        
+        Hand-off: a non-blocking (size-triggered) call returns at once when
+        another flush holds _flush_lock, leaving its full batch to the
+        holder. Every holder, blocking or not, re-checks the buffer after
+        releasing the lock and takes any full batch still there, so a
+        producer turned away at any point is served by the current flusher
+        rather than the next timer tick.
+        
+        A blocking call (timer, stop()) drains what was buffered when it got
+        the lock, so a steady stream of producers cannot hold it forever;
+        beyond that it only serves full batches, like a size trigger.
         
-        MUST be called with _buffer_lock held.
+        Args:
+            min_events: Skip the flush if fewer events are buffered by the
+                time the lock is acquired (another flush may have won)
+            blocking: Wait for an in-flight flush instead of handing the
+                work to it
         """
-        if len(self._buffer) == 0:
+        if not self._flush_lock.acquire(blocking=blocking):
             return
+        threshold = max(min_events, 1)
+        backlog = len(self._buffer) if blocking else None
+        while True:
+            try:
+                while len(self._buffer) >= threshold:
+                    flush_start = time.time()
+                    
+                    # Drain with popleft rather than swapping in a new deque: a
+                    # producer holding the old reference may still append to it
+                    with self._buffer_lock:
+                        if len(self._buffer) < threshold:
+                            break
+                        popleft = self._buffer.popleft
+                        events_list = [
+                            popleft()
+                            for _ in range(min(len(self._buffer), self.batch_size))
+                        ]
+                    
+                    self._persist_drained(events_list, flush_start)
+                    self._maybe_schedule_checkpoint()
+                    if backlog is not None:
+                        backlog -= len(events_list)
+                        if backlog <= 0:
+                            break
+            finally:
+                self._flush_lock.release()
+            
+            # A producer turned away before the release appended first, so
+            # its full batch is visible here; take it unless a newer flusher
+            # already holds the lock (that one will)
+            if len(self._buffer) < self.batch_size:
+                return
+            if not self._flush_lock.acquire(blocking=False):
+                return
+            threshold = self.batch_size
+            backlog = None
+    
+    def _persist_drained(self, events_list: List[Dict], flush_start: float) -> None:
+        """
+        Persist drained events as one batch, restoring them on failure.
         
-        flush_start = time.time()
-        
-        # Create batch
+        MUST be called with _flush_lock held.
+        """
         batch_id = str(uuid.uuid4())
-        events_list = list(self._buffer)
-        self._buffer.clear()
         
         # Persist to SQLite (atomic transaction)
         try:
             self._persist_batch(batch_id, events_list)
             
-            # Update processed IDs cache
-            with self._processed_ids_lock:
-                for event in events_list:
-                    self._processed_ids.add(event["event_id"])
+            with self._batch_available:
+                self._batch_generation += 1
+                self._batch_available.notify_all()
+            
+            # IDs already tracked at ingress to block concurrent duplicates
             
             # Update metrics
             with self._metrics_lock:
                 self._events_processed += len(events_list)
                 flush_latency = (time.time() - flush_start) * 1000
-                self._flush_latencies.append(flush_latency)
-                if len(self._flush_latencies) > 100:
-                    self._flush_latencies.pop(0)
+                self._flush_latencies.append(flush_latency)  # maxlen drops the oldest
                     
         except Exception as e:
-            # Put events back on error
-            for event in reversed(events_list):
-                self._buffer.appendleft(event)
+            # Put events back on error, ahead of anything appended since
+            with self._buffer_lock:
+                self._buffer.extendleft(reversed(events_list))
             raise e
     
+    def _maybe_schedule_checkpoint(self) -> None:
+        """
+        Start a background WAL checkpoint every CHECKPOINT_EVERY_BATCHES
+        flushes, or earlier once the WAL has grown by CHECKPOINT_WAL_BYTES
+        since the last one was scheduled.
+        
+        A PASSIVE checkpoint never shrinks the -wal file (SQLite rewrites it
+        from the start instead), so the early trigger measures growth, not
+        absolute size; otherwise a large WAL would re-trigger every flush.
+        
+        MUST be called with _flush_lock held (serializes the counters).
+        """
+        if self.db_path == ":memory:":
+            return  # no WAL to checkpoint
+        
+        self._batches_since_checkpoint += 1
+        try:
+            wal_size = os.path.getsize(self.db_path + "-wal")
+        except OSError:
+            wal_size = 0
+        if wal_size < self._wal_size_at_checkpoint:
+            # WAL restarted and was cut back to journal_size_limit
+            self._wal_size_at_checkpoint = 0
+        
+        if (self._batches_since_checkpoint < self.CHECKPOINT_EVERY_BATCHES
+                and wal_size - self._wal_size_at_checkpoint < self.CHECKPOINT_WAL_BYTES):
+            return
+        
+        # At most one checkpoint in flight; the next flush retries
+        if self._checkpoint_thread is not None and self._checkpoint_thread.is_alive():
+            return
+        
+        self._batches_since_checkpoint = 0
+        self._wal_size_at_checkpoint = wal_size
+        self._checkpoint_thread = threading.Thread(
+            target=self._run_maintenance,
+            name="IndexerQueue-checkpoint",
+            daemon=True
+        )
+        self._checkpoint_thread.start()
+    
+    def _run_maintenance(self) -> None:
+        """Background job: purge expired IDs when due, then checkpoint."""
+        if time.monotonic() - self._last_purge >= self.PURGE_INTERVAL_S:
+            try:
+                self.purge_processed_events()
+            except sqlite3.Error:
+                pass  # retried on a later pass
+        self._run_checkpoint()
+    
+    def _run_checkpoint(self) -> None:
+        """
+        Copy committed WAL frames back into the database file.
+        
+        Runs on its own short-lived connection: PASSIVE never waits on the
+        writer or readers, so it neither takes _db_lock nor blocks a flush.
+        """
+        try:
+            conn = self._open_connection()
+            try:
+                conn.execute(SQL_WAL_CHECKPOINT).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass  # best effort; the next scheduled checkpoint catches up
+    
     # -------------------------------------------------------------------
     # SQLITE OPERATIONS
     # -------------------------------------------------------------------
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection with the shared read-side PRAGMA profile."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,  # stop() closes connections from any thread
+            isolation_level=None,  # Autocommit for explicit transaction control
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        
+        # High-throughput profile: in-memory temp tables, 64 MiB page
+        # cache, 256 MiB mmap window, wait (not fail) on a busy lock
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
     def _get_connection(self) -> sqlite3.Connection:
-        """Get SQLite connection (creating if needed)."""
+        """Get the shared writer connection (creating if needed)."""
         if self._db_conn is None:
             # Ensure directory exists
             db_dir = os.path.dirname(self.db_path)
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
             
-            self._db_conn = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False,
-                isolation_level=None  # Autocommit for explicit transaction control
-            )
+            conn = self._open_connection()
+            
+            # page_size and auto_vacuum only apply to a fresh DB and must
+            # precede WAL, whose first write fixes the header. INCREMENTAL
+            # lets purges hand pages back with PRAGMA incremental_vacuum.
+            conn.execute("PRAGMA page_size=4096")
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
             
             # Enable WAL mode for better concurrency
-            self._db_conn.execute("PRAGMA journal_mode=WAL")
-            self._db_conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Checkpoints are scheduled between flushes instead; once one
+            # completes, the restarted WAL is cut back to WAL_SIZE_LIMIT
+            conn.execute("PRAGMA wal_autocheckpoint=0")
+            conn.execute(f"PRAGMA journal_size_limit={self.WAL_SIZE_LIMIT}")
+            self._db_conn = conn
             
         return self._db_conn
     
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yield a connection for a read query.
+        
+        On disk this is the thread's own read-only connection, used without
+        _db_lock: under WAL each reader sees the last committed snapshot and
+        never blocks the writer. An in-memory database cannot be shared
+        across connections, so reads go to the writer under _db_lock.
+        """
+        if self.db_path == ":memory:":
+            writer = self._get_connection()
+            with self._db_lock:
+                yield writer
+        else:
+            yield self._get_read_connection()
+    
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's read-only connection (creating if needed).
+        
+        Closed and forgotten when the thread exits (see _ReadConnection);
+        stop() closes whatever is still open.
+        """
+        holder = getattr(self._read_local, "holder", None)
+        if holder is None:
+            self._get_connection()  # writer first: it creates the schema's WAL file
+            conn = self._open_connection()
+            conn.execute("PRAGMA query_only=ON")
+            holder = _ReadConnection(conn)
+            self._read_local.holder = holder
+            with self._read_conns_lock:
+                self._read_conns.add(conn)
+            weakref.finalize(
+                holder, _close_read_connection,
+                self._read_conns, self._read_conns_lock, conn
+            )
+        return holder.conn
+    
     def _init_database(self) -> None:
         """Initialize SQLite database with schema."""
         conn = self._get_connection()
@@ -466,6 +870,20 @@ class IndexerQueue:
                 )
             """)
             
+            # Done batches, moved out of pending_batches by mark_batch_done
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archived_batches (
+                    batch_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    events_data BLOB NOT NULL,
+                    attempts INTEGER DEFAULT 0,
+                    last_attempt REAL,
+                    priority INTEGER DEFAULT 0,
+                    archived_at REAL NOT NULL
+                )
+            """)
+            
             # Create processed_events table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS processed_events (
@@ -481,6 +899,15 @@ class IndexerQueue:
                 ON pending_batches(status, created_at)
             """)
             
+            # Matches SQL_GET_PENDING's filter and sort, so the next batch is
+            # one B-tree descent with no in-memory sort. Partial: only
+            # pending rows are indexed, keeping it small.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pending_batches_pick 
+                ON pending_batches(status, priority DESC, created_at ASC)
+                WHERE status = 'pending'
+            """)
+            
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_processed_events_event_id 
                 ON processed_events(event_id)
@@ -489,16 +916,67 @@ class IndexerQueue:
             conn.commit()
     
     def _load_processed_ids(self) -> None:
-        """Load processed event IDs from DB for crash recovery."""
-        conn = self._get_connection()
+        """
+        Rebuild the Bloom filter from processed_events for crash recovery.
         
-        with self._db_lock:
-            cursor = conn.cursor()
-            cursor.execute("SELECT event_id FROM processed_events")
+        Rows are read in rowid-keyed pages on this thread's read
+        connection, so at most LOAD_PAGE_SIZE IDs are materialized at once
+        and each page is its own short read transaction. The LRU is left to
+        warm up from live traffic since the filter plus the SQLite fallback
+        already cover historical IDs.
+        """
+        add = self._seen_filter.add
+        last_rowid = 0
+        
+        while True:
+            with self._reading() as conn:
+                rows = conn.execute(
+                    SQL_LOAD_PROCESSED_PAGE, (last_rowid, self.LOAD_PAGE_SIZE)
+                ).fetchall()
+            
+            if not rows:
+                return
             
             with self._processed_ids_lock:
-                for row in cursor.fetchall():
-                    self._processed_ids.add(row[0])
+                for _, event_id in rows:
+                    add(event_id)
+            last_rowid = rows[-1][0]
+    
+    def purge_processed_events(self, max_age_s: Optional[float] = None) -> int:
+        """
+        Delete processed_events rows older than max_age_s.
+        
+        Runs in PURGE_CHUNK_SIZE deletes, each its own short transaction,
+        so a flush never waits long on _db_lock. IDs purged here still sit
+        in the in-memory Bloom filter until the next restart.
+        
+        Args:
+            max_age_s: Age cutoff in seconds (default: PROCESSED_TTL_S)
+            
+        Returns:
+            Number of rows deleted
+        """
+        if max_age_s is None:
+            max_age_s = self.PROCESSED_TTL_S
+        cutoff = time.time() - max_age_s
+        conn = self._get_connection()
+        deleted = 0
+        
+        while True:
+            with self._db_lock:
+                cursor = conn.execute(SQL_PURGE_PROCESSED, (cutoff, self.PURGE_CHUNK_SIZE))
+                count = cursor.rowcount
+            deleted += count
+            if count < self.PURGE_CHUNK_SIZE:
+                break
+        
+        if deleted:
+            with self._db_lock:
+                # executescript steps the pragma to completion; execute()
+                # returns after the first freed page
+                conn.executescript("PRAGMA incremental_vacuum;")
+        self._last_purge = time.monotonic()
+        return deleted
     
     def _persist_batch(self, batch_id: str, events: List[Dict]) -> None:
         """
@@ -510,34 +988,29 @@ class IndexerQueue:
         """
         conn = self._get_connection()
         
+        # Encode before taking the write lock to keep the transaction short
+        events_data = self._encode_events([e["data"] for e in events])
+        
         with self._db_lock:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("BEGIN TRANSACTION")
+                # Take the write lock up front: no mid-transaction upgrade
+                # from a read lock that could fail with SQLITE_BUSY
+                cursor.execute("BEGIN IMMEDIATE")
                 
                 # Insert batch
-                events_data = json.dumps([e["data"] for e in events]).encode("utf-8")
                 cursor.execute(
-                    """
-                    INSERT INTO pending_batches 
-                    (batch_id, created_at, event_count, events_data, status)
-                    VALUES (?, ?, ?, ?, 'pending')
-                    """,
+                    SQL_INSERT_BATCH,
                     (batch_id, time.time(), len(events), events_data)
                 )
                 
-                # Insert processed events (for idempotency)
+                # Insert processed events (for idempotency), one prepared statement
                 processed_at = time.time()
-                for event in events:
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO processed_events 
-                        (event_id, batch_id, processed_at)
-                        VALUES (?, ?, ?)
-                        """,
-                        (event["event_id"], batch_id, processed_at)
-                    )
+                cursor.executemany(
+                    SQL_INSERT_PROCESSED,
+                    [(event["event_id"], batch_id, processed_at) for event in events]
+                )
                 
                 cursor.execute("COMMIT")
                 
@@ -545,6 +1018,18 @@ class IndexerQueue:
                 cursor.execute("ROLLBACK")
                 raise e
     
+    def _encode_events(self, events: List[Any]) -> bytes:
+        """Serialize batch events to the versioned BLOB format."""
+        return self.EVENTS_FORMAT_ORJSON + orjson.dumps(
+            events, option=orjson.OPT_NON_STR_KEYS
+        )
+    
+    def _decode_events(self, events_data: bytes) -> List[Any]:
+        """Deserialize an events_data BLOB, accepting legacy JSON rows."""
+        if events_data[:1] == self.EVENTS_FORMAT_ORJSON:
+            return orjson.loads(memoryview(events_data)[1:])
+        return json.loads(events_data.decode("utf-8"))
+    
     # -------------------------------------------------------------------
     # PULL MODEL INTERFACE
     # -------------------------------------------------------------------
@@ -561,15 +1046,23 @@ class IndexerQueue:
         Returns:
             Batch object or None if no batch available
         """
-        deadline = time.time() + timeout
-        
-        while time.time() < deadline:
+        # The query runs outside the condition so producers' notify never
+        # waits on consumer I/O. Reading the generation first means a flush
+        # that lands between the query and the wait is not missed.
+        deadline = time.monotonic() + timeout
+        while True:
+            generation = self._batch_generation
             batch = self._try_get_batch()
-            if batch:
+            if batch is not None:
                 return batch
-            time.sleep(0.01)
-        
-        return None
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            with self._batch_available:
+                self._batch_available.wait_for(
+                    lambda: self._batch_generation != generation, timeout=remaining
+                )
     
     def _try_get_batch(self) -> Optional[Batch]:
         """Try to get and lock a pending batch."""
@@ -579,18 +1072,10 @@ class IndexerQueue:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("BEGIN TRANSACTION")
+                cursor.execute("BEGIN IMMEDIATE")
                 
                 # Get oldest pending batch
-                cursor.execute(
-                    """
-                    SELECT batch_id, created_at, event_count, events_data, attempts
-                    FROM pending_batches
-                    WHERE status = 'pending'
-                    ORDER BY priority DESC, created_at ASC
-                    LIMIT 1
-                    """
-                )
+                cursor.execute(SQL_GET_PENDING)
                 
                 row = cursor.fetchone()
                 if not row:
@@ -600,21 +1085,12 @@ class IndexerQueue:
                 batch_id, created_at, event_count, events_data, attempts = row
                 
                 # Mark as processing
-                cursor.execute(
-                    """
-                    UPDATE pending_batches 
-                    SET status = 'processing', 
-                        attempts = attempts + 1,
-                        last_attempt = ?
-                    WHERE batch_id = ?
-                    """,
-                    (time.time(), batch_id)
-                )
+                cursor.execute(SQL_MARK_PROCESSING, (time.time(), batch_id))
                 
                 cursor.execute("COMMIT")
                 
                 # Parse events
-                events = json.loads(events_data.decode("utf-8"))
+                events = self._decode_events(events_data)
                 
                 return Batch(
                     batch_id=batch_id,
@@ -633,6 +1109,9 @@ class IndexerQueue:
         """
         Mark batch as processed.
         
+        The row moves to archived_batches in one transaction, so
+        pending_batches only ever holds pending and processing work.
+        
         Args:
             batch_id: Batch ID to mark as done
             
@@ -643,16 +1122,20 @@ class IndexerQueue:
         
         with self._db_lock:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE pending_batches 
-                SET status = 'done'
-                WHERE batch_id = ?
-                """,
-                (batch_id,)
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+            
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(SQL_ARCHIVE_BATCH, (time.time(), batch_id))
+                cursor.execute(SQL_DELETE_BATCH, (batch_id,))
+                found = cursor.rowcount > 0
+                cursor.execute("COMMIT")
+                if found:
+                    self._batches_archived += 1
+                return found
+                
+            except Exception as e:
+                cursor.execute("ROLLBACK")
+                raise e
     
     # -------------------------------------------------------------------
     # METRICS
@@ -660,8 +1143,6 @@ class IndexerQueue:
     
     def metrics(self) -> QueueMetrics:
         """Get current metrics snapshot."""
-        conn = self._get_connection()
-        
         with self._metrics_lock:
             uptime = 0.0
             if self._start_time:
@@ -674,24 +1155,15 @@ class IndexerQueue:
             with self._buffer_lock:
                 buffer_size = len(self._buffer)
             
-            # Query batch counts from DB
-            with self._db_lock:
-                cursor = conn.cursor()
-                
-                cursor.execute(
-                    "SELECT COUNT(*) FROM pending_batches WHERE status = 'pending'"
-                )
-                pending = cursor.fetchone()[0]
-                
-                cursor.execute(
-                    "SELECT COUNT(*) FROM pending_batches WHERE status = 'processing'"
-                )
-                processing = cursor.fetchone()[0]
-                
-                cursor.execute(
-                    "SELECT COUNT(*) FROM pending_batches WHERE status = 'done'"
-                )
-                done = cursor.fetchone()[0]
+            # Query batch counts from DB (read connection, no _db_lock).
+            # "done" rows in pending_batches predate archiving; archived
+            # ones come from the in-memory counter.
+            with self._reading() as conn:
+                counts = dict(conn.execute(SQL_COUNT_BY_STATUS).fetchall())
+            
+            pending = counts.get("pending", 0)
+            processing = counts.get("processing", 0)
+            done = counts.get("done", 0) + self._batches_archived
             
             return QueueMetrics(
                 timestamp=time.time(),
@@ -7,6 +7,7 @@ Thread-safe singleton for high-performance extraction.
 """
 
 import threading
+from types import MappingProxyType
 from typing import Dict, Optional, Type
 
 from .extractors.pdf_extractor import PDFExtractor
@@ -23,29 +24,37 @@ class ExtractorRegistry:
     _instance = None
     _lock = threading.Lock()
     
-    _mapping = {
+    _mapping = MappingProxyType({
         # PDF: Primary Engine (PyMuPDF)
         "application/pdf": PDFExtractor,
         
         # DOCX: Bridge/Fallback Engine (python-docx)
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DOCXExtractor,
-    }
+    })
     
     def __new__(cls):
+        # Double-checked locking: after first use this is a plain read
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super(ExtractorRegistry, cls).__new__(cls)
-                cls._instance._initialize()
+                instance = super(ExtractorRegistry, cls).__new__(cls)
+                instance._initialize()
+                # Publish only once fully initialized
+                cls._instance = instance
             return cls._instance
     
     def _initialize(self):
-        """Initialize registry with extractor instances."""
-        self._extractors = {}
+        """Initialize registry with extractor instances (frozen afterwards)."""
+        extractors: Dict[str, object] = {}
         for mime_type, extractor_class in self._mapping.items():
             try:
-                self._extractors[mime_type] = extractor_class()
+                extractors[mime_type] = extractor_class()
             except Exception as e:
                 print(f"⚠️ [REGISTRY] Failed to initialize {extractor_class.__name__}: {e}")
+        self._extractors = MappingProxyType(extractors)
     
     def get_extractor(self, mime_type: str) -> Optional[object]:
         """
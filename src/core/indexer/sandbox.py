@@ -7,9 +7,23 @@ T22: Memory Limit (512MB)
 """
 
 import asyncio
+import logging
 import os
 import sys
-from typing import List, Optional
+import uuid
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger("indexer.sandbox")
+
+
+def _is_memory_error(stderr: bytes) -> bool:
+    """
+    stderr memory-failure marker: "memory" together with "error"/"killed",
+    in either order. Plain substring scans on the ASCII-lowered bytes keep
+    this linear in the stderr size (no decode, no regex backtracking).
+    """
+    low = stderr.lower()
+    return b"memory" in low and (b"error" in low or b"killed" in low)
 
 
 class SandboxError(Exception):
@@ -25,11 +39,31 @@ class SandboxExecutor:
     - Timeout enforcement (kills after N seconds)
     - Memory limit (kills if exceeds MB limit)
     - Isolation (no state sharing between executions)
+    
+    Memory limit on Unix: a per-run cgroup v2 with memory.max when one can
+    be created (enforces real RSS), else RLIMIT_DATA. RLIMIT_AS is avoided
+    since it counts address-space reservations, not usage, and kills JITs
+    and 64-bit macOS processes that never come near the limit. macOS does
+    not enforce RLIMIT_DATA, so there the limit is advisory only. The
+    mechanism in force is logged whenever it changes.
     """
     
     DEFAULT_TIMEOUT_SECONDS = 10
     DEFAULT_MEMORY_LIMIT_MB = 512
     
+    # Memory monitor polling: back off while well under the limit,
+    # poll fast once usage crosses MEMORY_POLL_HOT_RATIO of it
+    MEMORY_POLL_INITIAL_S = 0.05
+    MEMORY_POLL_MAX_S = 0.25
+    MEMORY_POLL_HOT_S = 0.01
+    MEMORY_POLL_BACKOFF = 1.5
+    MEMORY_POLL_HOT_RATIO = 0.8
+    
+    # cgroup v2 unified hierarchy (Linux)
+    CGROUP_ROOT = "/sys/fs/cgroup"
+    # Delegated cgroup (absolute cgroupfs path) to create per-run children in
+    CGROUP_PARENT_ENV = "CONVERT_SANDBOX_CGROUP"
+    
     def __init__(
         self,
         timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS,
@@ -37,6 +71,7 @@ class SandboxExecutor:
     ):
         self.timeout_seconds = timeout_seconds
         self.memory_limit_mb = memory_limit_mb
+        self._limit_mechanism: Optional[str] = None
     
     async def execute(self, command: List[str], cwd: Optional[str] = None) -> bytes:
         """
@@ -53,6 +88,7 @@ class SandboxExecutor:
             SandboxError: If timeout or memory limit exceeded
         """
         process = None
+        cgroup_dir = None
         
         try:
             # Create subprocess with resource pre-configuration
@@ -67,14 +103,44 @@ class SandboxExecutor:
                 )
                 
                 # Apply memory limit via Windows Job Object
-                self._apply_windows_job_limits(process)
+                if self._apply_windows_job_limits(process):
+                    self._log_limit_mechanism("Windows Job Object")
+                else:
+                    self._log_limit_mechanism("psutil RSS monitor")
             else:
                 # Unix: Use preexec_fn to set resource limits
+                mem_bytes = self.memory_limit_mb * 1024 * 1024
+                cgroup_dir = self._create_memory_cgroup(mem_bytes)
+                cgroup_procs = (
+                    os.path.join(cgroup_dir, "cgroup.procs") if cgroup_dir else None
+                )
+                if cgroup_dir:
+                    self._log_limit_mechanism(
+                        f"cgroup v2 memory.max under {os.path.dirname(cgroup_dir)}"
+                    )
+                elif sys.platform == "darwin":
+                    self._log_limit_mechanism("RLIMIT_DATA (not enforced by macOS)")
+                else:
+                    self._log_limit_mechanism("RLIMIT_DATA")
+                
                 def set_unix_limits():
                     import resource
-                    # Set memory limit (virtual memory)
-                    mem_bytes = self.memory_limit_mb * 1024 * 1024
-                    resource.setrlimit(resource.RLIMIT_AS, (mem_bytes, mem_bytes))
+                    # Join the pre-sized cgroup before exec ("0" = this
+                    # process), so the child never runs unconfined
+                    joined = False
+                    if cgroup_procs:
+                        try:
+                            fd = os.open(cgroup_procs, os.O_WRONLY)
+                            try:
+                                os.write(fd, b"0")
+                                joined = True
+                            finally:
+                                os.close(fd)
+                        except OSError:
+                            pass
+                    if not joined:
+                        # Set memory limit (data segment + private mappings)
+                        resource.setrlimit(resource.RLIMIT_DATA, (mem_bytes, mem_bytes))
                     # Set CPU time limit as backup
                     resource.setrlimit(resource.RLIMIT_CPU, 
                         (self.timeout_seconds + 5, self.timeout_seconds + 5))
@@ -113,10 +179,9 @@ class SandboxExecutor:
                 )
             
             # Check for other memory error indicators
-            stderr_str = stderr.decode('utf-8', errors='replace').lower()
-            if 'memory' in stderr_str and ('error' in stderr_str or 'killed' in stderr_str):
+            if _is_memory_error(stderr):
                 raise SandboxError(
-                    f"Process memory error: {stderr_str[:200]}"
+                    f"Process memory error: {stderr[:200].decode('utf-8', errors='replace')}"
                 )
             
             return stdout
@@ -127,6 +192,114 @@ class SandboxExecutor:
             if process:
                 self._force_kill(process)
             raise SandboxError(f"Sandbox execution failed: {e}")
+        finally:
+            if cgroup_dir:
+                await self._remove_cgroup(cgroup_dir, process)
+    
+    def _log_limit_mechanism(self, mechanism: str) -> None:
+        """Log the memory-limit mechanism once, and again whenever it changes."""
+        if mechanism != self._limit_mechanism:
+            self._limit_mechanism = mechanism
+            logger.info(
+                "Sandbox memory limit (%dMB) enforced via %s",
+                self.memory_limit_mb, mechanism
+            )
+    
+    def _own_cgroup(self) -> str:
+        """This process's cgroup path ("0::/path" in the unified hierarchy)."""
+        with open("/proc/self/cgroup") as f:
+            return next(
+                line.split("::", 1)[1].strip()
+                for line in f if line.startswith("0::")
+            )
+    
+    def _cgroup_parent_candidates(self) -> Iterator[str]:
+        """
+        cgroups a per-run child may be created in, best first.
+        
+        cgroup v2's no-internal-processes rule means our own cgroup cannot
+        both hold this process and enable the memory controller for
+        children, so besides an explicitly delegated cgroup the child goes
+        next to our own cgroup (a sibling), or under the root, which is
+        exempt from the rule.
+        """
+        configured = os.environ.get(self.CGROUP_PARENT_ENV)
+        if configured:
+            yield configured
+        try:
+            own = self._own_cgroup().strip("/")
+        except (OSError, StopIteration):
+            return
+        if own:
+            yield os.path.join(self.CGROUP_ROOT, os.path.dirname(own))
+        else:
+            yield self.CGROUP_ROOT
+    
+    def _create_memory_cgroup(self, mem_bytes: int) -> Optional[str]:
+        """
+        Create a child cgroup v2 capped at mem_bytes (Linux only).
+        
+        The parent must have the memory controller in its subtree_control
+        and be writable by us, i.e. root or a delegated subtree (see
+        CGROUP_PARENT_ENV). Returns None when no candidate qualifies and
+        the caller falls back to RLIMIT_DATA.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        if not os.path.exists(os.path.join(self.CGROUP_ROOT, "cgroup.controllers")):
+            return None
+        
+        for parent in self._cgroup_parent_candidates():
+            cgroup_dir = self._create_child_cgroup(parent, mem_bytes)
+            if cgroup_dir:
+                return cgroup_dir
+        return None
+    
+    def _create_child_cgroup(self, parent: str, mem_bytes: int) -> Optional[str]:
+        """Create one sandbox-* child of parent with memory.max set, or None."""
+        try:
+            with open(os.path.join(parent, "cgroup.subtree_control")) as f:
+                if "memory" not in f.read().split():
+                    return None
+            # Joining needs write access to the common ancestor's cgroup.procs
+            if not os.access(os.path.join(parent, "cgroup.procs"), os.W_OK):
+                return None
+            
+            cgroup_dir = os.path.join(parent, f"sandbox-{uuid.uuid4().hex}")
+            os.mkdir(cgroup_dir)
+        except OSError:
+            return None
+        
+        try:
+            with open(os.path.join(cgroup_dir, "memory.max"), "w") as f:
+                f.write(str(mem_bytes))
+        except OSError:
+            try:
+                os.rmdir(cgroup_dir)
+            except OSError:
+                pass
+            return None
+        
+        # Best effort: no swapping past the cap, OOM takes the whole group
+        for name, value in (("memory.swap.max", "0"), ("memory.oom.group", "1")):
+            try:
+                with open(os.path.join(cgroup_dir, name), "w") as f:
+                    f.write(value)
+            except OSError:
+                pass
+        return cgroup_dir
+    
+    async def _remove_cgroup(self, cgroup_dir: str, process) -> None:
+        """Remove a per-run cgroup once its process has been reaped."""
+        if process is not None and process.returncode is None:
+            try:
+                await asyncio.wait_for(process.wait(), timeout=1.0)
+            except Exception:
+                pass
+        try:
+            os.rmdir(cgroup_dir)
+        except OSError:
+            pass
     
     async def _execute_with_memory_monitor(
         self, 
@@ -138,27 +311,42 @@ class SandboxExecutor:
         Execute with active memory monitoring using psutil.
         
         This is the fallback for Windows when Job Objects fail.
-        Polls process memory every 100ms and kills if exceeded.
+        Polls process memory with exponential back-off (50ms -> 250ms),
+        dropping to 10ms once usage passes 80% of the limit, and kills if
+        exceeded.
         """
         import psutil
         
         memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        hot_threshold = memory_limit_bytes * self.MEMORY_POLL_HOT_RATIO
         memory_exceeded = False
         
         async def monitor_memory():
             nonlocal memory_exceeded
+            # Resolve everything the loop touches once, not per poll
+            process_gone = (psutil.NoSuchProcess, psutil.AccessDenied)
+            sleep = asyncio.sleep
+            hot_delay = self.MEMORY_POLL_HOT_S
+            max_delay = self.MEMORY_POLL_MAX_S
+            backoff = self.MEMORY_POLL_BACKOFF
+            delay = self.MEMORY_POLL_INITIAL_S
             try:
-                ps_process = psutil.Process(process.pid)
+                get_memory_info = psutil.Process(process.pid).memory_info
                 while process.returncode is None:
                     try:
-                        mem_info = ps_process.memory_info()
-                        if mem_info.rss > memory_limit_bytes:
+                        rss = get_memory_info().rss
+                        if rss > memory_limit_bytes:
                             memory_exceeded = True
                             self._force_kill(process)
                             return
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    except process_gone:
                         return
-                    await asyncio.sleep(0.01)  # Check every 10ms (100Hz) for fast detection
+                    
+                    if rss > hot_threshold:
+                        delay = hot_delay
+                    else:
+                        delay = min(max_delay, delay * backoff)
+                    await sleep(delay)
             except Exception:
                 pass
         
@@ -184,7 +372,7 @@ class SandboxExecutor:
         
         return stdout, stderr
     
-    def _apply_windows_job_limits(self, process) -> None:
+    def _apply_windows_job_limits(self, process) -> bool:
         """Apply memory limits via Windows Job Object (if available)"""
         try:
             # Try to use win32job if available
@@ -211,14 +399,15 @@ class SandboxExecutor:
             
             # Assign process to job
             win32job.AssignProcessToJobObject(hJob, int(process._transport.get_pid()))
+            return True
             
         except ImportError:
-            # win32job not available - memory limit not enforced on Windows
+            # win32job not available - the psutil monitor enforces the limit
             # T22 test will handle this gracefully
-            pass
+            return False
         except Exception:
-            # Job object setup failed - continue without memory limit
-            pass
+            # Job object setup failed - continue with the psutil monitor
+            return False
     
     def _force_kill(self, process) -> None:
         """Force kill the process"""
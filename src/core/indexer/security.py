@@ -7,10 +7,27 @@ T23: InputValidator - MIME type and content validation
 """
 
 import os
+import stat
 import struct
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+if sys.platform == "win32":
+    def _is_link(path: str) -> bool:
+        """
+        Any reparse point counts as a link on Windows: os.path.islink()
+        misses directory junctions, which realpath() still follows.
+        """
+        try:
+            attributes = os.lstat(path).st_file_attributes
+        except (OSError, ValueError):
+            return False
+        return bool(attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+else:
+    _is_link = os.path.islink
 
 
 @dataclass
@@ -30,7 +47,17 @@ class PathGuard:
     """
     
     def __init__(self, vault_root: Path):
+        # The root's own symlink chain is resolved here, once
         self.vault_root = vault_root.resolve()
+        # Plain-string root and "root/" prefix, so validate() compares
+        # strings instead of building Path objects per call
+        self._root_str = str(self.vault_root)
+        self._root_prefix = os.path.join(self._root_str, "")
+        self._separators = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    
+    def _inside_root(self, path_str: str) -> bool:
+        """True if an absolute, normalized path is the root or below it."""
+        return path_str == self._root_str or path_str.startswith(self._root_prefix)
     
     def validate(self, path: str) -> Path:
         """
@@ -45,41 +72,103 @@ class PathGuard:
         Raises:
             ValueError: If path escapes vault or is unsafe
         """
-        # Convert to Path object
-        input_path = Path(path)
+        path_str = self._absolute(path)
+        
+        # Step 2: Resolve the path, following every symlink in the chain
+        # (parent directories included, not just the final entry)
+        resolved = self._resolve(path_str)
         
-        # Step 1: Check for obvious traversal patterns
-        path_str = str(path)
-        if '..' in path_str:
+        self._check_resolved(resolved, path_str)
+        return Path(resolved)
+    
+    def validate_many(self, paths: Iterable[str]) -> List[Path]:
+        """
+        Validate a batch of paths, e.g. every file found in a vault walk.
+        
+        Same checks as validate(), but each distinct parent directory is
+        resolved once per call: siblings only cost an lstat of their own
+        name, and a full realpath only when that name is itself a link.
+        
+        Args:
+            paths: Relative or absolute paths to validate
+            
+        Returns:
+            Resolved Path objects, in input order
+            
+        Raises:
+            ValueError: On the first path that escapes vault or is unsafe
+        """
+        real_parents: Dict[str, str] = {}
+        results: List[Path] = []
+        
+        for path in paths:
+            path_str = os.path.normpath(self._absolute(path))
+            parent, name = os.path.split(path_str)
+            
+            real_parent = real_parents.get(parent)
+            if real_parent is None:
+                real_parent = real_parents[parent] = self._resolve(parent)
+            
+            resolved = os.path.join(real_parent, name) if name else real_parent
+            if _is_link(resolved):
+                resolved = os.path.realpath(resolved)
+            
+            self._check_resolved(resolved, path_str)
+            results.append(Path(resolved))
+        
+        return results
+    
+    def _absolute(self, path: str) -> str:
+        """Step 1 ('..' check), then anchor relative paths at the vault root."""
+        path_str = os.fspath(path)
+        
+        # Step 1: Check for traversal patterns ('..' as a path component,
+        # so names like '..notes' are not false positives)
+        parts = path_str
+        for sep in self._separators[1:]:
+            parts = parts.replace(sep, os.sep)
+        if '..' in parts.split(os.sep):
             raise ValueError(
                 f"Path traversal detected: path contains '..' component"
             )
         
-        # Step 2: Resolve the path
-        if input_path.is_absolute():
-            resolved = input_path.resolve()
-        else:
-            resolved = (self.vault_root / input_path).resolve()
+        if not os.path.isabs(path_str):
+            path_str = os.path.join(self._root_str, path_str)
+        return path_str
+    
+    def _resolve(self, path_str: str) -> str:
+        """
+        Resolve an absolute path like os.path.realpath, without re-walking
+        the already-resolved vault root.
         
-        # Step 3: Verify resolved path is inside vault root
-        try:
-            resolved.relative_to(self.vault_root)
-        except ValueError:
-            raise ValueError(
-                f"Path escape detected: path resolves outside vault root"
-            )
+        For a path lexically under the root, only the components below it
+        are lstat'ed; the first symlink (or, on Windows, junction) among
+        them hands over to a full realpath. Paths outside the root (e.g. an alias of it) always get
+        the full realpath.
+        """
+        normed = os.path.normpath(path_str)
+        if not normed.startswith(self._root_prefix):
+            return os.path.realpath(normed)
         
-        # Step 4: Check symlink doesn't escape (if exists)
-        if resolved.exists() and resolved.is_symlink():
-            real_target = resolved.resolve()
-            try:
-                real_target.relative_to(self.vault_root)
-            except ValueError:
+        current = self._root_str
+        for part in normed[len(self._root_prefix):].split(os.sep):
+            current = os.path.join(current, part)
+            if _is_link(current):
+                return os.path.realpath(normed)
+        return current
+    
+    def _check_resolved(self, resolved: str, path_str: str) -> None:
+        """Steps 3-4: the resolved path must stay inside the vault root."""
+        # Step 3: Verify resolved path is inside vault root
+        if not self._inside_root(resolved):
+            # Step 4: Lexically inside but resolved outside: a symlink escapes
+            if self._inside_root(os.path.normpath(path_str)):
                 raise ValueError(
                     f"Symlink escape detected: symlink target is outside vault root"
                 )
-        
-        return resolved
+            raise ValueError(
+                f"Path escape detected: path resolves outside vault root"
+            )
 
 
 class InputValidator:
@@ -124,6 +213,16 @@ class InputValidator:
         b'<%',            # ASP
     ]
     
+    # Larger files are rejected from their size alone, without being read
+    MAX_FILE_SIZE_BYTES = 1024 * 1024 * 1024
+    
+    _OPEN_FLAGS = (
+        os.O_RDONLY
+        | getattr(os, "O_NOFOLLOW", 0)
+        | getattr(os, "O_BINARY", 0)
+        | getattr(os, "O_CLOEXEC", 0)
+    )
+    
     # Allowed MIME types
     ALLOWED_MIMES: Set[str] = {
         'application/pdf',
@@ -152,50 +251,75 @@ class InputValidator:
             
         Raises:
             ValueError: If file type is blocked (executable, script, etc.)
+                or the path is missing or a symlink
         """
-        if not path.exists():
+        # One lstat decides empty/oversized files before any open()
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
             raise ValueError(f"File does not exist: {path}")
         
-        # Read first 32 bytes for magic detection
-        with open(path, 'rb') as f:
-            header = f.read(32)
+        if stat.S_ISLNK(st.st_mode):
+            raise ValueError(
+                f"Blocked symlink: validate the resolved path instead"
+            )
         
-        if len(header) == 0:
+        if st.st_size == 0:
             return ValidationResult(
                 allowed=True,
                 mime_type='application/octet-stream',
                 reason='Empty file'
             )
         
-        # Step 1: Check for BLOCKED signatures (executables)
-        for sig, sig_type in self.BLOCKED_SIGNATURES.items():
-            if header.startswith(sig):
+        if st.st_size > self.MAX_FILE_SIZE_BYTES:
+            return ValidationResult(
+                allowed=False,
+                mime_type='application/octet-stream',
+                reason=f"File size {st.st_size} exceeds {self.MAX_FILE_SIZE_BYTES} bytes"
+            )
+        
+        # Read first 32 bytes for magic detection. Raw fd, no file object;
+        # O_NOFOLLOW refuses a symlink swapped in since the lstat.
+        fd = os.open(path, self._OPEN_FLAGS)
+        try:
+            header = os.read(fd, 32)
+        finally:
+            os.close(fd)
+        
+        # Steps 1-3: Classify by signature. One dict lookup on the first
+        # two bytes yields the few candidates sharing that prefix, ordered
+        # blocked > script > allowed as in the checks they replace.
+        detected_mime = None
+        for sigs, kind, value in self._SIGNATURE_TABLE.get(header[:2], ()):
+            if not header.startswith(sigs):
+                continue
+            
+            if kind == 'blocked':
                 raise ValueError(
-                    f"Blocked executable detected: file has {sig_type} signature"
+                    f"Blocked executable detected: file has {value} signature"
                 )
-        
-        # Step 2: Check for script patterns
-        for pattern in self.SCRIPT_PATTERNS:
-            if header.startswith(pattern):
+            if kind == 'script':
                 raise ValueError(
                     f"Blocked script detected: file contains script shebang or marker"
                 )
-        
-        # Step 3: Detect MIME type from magic bytes
-        detected_mime = None
-        for sig, mime in self.MAGIC_SIGNATURES.items():
-            if header.startswith(sig):
-                detected_mime = mime
-                break
+            detected_mime = value
+            break
         
         # Step 4: Handle text files (no magic signature)
         if detected_mime is None:
-            # Check if it looks like UTF-8 text
-            try:
-                header.decode('utf-8')
-                detected_mime = 'text/plain'
-            except UnicodeDecodeError:
+            # Check if it looks like text. NUL and pure-ASCII are decided
+            # with C-level byte scans; only non-ASCII headers pay for a
+            # UTF-8 decode (and the exception on binary).
+            if b'\x00' in header:
                 detected_mime = 'application/octet-stream'
+            elif header.isascii():
+                detected_mime = 'text/plain'
+            else:
+                try:
+                    header.decode('utf-8')
+                    detected_mime = 'text/plain'
+                except UnicodeDecodeError:
+                    detected_mime = 'application/octet-stream'
         
         # Step 5: Verify MIME is in allowed list
         if detected_mime not in self.ALLOWED_MIMES:
@@ -210,3 +334,32 @@ class InputValidator:
             mime_type=detected_mime,
             reason=None
         )
+    
+    # Signature decision table, filled in below from the tables above
+    _SIGNATURE_TABLE: Dict[bytes, Tuple[Tuple[Tuple[bytes, ...], str, str], ...]] = {}
+
+
+def _build_signature_table() -> Dict[bytes, Tuple[Tuple[Tuple[bytes, ...], str, str], ...]]:
+    """
+    Index every signature by its first two bytes (all are >= 2 bytes).
+    
+    Signatures sharing a prefix and an outcome (e.g. both ZIP headers, the
+    Mach-O pair) are merged into one tuple, so a single C-level
+    bytes.startswith(tuple) call tests them all.
+    """
+    table: Dict[bytes, Dict[Tuple[str, str], List[bytes]]] = {}
+    entries = (
+        [(sig, 'blocked', sig_type) for sig, sig_type in InputValidator.BLOCKED_SIGNATURES.items()]
+        + [(sig, 'script', '') for sig in InputValidator.SCRIPT_PATTERNS]
+        + [(sig, 'mime', mime) for sig, mime in InputValidator.MAGIC_SIGNATURES.items()]
+    )
+    # dicts keep insertion order, so blocked > script > mime precedence holds
+    for sig, kind, value in entries:
+        table.setdefault(sig[:2], {}).setdefault((kind, value), []).append(sig)
+    return {
+        prefix: tuple((tuple(sigs), kind, value) for (kind, value), sigs in outcomes.items())
+        for prefix, outcomes in table.items()
+    }
+
+
+InputValidator._SIGNATURE_TABLE = _build_signature_table()
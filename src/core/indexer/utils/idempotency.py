@@ -6,19 +6,22 @@ SPEC: SPEC_TASK_6_5_INTEGRATION.md (FROZEN)
 
 Features:
 - PipelineStatus enum for observability
-- XXH3-based metadata hashing (fallback: blake2b)
+- XXH3-based metadata hashing (fallback: BLAKE3, then blake2b)
 - ProcessingRegistry for in-memory deduplication
 - Thread-safe for Python 3.14 No-GIL
 """
 
 import hashlib
+import heapq
+import mmap
 import os
+import struct
 import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from enum import Enum
+from enum import IntEnum
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 # Try XXH3 first (optimal for 2025)
 try:
@@ -27,37 +30,70 @@ try:
 except ImportError:
     XXH3_AVAILABLE = False
 
+# Then BLAKE3 (SIMD-accelerated, faster than OpenSSL's blake2b)
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 
 # ===================================================================
 # PIPELINE STATUS ENUM (OBSERVABILITY)
 # ===================================================================
 
-class PipelineStatus(Enum):
+class PipelineStatus(IntEnum):
     """
     Pipeline processing status for high-observability.
     
     Replaces boolean returns with detailed status tracking.
+    IntEnum: compares and hashes as a plain int (C-level), so tallying
+    statuses in dicts/sets skips Enum's Python-level __hash__.
     """
-    INDEXED = "INDEXED"           # Success: data in FTS5
-    DEGRADED = "DEGRADED"         # Partial: metadata only (content failed)
-    QUARANTINED = "QUARANTINED"   # Security violation or corrupt
-    RETRY = "RETRY"               # Temporary error (file lock, etc.)
+    INDEXED = 1        # Success: data in FTS5
+    DEGRADED = 2       # Partial: metadata only (content failed)
+    QUARANTINED = 3    # Security violation or corrupt
+    RETRY = 4          # Temporary error (file lock, etc.)
+    
+    def __str__(self) -> str:
+        # Logs and observers keep seeing the name ("INDEXED")
+        return self.name
 
 
 # ===================================================================
 # EVENT IDEMPOTENCY (METADATA HASHING)
 # ===================================================================
 
+# Fixed-width little-endian (mtime_ns, size) suffix for the metadata key
+_STAT_FIELDS = struct.Struct("<qQ")
+
+# Metadata-key hasher picked once at import: (new hasher, 64-bit int digest),
+# so generate_key() does not branch on the backend per call
+if XXH3_AVAILABLE:
+    _new_key_hasher = xxhash.xxh3_64
+    _key_digest = xxhash.xxh3_64.intdigest
+elif BLAKE3_AVAILABLE:
+    _new_key_hasher = blake3.blake3
+    def _key_digest(hasher) -> int:
+        return int.from_bytes(hasher.digest(length=8), "little")
+else:
+    def _new_key_hasher(data: bytes):
+        return hashlib.blake2b(data, digest_size=8)
+    def _key_digest(hasher) -> int:
+        return int.from_bytes(hasher.digest(), "little")
+
+
 class EventIdempotency:
     """
     Fast metadata-based event deduplication.
     
-    Uses XXH3 (preferred) or blake2b (fallback) for sub-millisecond hashing.
+    Uses XXH3 (preferred), BLAKE3 or blake2b (fallbacks) for
+    sub-millisecond hashing.
     Hash key: path + mtime_ns + size (no file content I/O).
     """
     
     @staticmethod
-    def generate_key(filepath: str | Path) -> str:
+    def generate_key(filepath: str | Path) -> int:
         """
         Generate unique idempotency key from file metadata.
         
@@ -65,55 +101,120 @@ class EventIdempotency:
             filepath: Path to file
             
         Returns:
-            Hex digest string (16 chars for XXH3, 32 for blake2b)
+            Unsigned 64-bit int, used directly as the registry key
             
         Performance:
             - XXH3: ~0.01ms (64-bit hash)
-            - blake2b: ~0.05ms (128-bit hash)
+            - BLAKE3: in between (truncated to 64 bits)
+            - blake2b: ~0.05ms (64-bit hash)
         """
-        path_str = str(filepath)
+        hasher = _new_key_hasher(os.fsencode(filepath))
         
         try:
             stat = os.stat(filepath)
-            # Key components: path + nanosecond mtime + size
-            fingerprint = f"{path_str}:{stat.st_mtime_ns}:{stat.st_size}"
-            
-            # Method 1: XXH3 (preferred for speed)
-            if XXH3_AVAILABLE:
-                return xxhash.xxh3_64(fingerprint.encode()).hexdigest()
-            
-            # Method 2: blake2b fallback (digest_size=16 for 32-char hex)
-            else:
-                return hashlib.blake2b(
-                    fingerprint.encode(), 
-                    digest_size=16
-                ).hexdigest()
-                
-        except (OSError, FileNotFoundError):
+            # Key components: path + nanosecond mtime + size, fed as raw
+            # bytes (no intermediate f-string or UTF-8 encode)
+            hasher.update(_STAT_FIELDS.pack(stat.st_mtime_ns, stat.st_size))
+        except OSError:
             # Fallback: path-only hash (when file disappears)
-            if XXH3_AVAILABLE:
-                return xxhash.xxh3_64(path_str.encode()).hexdigest()
+            pass
+        
+        return _key_digest(hasher)
+    
+    @staticmethod
+    def generate_keys_bulk(
+        entries: Iterable[Union[str, Path, os.DirEntry]]
+    ) -> List[int]:
+        """
+        Generate metadata keys for many files (e.g. a directory scan).
+        
+        Keys are identical to generate_key() for the same path. DirEntry
+        objects from os.scandir() reuse their cached stat where the OS
+        provides one, and with XXH3 a single hasher is reset per entry
+        instead of allocating a new one.
+        
+        Args:
+            entries: Paths or os.DirEntry objects
+            
+        Returns:
+            One key per entry, in input order
+        """
+        pack = _STAT_FIELDS.pack
+        shared = xxhash.xxh3_64() if XXH3_AVAILABLE else None
+        keys: List[int] = []
+        
+        for entry in entries:
+            path_bytes = os.fsencode(entry)
+            if shared is not None:
+                shared.reset()
+                shared.update(path_bytes)
+                hasher = shared
             else:
-                return hashlib.blake2b(
-                    path_str.encode(), 
-                    digest_size=16
-                ).hexdigest()
+                hasher = _new_key_hasher(path_bytes)
+            
+            try:
+                stat = entry.stat() if isinstance(entry, os.DirEntry) else os.stat(entry)
+                hasher.update(pack(stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                # Fallback: path-only hash (when file disappears)
+                pass
+            
+            keys.append(_key_digest(hasher))
+        
+        return keys
+    
+    # Below this size a plain read() is cheaper than setting up an mmap
+    MMAP_THRESHOLD_BYTES = 64 * 1024
+    
+    @staticmethod
+    def generate_content_key(filepath: str | Path) -> str:
+        """
+        Generate a key from file content (for callers that need it).
+        
+        generate_key() stays metadata-only; this is the opt-in variant for
+        detecting identical content under a new path or mtime. Large files
+        are hashed through a read-only mmap so pages stream from the kernel
+        without Python-side copies.
+        
+        Args:
+            filepath: Path to file
+            
+        Returns:
+            Hex digest string (16 chars for XXH3, 32 for blake2b)
+            
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            
+            if size < EventIdempotency.MMAP_THRESHOLD_BYTES:
+                data = f.read()
+                if XXH3_AVAILABLE:
+                    return xxhash.xxh3_64_hexdigest(data)
+                return hashlib.blake2b(data, digest_size=16).hexdigest()
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if XXH3_AVAILABLE:
+                    return xxhash.xxh3_64_hexdigest(mm)
+                return hashlib.blake2b(mm, digest_size=16).hexdigest()
 
 
 # ===================================================================
 # PROCESSING RECORD
 # ===================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingRecord:
     """
     Record of file processing attempt.
     
-    Tracks status and retry count for observability.
+    Tracks status and retry count for observability. Slotted: no
+    per-instance __dict__, since the registry holds one per live event.
     """
-    event_key: str
+    event_key: int
     status: str  # 'processing', 'completed', 'failed'
-    timestamp: datetime
+    timestamp: int  # time.monotonic_ns()
     retry_count: int = 0
 
 
@@ -121,18 +222,42 @@ class ProcessingRecord:
 # PROCESSING REGISTRY (IN-MEMORY DEDUPLICATION)
 # ===================================================================
 
+class _RegistryShard:
+    """One slice of ProcessingRegistry: records, expiry heap and lock."""
+    
+    __slots__ = ("expiry_heap", "lock", "ops", "records")
+    
+    def __init__(self):
+        self.records: Dict[int, ProcessingRecord] = {}
+        self.expiry_heap: List[Tuple[int, int]] = []
+        self.lock = threading.Lock()
+        self.ops = 0
+
+
 class ProcessingRegistry:
     """
     In-memory registry for event deduplication.
     
     Thread-safe for Python 3.14 No-GIL.
-    Uses RLock for mutation, lock-free for hot path (lookup).
+    Keys are spread over SHARD_COUNT shards by hash, each with its own
+    plain Lock, so workers touching different keys do not serialize on
+    one registry-wide lock.
+    
+    Expiry is lazy: should_process() only checks the key it touches, and
+    a shard's min-heap of (expires_at, event_key) is drained every
+    SWEEP_EVERY calls on that shard (and by get_stats), popping just the
+    entries that are due.
+    
 Phase 1:
     - TTL-based expiration (default: 5 minutes)
     - Idempotency window (1 minute for completed events)
     - Retry logic (max 3 attempts)
     """
     
+    SHARD_COUNT = 16  # power of two: shard index is hash(key) & (SHARD_COUNT - 1)
+    SWEEP_EVERY = 1024  # should_process calls per shard between heap sweeps
+    IDEMPOTENCY_WINDOW_NS = 60 * 1_000_000_000  # completed events skipped for 1 minute
+    
     def __init__(self, ttl_seconds: int = 300):
         """
         Initialize processing registry.
@@ -140,11 +265,20 @@ Phase 1:
         Args:
             ttl_seconds: Time-to-live for records (default: 300s)
         """
-        self._registry: Dict[str, ProcessingRecord] = {}
-        self._lock = threading.RLock()
+        self._shards: List[_RegistryShard] = [
+            _RegistryShard() for _ in range(self.SHARD_COUNT)
+        ]
+        self._shard_mask = self.SHARD_COUNT - 1
         self.ttl = ttl_seconds
+        # Monotonic int nanoseconds: expiry is an int compare, no datetime
+        # or timedelta allocated per call
+        self._ttl_ns = ttl_seconds * 1_000_000_000
+    
+    def _shard(self, event_key: int) -> _RegistryShard:
+        """Shard owning event_key (int keys hash to themselves)."""
+        return self._shards[hash(event_key) & self._shard_mask]
         
-    def should_process(self, event_key: str) -> bool:
+    def should_process(self, event_key: int) -> bool:
         """
         Check if event should be processed.
         
@@ -158,81 +292,138 @@ Phase 1:
         Returns:
             True if event should be processed
         """
-        with self._lock:
-            self._cleanup_expired()
-            
-            if event_key not in self._registry:
-                return True
-                
-            record = self._registry[event_key]
+        shard = self._shard(event_key)
+        with shard.lock:
+            return self._should_process(shard, event_key)
+    
+    def try_claim(self, event_key: int) -> bool:
+        """
+        Atomically check should_process() and mark the event processing.
+        
+        Two workers racing on the same key cannot both win, unlike a
+        separate should_process() / mark_processing() pair.
+        
+        Args:
+            event_key: Event idempotency key
             
-            # Still processing? Skip
-            if record.status == 'processing':
+        Returns:
+            True if the caller now owns the event and should process it
+        """
+        shard = self._shard(event_key)
+        with shard.lock:
+            if not self._should_process(shard, event_key):
                 return False
-            
-            # Completed recently? Skip (idempotency window)
-            if record.status == 'completed':
-                time_since = datetime.now() - record.timestamp
-                if time_since < timedelta(seconds=60):  # 1-minute window
-                    return False
-            
-            # Failed but retryable? Process again
-            if record.status == 'failed' and record.retry_count < 3:
-                return True
-                
+            self._set_processing(shard, event_key)
+            return True
+    
+    def _should_process(self, shard: _RegistryShard, event_key: int) -> bool:
+        """should_process() body. MUST be called with shard.lock held."""
+        shard.ops += 1
+        if shard.ops % self.SWEEP_EVERY == 0:
+            self._cleanup_expired(shard)
+        
+        record = shard.records.get(event_key)
+        if record is None:
+            return True
+        
+        # Lazy expiry of just this key; its heap entry goes stale
+        now = time.monotonic_ns()
+        if record.timestamp + self._ttl_ns < now:
+            del shard.records[event_key]
+            return True
+        
+        # Still processing? Skip
+        if record.status == 'processing':
+            return False
+        
+        # Completed recently? Skip (idempotency window)
+        if (record.status == 'completed'
+                and now - record.timestamp < self.IDEMPOTENCY_WINDOW_NS):
             return False
+        
+        # Failed but retryable? Process again
+        if record.status == 'failed' and record.retry_count < 3:
+            return True
+            
+        return False
     
-    def mark_processing(self, event_key: str) -> None:
+    def mark_processing(self, event_key: int) -> None:
         """Mark event as being processed."""
-        with self._lock:
-            self._registry[event_key] = ProcessingRecord(
-                event_key=event_key,
-                status='processing',
-                timestamp=datetime.now()
-            )
-    
-    def mark_completed(self, event_key: str) -> None:
+        shard = self._shard(event_key)
+        with shard.lock:
+            self._set_processing(shard, event_key)
+    
+    def _set_processing(self, shard: _RegistryShard, event_key: int) -> None:
+        """Record event_key as processing. MUST be called with shard.lock held."""
+        record = ProcessingRecord(
+            event_key=event_key,
+            status='processing',
+            timestamp=time.monotonic_ns()
+        )
+        shard.records[event_key] = record
+        self._schedule_expiry(shard, record)
+    
+    def mark_completed(self, event_key: int) -> None:
         """Mark event as successfully completed."""
-        with self._lock:
-            if event_key in self._registry:
-                self._registry[event_key].status = 'completed'
-                self._registry[event_key].timestamp = datetime.now()
+        shard = self._shard(event_key)
+        with shard.lock:
+            record = shard.records.get(event_key)
+            if record is not None:
+                record.status = 'completed'
+                record.timestamp = time.monotonic_ns()
+                self._schedule_expiry(shard, record)
     
-    def mark_failed(self, event_key: str) -> None:
+    def mark_failed(self, event_key: int) -> None:
         """Mark event as failed (increment retry count)."""
-        with self._lock:
-            if event_key in self._registry:
-                record = self._registry[event_key]
+        shard = self._shard(event_key)
+        with shard.lock:
+            record = shard.records.get(event_key)
+            if record is not None:
                 record.status = 'failed'
                 record.retry_count += 1
-                record.timestamp = datetime.now()
-    
-    def _cleanup_expired(self) -> None:
-        """Remove records older than TTL."""
-        cutoff = datetime.now() - timedelta(seconds=self.ttl)
-        expired = [
-            key for key, record in self._registry.items()
-            if record.timestamp < cutoff
-        ]
-        for key in expired:
-            del self._registry[key]
+                record.timestamp = time.monotonic_ns()
+                self._schedule_expiry(shard, record)
+    
+    def _schedule_expiry(self, shard: _RegistryShard, record: ProcessingRecord) -> None:
+        """Push the record's new expiry time. MUST be called with shard.lock held."""
+        heapq.heappush(
+            shard.expiry_heap,
+            (record.timestamp + self._ttl_ns, record.event_key)
+        )
+    
+    def _cleanup_expired(self, shard: _RegistryShard) -> None:
+        """Remove a shard's records older than TTL. MUST hold shard.lock."""
+        now = time.monotonic_ns()
+        heap = shard.expiry_heap
+        records = shard.records
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            record = records.get(key)
+            # Skip stale heap entries whose record was refreshed since
+            if record is not None and record.timestamp + self._ttl_ns == expires_at:
+                del records[key]
     
     def get_stats(self) -> Dict[str, int]:
         """
         Get current registry statistics.
         
+        Shards are swept and counted one at a time, so the other shards
+        keep serving lookups meanwhile.
+        
         Returns:
             Dict with counts by status
         """
-        with self._lock:
-            self._cleanup_expired()
-            stats = {
-                'total': len(self._registry),
-                'processing': 0,
-                'completed': 0,
-                'failed': 0
-            }
-            for record in self._registry.values():
-                if record.status in stats:
-                    stats[record.status] += 1
-            return stats
+        stats = {
+            'total': 0,
+            'processing': 0,
+            'completed': 0,
+            'failed': 0
+        }
+        for shard in self._shards:
+            with shard.lock:
+                self._cleanup_expired(shard)
+                stats['total'] += len(shard.records)
+                for record in shard.records.values():
+                    if record.status in stats:
+                        stats[record.status] += 1
+        return stats
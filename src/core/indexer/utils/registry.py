@@ -8,7 +8,7 @@ Provides MIME type → Extractor class mapping.
 No fallback logic here - that belongs to the pipeline.
 """
 
-from typing import Optional
+from typing import Dict, Optional
 
 from ..extractors.pdf_extractor import PDFExtractor
 from ..extractors.docx_extractor import DOCXExtractor
@@ -22,6 +22,8 @@ class ExtractorRegistry:
     - Routing only, no fallback logic
     - Returns None for unsupported types (caller handles)
     - Stateless (can be shared across threads)
+    - One extractor instance per MIME type, built once and reused, so
+      extractors must stay stateless/reentrant (No-GIL safe)
     
     Supported MIME Types:
     - application/pdf → PDFExtractor
@@ -34,6 +36,17 @@ class ExtractorRegistry:
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DOCXExtractor,
     }
     
+    def __init__(self):
+        # Build each extractor once; one that fails to initialize (e.g.
+        # missing dependency) maps to None, as get_extractor always returned
+        instances: Dict[str, Optional[object]] = {}
+        for mime_type, extractor_class in self._extractors.items():
+            try:
+                instances[mime_type] = extractor_class()
+            except Exception:
+                instances[mime_type] = None
+        self._instances = instances
+    
     def get_extractor(self, mime_type: str) -> Optional[object]:
         """
         Get extractor instance for given MIME type.
@@ -48,16 +61,7 @@ class ExtractorRegistry:
             Returns None instead of raising exception.
             Caller (pipeline) decides how to handle unsupported types.
         """
-        extractor_class = self._extractors.get(mime_type)
-        if extractor_class is None:
-            return None
-        
-        try:
-            return extractor_class()
-        except Exception:
-            # If extractor initialization fails (e.g., missing dependency),
-            # return None and let pipeline handle it
-            return None
+        return self._instances.get(mime_type)
     
     def is_supported(self, mime_type: str) -> bool:
         """
@@ -14,6 +14,9 @@ class PluginLoader:
     Enforces 'PolyForm Noncommercial' header check.
     """
     
+    LICENSE_MARKER = b"PolyForm Noncommercial"
+    HEADER_SCAN_BYTES = 4096
+    
     def __init__(self):
         self._loaded_plugins: Dict[str, IPlugin] = {}
 
@@ -36,10 +39,11 @@ class PluginLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Plugin file not found: {file_path}")
             
-        # 1. Security Check: Verify Header
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if "PolyForm Noncommercial" not in content:
+        # 1. Security Check: Verify Header (only the top of the file is
+        # scanned, as raw bytes; the header must appear there)
+        with open(file_path, 'rb') as f:
+            head = f.read(self.HEADER_SCAN_BYTES)
+            if self.LICENSE_MARKER not in head:
                 logger.critical(f"Security Violation: Plugin {file_path.name} missing required license header.")
                 raise SecurityError(f"Plugin {file_path.name} rejected: Missing 'PolyForm Noncommercial' header.")
 
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 from typing import Any, Optional
@@ -8,12 +9,16 @@ class StreamType(str, Enum):
     INTERACTION = "interaction" 
     MEMORY = "memory"
 
-class BaseEvent(BaseModel):
+# Internal event schemas are built from trusted rows on every read/write, so they
+# are plain slotted dataclasses. Pydantic stays on the API-facing models below.
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BaseEvent:
     """Base Event Schema"""
     event_id: str
     timestamp: int
-    model_config = ConfigDict(extra="forbid", frozen=True)
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class DomainEvent(BaseEvent):
     stream_type: StreamType
     stream_id: str
@@ -22,15 +27,17 @@ class DomainEvent(BaseEvent):
     global_sequence: int
     timestamp: int
     payload: Any
-    prev_event_hash: Optional[str] = None
-    event_hash: str
+    prev_event_hash: Optional[bytes] = None
+    event_hash: bytes
     enc_algorithm: str = "pass-through"
     enc_key_id: Optional[str] = None
-    enc_nonce: Optional[str] = None
-    event_hmac: str
-    model_config = ConfigDict(extra="forbid", frozen=True)
+    enc_nonce: Optional[bytes] = None
+    event_hmac: bytes
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class MemoryEvent(DomainEvent): pass
+
+@dataclass(slots=True, frozen=True, kw_only=True)
 class InteractionEvent(DomainEvent): pass
 
 class SystemHealth(BaseModel):
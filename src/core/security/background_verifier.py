@@ -1,30 +1,109 @@
 import asyncio
+import os
 import threading
 import logging
 import sqlite3
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, Dict, Any
+from itertools import groupby
+from operator import attrgetter
+from typing import Optional, Dict, Any, Iterable, List, NamedTuple, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Rows pulled per fetchmany() and handed to HMACService.verify_many
+VERIFY_BATCH_SIZE = 1000
+# Prepared statements kept per connection (sqlite3 caches them by SQL text)
+CACHED_STATEMENTS = 256
+# Verified-event interval between progress reports
+PROGRESS_EVERY = 1024
+
+CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # 16 MiB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB
+)
+
+SQL_SELECT_UNVERIFIED = """
+    SELECT event_id, payload, event_hmac, stream_sequence, hmac_key_version, hmac_alg
+    FROM domain_events
+    WHERE stream_type = ? AND stream_id = ? AND stream_sequence > ?
+    ORDER BY stream_sequence ASC
+"""
+
+
+class EventRow(NamedTuple):
+    """Row of SQL_SELECT_UNVERIFIED; rows are never built into DomainEvent models."""
+    event_id: str
+    payload: bytes
+    event_hmac: bytes      # raw digest; hex str in legacy TEXT columns
+    stream_sequence: int
+    hmac_key_version: str
+    hmac_alg: str
+
+
+def _event_row(cursor: sqlite3.Cursor, row: tuple) -> EventRow:
+    return EventRow._make(row)
+
+
+_run_key = attrgetter("hmac_key_version", "hmac_alg")
+
+
+class _ProgressRelay:
+    """
+    Hands worker-thread progress to the event loop via call_soon_threadsafe.
+    
+    While a report is still waiting for the loop, newer counts overwrite it
+    instead of queueing more callbacks.
+    """
+    __slots__ = ("_loop", "_callback", "_lock", "_pending")
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: callable):
+        self._loop = loop
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._pending: Optional[int] = None
+    
+    def __call__(self, total_verified: int):
+        with self._lock:
+            scheduled = self._pending is not None
+            self._pending = total_verified
+        if not scheduled:
+            self._loop.call_soon_threadsafe(self._deliver)
+    
+    def _deliver(self):
+        with self._lock:
+            total_verified, self._pending = self._pending, None
+        try:
+            self._callback(total_verified)
+        except Exception:
+            logger.exception("Progress callback failed")
+
 class BackgroundChainVerifier:
     """
     Non-blocking chain verifier for Python 3.14 No-GIL.
     
     Strategy:
         - Verify incrementally (only new events since last check)
-        - Run in background thread pool
+        - Run in background thread pool (one worker per core)
         - Cache last verified sequence per stream
+        - Reuse one sqlite connection per worker thread (statement cache stays warm)
     """
     
-    def __init__(self, storage_adapter, max_workers: int = 2):
+    def __init__(self, storage_adapter, max_workers: Optional[int] = None):
         self.adapter = storage_adapter
+        # OpenSSL HMAC and sqlite release the GIL, so one worker per core scales
+        max_workers = max_workers or os.cpu_count() or 2
+        self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(
             max_workers=max_workers,
             thread_name_prefix="chain-verify"
         )
-        self._verification_cache: Dict[str, int] = {}
+        # (stream_type, stream_id) -> last verified stream_sequence
+        self._verification_cache: Dict[Tuple[str, str], int] = {}
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
     
     async def verify_stream_async(
         self,
@@ -38,14 +117,16 @@ class BackgroundChainVerifier:
         Returns:
             True if chain is valid, False otherwise
         """
-        key = f"{stream_type}:{stream_id}"
+        key = (stream_type, stream_id)
         
         # Check cache
         with self._lock:
             last_verified_seq = self._verification_cache.get(key, 0)
         
-        # Verify only new events
-        loop = asyncio.get_event_loop()
+        # Verify only new events; progress is reported back on this loop
+        loop = asyncio.get_running_loop()
+        if progress_callback:
+            progress_callback = _ProgressRelay(loop, progress_callback)
         try:
             result = await loop.run_in_executor(
                 self.executor,
@@ -67,6 +148,29 @@ class BackgroundChainVerifier:
             logger.error(f"Background verification failed: {e}")
             return False
     
+    async def verify_all_streams(
+        self,
+        streams: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        Verify several streams concurrently.
+        
+        At most 2 * max_workers verifications are in flight at once, so a large
+        stream list does not flood the executor queue.
+        
+        Returns:
+            {(stream_type, stream_id): valid}
+        """
+        streams = list(dict.fromkeys(streams))
+        sem = asyncio.Semaphore(self.max_workers * 2)
+        
+        async def verify(stream_type: str, stream_id: str) -> bool:
+            async with sem:
+                return await self.verify_stream_async(stream_type, stream_id)
+        
+        results = await asyncio.gather(*(verify(*stream) for stream in streams))
+        return dict(zip(streams, results))
+    
     def _verify_incremental(
         self,
         stream_type: str,
@@ -77,49 +181,58 @@ class BackgroundChainVerifier:
         """
         Synchronous verification (runs in thread pool).
         
-        This is CPU-bound (HMAC + SHA3), so it runs in a worker thread
+        This is CPU-bound (HMAC-SHA-256), so it runs in a worker thread
         to avoid blocking the asyncio event loop.
         """
         # This runs in a background thread (Python 3.14 No-GIL)
         # Use synchronous sqlite3 (not aiosqlite)
         
-        conn = sqlite3.connect(str(self.adapter.db_path))
+        conn = self._connection()
+        # One read snapshot for the whole stream
+        conn.execute("BEGIN DEFERRED")
         try:
-            cursor = conn.execute(
-                """
-                SELECT event_id, payload, event_hmac, stream_sequence, hmac_key_version
-                FROM domain_events
-                WHERE stream_type = ? AND stream_id = ? AND stream_sequence > ?
-                ORDER BY stream_sequence ASC
-                """,
-                (stream_type, stream_id, start_seq)
-            )
+            cursor = conn.execute(SQL_SELECT_UNVERIFIED, (stream_type, stream_id, start_seq))
+            cursor.row_factory = _event_row
+            cursor.arraysize = VERIFY_BATCH_SIZE
+            verify_many = self.adapter.hmac_service.verify_many
             
             valid = True
             last_seq = start_seq
             total_verified = 0
             
-            for row in cursor:
-                event_id, payload, stored_hmac, seq, key_ver = row
-                
-                # Verify HMAC (CPU-intensive)
-                # Note: We access self.adapter.hmac_service.verify which is thread-safe (pure python/stdlib)
-                if not self.adapter.hmac_service.verify(payload, stored_hmac, stream_id, key_ver):
-                    logger.warning(f"HMAC failed: {event_id}")
-                    valid = False
+            while valid:
+                rows = cursor.fetchmany()
+                if not rows:
                     break
                 
-                last_seq = seq
-                total_verified += 1
-                
-                # Report progress every 100 events
-                if progress_callback and total_verified % 100 == 0:
-                    # Callback might need to be thread-safe or scheduled on loop
-                    # For simplicity, we assume callback handles threading or is just logging
-                    try:
-                        progress_callback(total_verified)
-                    except Exception:
-                        pass
+                # Consecutive rows sharing key version and algorithm share one stream key
+                for (key_ver, hmac_alg), run in groupby(rows, key=_run_key):
+                    run = list(run)
+                    # Verify HMAC (CPU-intensive); HMACService is thread-safe (pure python/stdlib)
+                    ok = verify_many(
+                        [row.payload for row in run],
+                        [row.event_hmac for row in run],
+                        stream_id,
+                        key_ver,
+                        hmac_alg,
+                    )
+                    if ok:
+                        last_seq = run[ok - 1].stream_sequence
+                    previous = total_verified
+                    total_verified += ok
+                    
+                    # Report progress every PROGRESS_EVERY events (through
+                    # _ProgressRelay when called from verify_stream_async)
+                    if progress_callback and total_verified // PROGRESS_EVERY > previous // PROGRESS_EVERY:
+                        try:
+                            progress_callback(total_verified)
+                        except Exception:
+                            pass
+                    
+                    if ok < len(run):
+                        logger.warning(f"HMAC failed: {run[ok].event_id}")
+                        valid = False
+                        break
             
             return {
                 "valid": valid,
@@ -127,8 +240,29 @@ class BackgroundChainVerifier:
                 "total_verified": total_verified
             }
         finally:
-            conn.close()
+            conn.rollback()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Long-lived connection for the calling worker thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.adapter.db_path),
+                isolation_level=None,
+                check_same_thread=False,  # closed from shutdown()
+                cached_statements=CACHED_STATEMENTS,
+            )
+            for pragma in CONNECT_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
     
     def shutdown(self):
-        """Graceful shutdown of thread pool."""
+        """Graceful shutdown of thread pool and worker connections."""
         self.executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
@@ -9,8 +9,38 @@ import nacl.bindings
 import hashlib
 import hmac
 from typing import Dict, Any, Tuple
+from ..crypto.hmac_service import DEFAULT_HMAC_ALG, hmac_digestmod
+
+# AES-256-GCM (pycryptodome) for DEK wrapping, opt-in per call
+try:
+    from Crypto.Cipher import AES
+    HAS_AESGCM = True
+except ImportError:
+    HAS_AESGCM = False
 
 NONCE_SIZE = 24
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+
+# DEK wrap algorithms. XChaCha20-Poly1305 is the default on every path
+# (wrap and unwrap alike) and the format of all existing blobs; AES-256-GCM
+# must be requested explicitly and its name stored with the blob.
+DEK_WRAP_XCHACHA20 = "XChaCha20-Poly1305"
+DEK_WRAP_AES256GCM = "AES-256-GCM"
+DEK_WRAP_NONCE_SIZES = {
+    DEK_WRAP_XCHACHA20: NONCE_SIZE,
+    DEK_WRAP_AES256GCM: GCM_NONCE_SIZE,
+}
+
+
+def _dek_wrap_nonce_size(algorithm: str) -> int:
+    try:
+        nonce_size = DEK_WRAP_NONCE_SIZES[algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported DEK wrap algorithm: {algorithm}") from None
+    if algorithm == DEK_WRAP_AES256GCM and not HAS_AESGCM:
+        raise RuntimeError("AES-256-GCM DEK wrapping requires pycryptodome")
+    return nonce_size
 
 class TamperDetectedError(Exception):
     """Raised when data integrity check fails (HMAC mismatch)."""
@@ -18,17 +48,34 @@ class TamperDetectedError(Exception):
 
 class EncryptionService:
     @staticmethod
-    def encrypt_dek(dek: bytes, kek: bytes) -> Dict[str, bytes]:
-        """Encrypt DEK using KEK with XChaCha20-Poly1305."""
-        nonce = nacl.utils.random(NONCE_SIZE)
-        ciphertext = nacl.bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(
-            dek, None, nonce, kek
-        )
-        return {"ciphertext": ciphertext, "nonce": nonce}
+    def encrypt_dek(dek: bytes, kek: bytes, algorithm: str = DEK_WRAP_XCHACHA20) -> Dict[str, Any]:
+        """
+        Encrypt DEK using KEK with XChaCha20-Poly1305 or AES-256-GCM.
+        The returned algorithm must be stored alongside the blob.
+        """
+        nonce = nacl.utils.random(_dek_wrap_nonce_size(algorithm))
+        if algorithm == DEK_WRAP_AES256GCM:
+            ciphertext, tag = AES.new(kek, AES.MODE_GCM, nonce=nonce).encrypt_and_digest(dek)
+            ciphertext += tag
+        else:
+            ciphertext = nacl.bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(
+                dek, None, nonce, kek
+            )
+        return {"ciphertext": ciphertext, "nonce": nonce, "algorithm": algorithm}
 
     @staticmethod
-    def decrypt_dek(ciphertext: bytes, nonce: bytes, kek: bytes) -> bytes:
-        """Decrypt DEK using KEK."""
+    def decrypt_dek(
+        ciphertext: bytes, nonce: bytes, kek: bytes, algorithm: str = DEK_WRAP_XCHACHA20
+    ) -> bytes:
+        """
+        Decrypt DEK using KEK and the algorithm stored with it.
+        Defaults to XChaCha20-Poly1305, matching encrypt_dek.
+        """
+        _dek_wrap_nonce_size(algorithm)
+        if algorithm == DEK_WRAP_AES256GCM:
+            return AES.new(kek, AES.MODE_GCM, nonce=nonce).decrypt_and_verify(
+                ciphertext[:-GCM_TAG_SIZE], ciphertext[-GCM_TAG_SIZE:]
+            )
         return nacl.bindings.crypto_aead_xchacha20poly1305_ietf_decrypt(
             ciphertext, None, nonce, kek
         )
@@ -41,13 +88,15 @@ class EncryptionService:
         return dek, hmac_key
 
     @staticmethod
-    def encrypt_event(dek: bytes, hmac_key: bytes, plaintext: bytes) -> Tuple[bytes, bytes, bytes]:
+    def encrypt_event(
+        dek: bytes, hmac_key: bytes, plaintext: bytes, hmac_alg: str = DEFAULT_HMAC_ALG
+    ) -> Tuple[bytes, bytes, bytes]:
         """
         Encrypt event with Double-MAC protection.
         Returns: (ciphertext, nonce, event_hmac)
         """
         # 1. Calculate HMAC on plaintext (Chain Layer)
-        event_hmac = hmac.new(hmac_key, plaintext, hashlib.sha3_256).digest()
+        event_hmac = hmac.new(hmac_key, plaintext, hmac_digestmod(hmac_alg)).digest()
         
         # 2. Encrypt with XChaCha20-Poly1305 (AEAD Layer)
         nonce = nacl.utils.random(NONCE_SIZE)
@@ -58,9 +107,17 @@ class EncryptionService:
         return ciphertext, nonce, event_hmac
 
     @staticmethod
-    def decrypt_event(dek: bytes, hmac_key: bytes, ciphertext: bytes, nonce: bytes, event_hmac: bytes) -> bytes:
+    def decrypt_event(
+        dek: bytes,
+        hmac_key: bytes,
+        ciphertext: bytes,
+        nonce: bytes,
+        event_hmac: bytes,
+        hmac_alg: str = DEFAULT_HMAC_ALG,
+    ) -> bytes:
         """
         Decrypt event and verify Double-MAC.
+        ``hmac_alg`` must be the algorithm stored with the event.
         Raises TamperDetectedError if HMAC verification fails.
         """
         # 1. Decrypt (AEAD Layer verifies Poly1305 tag)
@@ -72,22 +129,26 @@ class EncryptionService:
             raise TamperDetectedError(f"AEAD decryption failed: {e}")
         
         # 2. Verify Chain HMAC
-        expected_hmac = hmac.new(hmac_key, plaintext, hashlib.sha3_256).digest()
+        expected_hmac = hmac.new(hmac_key, plaintext, hmac_digestmod(hmac_alg)).digest()
         if not hmac.compare_digest(expected_hmac, event_hmac):
             raise TamperDetectedError("Chain HMAC Mismatch - Data tampered")
         
         return plaintext
 
     @staticmethod
-    def wrap_dek(kek: bytes, dek: bytes) -> bytes:
-        """Wrap DEK with KEK (nonce embedded in output)."""
-        result = EncryptionService.encrypt_dek(dek, kek)
+    def wrap_dek(kek: bytes, dek: bytes, algorithm: str = DEK_WRAP_XCHACHA20) -> bytes:
+        """
+        Wrap DEK with KEK (nonce embedded in output).
+        The blob does not record its algorithm; pass the same one to unwrap_dek.
+        """
+        result = EncryptionService.encrypt_dek(dek, kek, algorithm)
         # Embed nonce in the blob
         return result["nonce"] + result["ciphertext"]
 
     @staticmethod
-    def unwrap_dek(kek: bytes, wrapped: bytes) -> bytes:
-        """Unwrap DEK from wrapped blob."""
-        nonce = wrapped[:NONCE_SIZE]
-        ciphertext = wrapped[NONCE_SIZE:]
-        return EncryptionService.decrypt_dek(ciphertext, nonce, kek)
\ No newline at end of file
+    def unwrap_dek(kek: bytes, wrapped: bytes, algorithm: str = DEK_WRAP_XCHACHA20) -> bytes:
+        """Unwrap DEK from wrapped blob (algorithm as stored with the blob)."""
+        nonce_size = _dek_wrap_nonce_size(algorithm)
+        nonce = wrapped[:nonce_size]
+        ciphertext = wrapped[nonce_size:]
+        return EncryptionService.decrypt_dek(ciphertext, nonce, kek, algorithm)
@@ -3,17 +3,63 @@
 # Licensed under PolyForm Noncommercial 1.0.
 # ------------------------------------------------------------------------------
 
+import asyncio
 import aiosqlite
 import os
+import weakref
 from typing import Dict, Any, Optional
 
+from .storage import watch_connection
+
+CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # FULL, not NORMAL: under WAL a NORMAL commit can be undone by power
+    # loss, and system_keys holds the only copy of the wrapped DEK
+    "PRAGMA synchronous=FULL",
+    "PRAGMA mmap_size=268435456",   # 256 MiB
+    "PRAGMA cache_size=-8000",      # 8 MiB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
 class KeyStorage:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # One connection for the lifetime of the storage (see close()); the
+        # schema is created once, when that connection is opened. Use
+        # ``async with`` or close(); otherwise watch_connection stops it.
+        self._db: Optional[aiosqlite.Connection] = None
+        self._db_finalizer: Optional[weakref.finalize] = None
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "KeyStorage":
+        await self._init_db()
+        return self
 
-    async def _init_db(self):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        async with aiosqlite.connect(self.db_path) as db:
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def close(self):
+        db, self._db = self._db, None
+        self._initialized = False
+        if self._db_finalizer is not None:
+            self._db_finalizer.detach()
+            self._db_finalizer = None
+        if db is not None:
+            await db.close()
+
+    async def _init_db(self) -> aiosqlite.Connection:
+        if self._initialized:
+            return self._db
+        async with self._init_lock:
+            if self._initialized:
+                return self._db
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            db = await aiosqlite.connect(self.db_path)
+            for pragma in CONNECT_PRAGMAS:
+                await db.execute(pragma)
+            db.row_factory = aiosqlite.Row
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS system_keys (
                     id INTEGER PRIMARY KEY CHECK (id = 1),
@@ -31,44 +77,44 @@ class KeyStorage:
                 ) STRICT;
             """)
             await db.commit()
+            self._db = db
+            self._db_finalizer = watch_connection(self, db)
+            self._initialized = True
+            return db
 
     async def key_exists(self) -> bool:
-        await self._init_db()
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT 1 FROM system_keys WHERE id = 1") as cursor:
-                return await cursor.fetchone() is not None
+        db = await self._init_db()
+        async with db.execute("SELECT 1 FROM system_keys WHERE id = 1") as cursor:
+            return await cursor.fetchone() is not None
 
     async def save_keys(self, salt: bytes, enc_dek: bytes, dek_nonce: bytes, ops_limit: int, mem_limit: int,
                   rk_wrapped_dek: bytes, recovery_salt: bytes, rk_ops_limit: int, rk_mem_limit: int, rk_nonce: bytes):
-        await self._init_db()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO system_keys (
-                    id, salt, enc_dek, dek_nonce, ops_limit, mem_limit,
-                    rk_wrapped_dek, recovery_salt, rk_ops_limit, rk_mem_limit, rk_nonce
-                ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (salt, enc_dek, dek_nonce, ops_limit, mem_limit, 
-                   rk_wrapped_dek, recovery_salt, rk_ops_limit, rk_mem_limit, rk_nonce))
-            await db.commit()
+        db = await self._init_db()
+        await db.execute("""
+            INSERT OR REPLACE INTO system_keys (
+                id, salt, enc_dek, dek_nonce, ops_limit, mem_limit,
+                rk_wrapped_dek, recovery_salt, rk_ops_limit, rk_mem_limit, rk_nonce
+            ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (salt, enc_dek, dek_nonce, ops_limit, mem_limit,
+               rk_wrapped_dek, recovery_salt, rk_ops_limit, rk_mem_limit, rk_nonce))
+        await db.commit()
 
     async def load_keys(self) -> Dict[str, Any]:
-        await self._init_db()
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM system_keys WHERE id = 1") as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    raise ValueError("No keys found in database.")
-                return dict(row)
+        db = await self._init_db()
+        async with db.execute("SELECT * FROM system_keys WHERE id = 1") as cursor:
+            row = await cursor.fetchone()
+            if not row:
+                raise ValueError("No keys found in database.")
+            return dict(row)
 
     async def load_recovery_keys(self) -> Dict[str, Any]:
         return await self.load_keys()
 
     async def update_passkey_wrap(self, salt: bytes, enc_dek: bytes, dek_nonce: bytes, ops_limit: int, mem_limit: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                UPDATE system_keys 
-                SET salt = ?, enc_dek = ?, dek_nonce = ?, ops_limit = ?, mem_limit = ?
-                WHERE id = 1
-            """, (salt, enc_dek, dek_nonce, ops_limit, mem_limit))
-            await db.commit()
\ No newline at end of file
+        db = await self._init_db()
+        await db.execute("""
+            UPDATE system_keys
+            SET salt = ?, enc_dek = ?, dek_nonce = ?, ops_limit = ?, mem_limit = ?
+            WHERE id = 1
+        """, (salt, enc_dek, dek_nonce, ops_limit, mem_limit))
+        await db.commit()
@@ -2,16 +2,23 @@
 Key Management System (KMS) - Omega Standard
 Status: FIXED (Synchronous API + Correct NaCl Constants)
 """
+import asyncio
+import hashlib
+import hmac
 import os
 import json
-from typing import Optional
+import time
+from typing import Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
+from .memory import SecureBytes
+
 try:
     from nacl.secret import SecretBox
     from nacl.utils import random
     from nacl.pwhash import argon2id
+    from .encryption import EncryptionService
     HAS_CRYPTO = True
 except ImportError:
     HAS_CRYPTO = False
@@ -25,6 +32,9 @@ class KeyStore:
     kdf: str = "argon2id"
 
 class KMS:
+    # Argon2id-derived KEK kept for repeat unlocks within a session (never persisted)
+    KEK_CACHE_TTL_S = 300.0
+
     def __init__(self, storage_path: str = "security/keys.json"):
         if not os.path.isabs(storage_path):
             base = Path.cwd()
@@ -37,6 +47,12 @@ class KMS:
             
         self._master_key: Optional[bytes] = None
         self._is_unlocked: bool = False
+        # (DEK, HMAC key) derived once per unlock; see get_keys()
+        self._keys: Optional[Tuple[bytes, bytes]] = None
+        # (cache_key, expires_at, kek); cache_key is keyed with a per-process
+        # secret so it is not an offline passphrase oracle
+        self._kek_cache: Optional[Tuple[bytes, float, SecureBytes]] = None
+        self._kek_cache_secret = os.urandom(32)
 
     @property
     def is_unlocked(self) -> bool:
@@ -54,13 +70,7 @@ class KMS:
         salt = random(argon2id.SALTBYTES)
         master_key = random(32) 
         
-        kdf_key = argon2id.kdf(
-            SecretBox.KEY_SIZE,
-            passphrase.encode('utf-8'),
-            salt,
-            opslimit=argon2id.OPSLIMIT_MODERATE,
-            memlimit=argon2id.MEMLIMIT_MODERATE
-        )
+        kdf_key = self._derive_kek(passphrase.encode('utf-8'), salt)
         
         box = SecretBox(kdf_key)
         nonce = random(SecretBox.NONCE_SIZE)
@@ -74,6 +84,7 @@ class KMS:
             ciphertext=ciphertext.hex()
         )
         self._save_keystore(keystore)
+        self._remember_kek(self._kek_cache_key(passphrase.encode('utf-8'), salt), kdf_key)
         return True
 
     def unlock(self, passphrase: str) -> bool:
@@ -86,22 +97,80 @@ class KMS:
             nonce = bytes.fromhex(keystore.nonce)
             ciphertext = bytes.fromhex(keystore.ciphertext)
             
-            kdf_key = argon2id.kdf(
-                SecretBox.KEY_SIZE,
-                passphrase.encode('utf-8'),
-                salt,
-                opslimit=argon2id.OPSLIMIT_MODERATE,
-                memlimit=argon2id.MEMLIMIT_MODERATE
-            )
+            password = passphrase.encode('utf-8')
+            cache_key = self._kek_cache_key(password, salt)
+            kdf_key = self._cached_kek(cache_key)
+            derived = kdf_key is None
+            if derived:
+                kdf_key = self._derive_kek(password, salt)
             
             box = SecretBox(kdf_key)
             self._master_key = box.decrypt(ciphertext, nonce)
+            self._keys = EncryptionService.derive_keys(self._master_key)
             self._is_unlocked = True
+            # Only a KEK that actually opened the keystore is cached
+            if derived:
+                self._remember_kek(cache_key, kdf_key)
             return True
         except Exception:
             self._is_unlocked = False
             return False
 
+    def get_keys(self) -> Tuple[bytes, bytes]:
+        """Return (DEK, HMAC key) for the unlocked master key without re-deriving."""
+        if self._keys is None:
+            raise RuntimeError("Vault Locked: Must unlock vault before using keys")
+        return self._keys
+
+    def close(self):
+        """Lock the vault and zero the cached KEK."""
+        self._evict_kek()
+        self._master_key = None
+        self._keys = None
+        self._is_unlocked = False
+
+    def _derive_kek(self, password: bytes, salt: bytes) -> bytes:
+        return argon2id.kdf(
+            SecretBox.KEY_SIZE,
+            password,
+            salt,
+            opslimit=argon2id.OPSLIMIT_MODERATE,
+            memlimit=argon2id.MEMLIMIT_MODERATE
+        )
+
+    def _kek_cache_key(self, password: bytes, salt: bytes) -> bytes:
+        return hashlib.blake2b(salt + password, key=self._kek_cache_secret, digest_size=16).digest()
+
+    def _cached_kek(self, cache_key: bytes) -> Optional[bytes]:
+        cached = self._kek_cache
+        if cached is None:
+            return None
+        key, expires_at, kek = cached
+        if expires_at <= time.monotonic():
+            self._evict_kek()
+            return None
+        if not hmac.compare_digest(key, cache_key):
+            return None
+        return bytes(kek.data)
+
+    def _remember_kek(self, cache_key: bytes, kek: bytes):
+        self._evict_kek()
+        self._kek_cache = (cache_key, time.monotonic() + self.KEK_CACHE_TTL_S, SecureBytes(kek))
+
+    def _evict_kek(self):
+        cached, self._kek_cache = self._kek_cache, None
+        if cached is not None:
+            cached[2].secure_delete()
+
+    # Async entry points for request handlers. Argon2id takes ~0.5 s and libsodium
+    # releases the GIL while hashing, so a worker thread keeps the event loop free
+    # without pickling the passphrase over to a process pool.
+    async def initialize_vault(self, passphrase: str) -> bool:
+        return await asyncio.to_thread(self.initialize, passphrase)
+
+    async def unlock_vault(self, passphrase: str) -> bool:
+        return await asyncio.to_thread(self.unlock, passphrase)
+
     def _save_keystore(self, keystore: KeyStore):
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.storage_path, 'w') as f:
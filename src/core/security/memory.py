@@ -6,6 +6,31 @@ CRITICAL: This module handles sensitive data and MUST zero memory on deletion.
 import ctypes
 from typing import Optional
 
+# explicit_bzero (glibc >= 2.25, BSDs) is guaranteed not to be optimised away;
+# elsewhere ctypes.memset is an opaque libc call from Python's side.
+try:
+    _explicit_bzero = ctypes.CDLL(None).explicit_bzero
+    _explicit_bzero.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+    _explicit_bzero.restype = None
+except (OSError, AttributeError, TypeError):
+    _explicit_bzero = None
+
+
+def _zero_buffer(data: bytearray) -> None:
+    """Zero a bytearray in place with a single libc call."""
+    size = len(data)
+    if not size:
+        return
+    view = (ctypes.c_char * size).from_buffer(data)
+    try:
+        if _explicit_bzero is not None:
+            _explicit_bzero(ctypes.addressof(view), size)
+        else:
+            ctypes.memset(ctypes.addressof(view), 0, size)
+    finally:
+        # Release the buffer export so the bytearray can be resized again
+        del view
+
 
 class SecureBytes:
     """
@@ -40,11 +65,8 @@ class SecureBytes:
         if self._is_zeroed:
             return  # Already zeroed
         
-        # Layer 1: Manual overwrite (most reliable)
-        if len(self.data) > 0:
-            # Overwrite with zeros
-            for i in range(len(self.data)):
-                self.data[i] = 0
+        # Layer 1: Manual overwrite (explicit_bzero / memset over the buffer)
+        _zero_buffer(self.data)
         
         self._is_zeroed = True
     
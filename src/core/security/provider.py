@@ -4,7 +4,7 @@
 # ------------------------------------------------------------------------------
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
 class CryptoProvider(ABC):
     """Abstract Base Class for Cryptographic Operations."""
@@ -15,8 +15,8 @@ class CryptoProvider(ABC):
         pass
     
     @abstractmethod
-    def derive_key(self, passkey: str, salt: bytes, opslimit: int, memlimit: int, parallelism: int) -> bytes:
-        """Derive key using Argon2id."""
+    def derive_key(self, passkey: Union[bytes, str], salt: bytes, opslimit: int, memlimit: int, parallelism: int) -> bytes:
+        """Derive key using Argon2id. Raw key material (e.g. a seed) is passed as bytes as-is."""
         pass
     
     @abstractmethod
@@ -6,14 +6,19 @@
 
 import secrets
 import hashlib
-from typing import Optional
+import functools
+from typing import List, Optional
 import asyncio
 
 # BIP39 library
 try:
     from mnemonic import Mnemonic
+    # Wordlist is read and indexed once; Mnemonic is read-only afterwards,
+    # so the instance is shared by all calls and threads
+    _MNEMO_EN = Mnemonic("english")
     HAS_MNEMONIC = True
 except ImportError:
+    _MNEMO_EN = None
     HAS_MNEMONIC = False
 
 # Argon2 for key derivation
@@ -75,8 +80,7 @@ def generate_recovery_phrase(strength: int = 256) -> str:
         raise RecoveryCryptoError("mnemonic library not available")
     
     try:
-        mnemo = Mnemonic("english")
-        phrase = mnemo.generate(strength=strength)
+        phrase = _MNEMO_EN.generate(strength=strength)
         return phrase
     except Exception as e:
         raise RecoveryCryptoError(f"Failed to generate recovery phrase: {e}")
@@ -102,8 +106,7 @@ def validate_phrase(phrase: Optional[str]) -> bool:
         return False
     
     try:
-        mnemo = Mnemonic("english")
-        return mnemo.check(phrase)
+        return _MNEMO_EN.check(phrase)
     except Exception:
         return False
 
@@ -132,19 +135,24 @@ async def phrase_to_seed(phrase: str, passphrase: str = "") -> bytes:
     if not HAS_MNEMONIC:
         raise RecoveryCryptoError("mnemonic library not available")
     
-    # Validate phrase first
-    if not validate_phrase(phrase):
+    if not isinstance(phrase, str) or not phrase.strip():
+        raise RecoveryPhraseInvalidError("Invalid recovery phrase")
+    
+    # Normalize once and check the checksum on the same string that is fed
+    # to PBKDF2 (to_seed's own NFKD pass is then a no-op)
+    try:
+        normalized = _MNEMO_EN.normalize_string(phrase)
+        valid = _MNEMO_EN.check(normalized)
+    except Exception:
+        valid = False
+    if not valid:
         raise RecoveryPhraseInvalidError("Invalid recovery phrase")
     
     try:
-        mnemo = Mnemonic("english")
         # Run PBKDF2 in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         seed = await loop.run_in_executor(
-            None,
-            mnemo.to_seed,
-            phrase,
-            passphrase
+            None, functools.partial(_MNEMO_EN.to_seed, normalized, passphrase)
         )
         return seed
     except RecoveryPhraseInvalidError:
@@ -153,15 +161,39 @@ async def phrase_to_seed(phrase: str, passphrase: str = "") -> bytes:
         raise RecoveryCryptoError(f"Failed to derive seed: {e}")
 
 
+async def phrases_to_seeds(phrases: List[str], passphrase: str = "") -> List[bytes]:
+    """
+    Derive seeds for several BIP39 phrases concurrently.
+    
+    PBKDF2-HMAC-SHA512 runs inside hashlib's C code with the GIL released,
+    so the executor threads spread the derivations across cores.
+    
+    Args:
+        phrases: The BIP39 mnemonic phrases
+        passphrase: Optional passphrase applied to every phrase
+    
+    Returns:
+        List[bytes]: 64-byte seeds, in the order of ``phrases``
+    
+    Raises:
+        RecoveryPhraseInvalidError: If any phrase is invalid
+        RecoveryCryptoError: If seed derivation fails
+    """
+    seeds = await asyncio.gather(*(phrase_to_seed(phrase, passphrase) for phrase in phrases))
+    return list(seeds)
+
+
 # ------------------------------------------------------------------------------
 # KEY DERIVATION (Argon2id)
 # ------------------------------------------------------------------------------
 
-def derive_recovery_key(seed: bytes, salt: bytes) -> bytes:
+async def derive_recovery_key(seed: bytes, salt: bytes) -> bytes:
     """
     Derive a 32-byte recovery key from seed using Argon2id.
     
-    This is used to derive encryption keys from the BIP39 seed.
+    This is used to derive encryption keys from the BIP39 seed. The
+    64 MiB Argon2id run happens in the default executor so it does not
+    block the event loop.
     
     Args:
         seed: The 64-byte BIP39 seed
@@ -174,13 +206,19 @@ def derive_recovery_key(seed: bytes, salt: bytes) -> bytes:
         ValueError: If salt length is not exactly 16 bytes
         RecoveryCryptoError: If key derivation fails
     """
-    # Validate salt length
+    # Validate salt length before dispatching to a worker thread
     if len(salt) != 16:
         raise ValueError("Salt must be exactly 16 bytes")
     
     if not HAS_NACL:
         raise RecoveryCryptoError("nacl library not available for Argon2id")
     
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _derive_recovery_key_sync, seed, salt)
+
+
+def _derive_recovery_key_sync(seed: bytes, salt: bytes) -> bytes:
+    """Blocking Argon2id derivation behind derive_recovery_key."""
     try:
         # Use Argon2id with moderate parameters (64 MiB)
         key = nacl.pwhash.argon2id.kdf(
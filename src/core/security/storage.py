@@ -3,41 +3,104 @@
 # Licensed under PolyForm Noncommercial 1.0.
 # ------------------------------------------------------------------------------
 
+import asyncio
 import aiosqlite
 import logging
+import threading
+import weakref
 from typing import Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # Key writes are rare and must survive power loss once committed
+    "PRAGMA synchronous=FULL",
+    "PRAGMA mmap_size=67108864",    # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+)
+
+def watch_connection(owner: object, db: aiosqlite.Connection) -> weakref.finalize:
+    """
+    Stop db's worker thread if owner goes away without close().
+    
+    aiosqlite runs each connection on a non-daemon thread, so a storage
+    that is never closed would keep the interpreter from exiting. The hook
+    fires when owner is garbage-collected, or at interpreter exit before
+    non-daemon threads are joined. Call detach() on the result once the
+    connection is closed normally.
+    """
+    finalizer = weakref.finalize(owner, db.stop)
+    # Same hook concurrent.futures uses; plain atexit runs after the join
+    register_atexit = getattr(threading, "_register_atexit", None)
+    if register_atexit is not None:
+        register_atexit(finalizer)
+    return finalizer
+
 class KeyStorage:
     """
     Manages persistence of encrypted keys with Recovery Phrase support.
+    
+    Prefer ``async with KeyStorage(path)`` or an explicit close(); an
+    unclosed storage is only stopped when collected or at exit.
     """
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._db_lock = asyncio.Lock()
+        self._db_finalizer: Optional[weakref.finalize] = None
+
+    async def __aenter__(self) -> "KeyStorage":
+        await self._get_db()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Shared connection, opened on first use and kept until close()."""
+        if self._db is None:
+            async with self._db_lock:
+                if self._db is None:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    db = await aiosqlite.connect(self.db_path)
+                    for pragma in CONNECT_PRAGMAS:
+                        await db.execute(pragma)
+                    self._db = db
+                    self._db_finalizer = watch_connection(self, db)
+        return self._db
+
+    async def close(self):
+        """Close the shared connection."""
+        db, self._db = self._db, None
+        if self._db_finalizer is not None:
+            self._db_finalizer.detach()
+            self._db_finalizer = None
+        if db is not None:
+            await db.close()
 
     async def ensure_table_exists(self):
         """Ensure system_keys table exists with recovery columns"""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS system_keys (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    salt BLOB NOT NULL,
-                    enc_dek BLOB NOT NULL,
-                    rk_wrapped_dek BLOB,
-                    dek_nonce BLOB NOT NULL,
-                    ops_limit INTEGER NOT NULL,
-                    mem_limit INTEGER NOT NULL,
-                    recovery_salt BLOB,
-                    rk_ops_limit INTEGER DEFAULT 2,
-                    rk_mem_limit INTEGER DEFAULT 67108864,
-                    created_at INTEGER DEFAULT (unixepoch())
-                ) STRICT;
-            """)
-            await db.commit()
+        db = await self._get_db()
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS system_keys (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                salt BLOB NOT NULL,
+                enc_dek BLOB NOT NULL,
+                rk_wrapped_dek BLOB,
+                dek_nonce BLOB NOT NULL,
+                ops_limit INTEGER NOT NULL,
+                mem_limit INTEGER NOT NULL,
+                recovery_salt BLOB,
+                rk_ops_limit INTEGER DEFAULT 2,
+                rk_mem_limit INTEGER DEFAULT 67108864,
+                created_at INTEGER DEFAULT (unixepoch())
+            ) STRICT;
+        """)
+        await db.commit()
 
     async def save_keys(
         self, 
@@ -52,25 +115,25 @@ class KeyStorage:
         rk_mem: int = 67108864
     ):
         """Save all keys with optional recovery data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT OR REPLACE INTO system_keys 
-                   (id, salt, enc_dek, rk_wrapped_dek, dek_nonce, ops_limit, mem_limit, 
-                    recovery_salt, rk_ops_limit, rk_mem_limit) 
-                   VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (salt, enc_dek, rk_wrapped_dek, dek_nonce, ops, mem, recovery_salt, rk_ops, rk_mem)
-            )
-            await db.commit()
+        db = await self._get_db()
+        await db.execute(
+            """INSERT OR REPLACE INTO system_keys 
+               (id, salt, enc_dek, rk_wrapped_dek, dek_nonce, ops_limit, mem_limit, 
+                recovery_salt, rk_ops_limit, rk_mem_limit) 
+               VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (salt, enc_dek, rk_wrapped_dek, dek_nonce, ops, mem, recovery_salt, rk_ops, rk_mem)
+        )
+        await db.commit()
 
     async def load_keys(self) -> Optional[Tuple[bytes, bytes, Optional[bytes], bytes, int, int, Optional[bytes], int, int]]:
         """Load all keys including recovery data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("""
-                SELECT salt, enc_dek, rk_wrapped_dek, dek_nonce, ops_limit, mem_limit, 
-                       recovery_salt, rk_ops_limit, rk_mem_limit
-                FROM system_keys WHERE id = 1
-            """) as cursor:
-                return await cursor.fetchone()
+        db = await self._get_db()
+        async with db.execute("""
+            SELECT salt, enc_dek, rk_wrapped_dek, dek_nonce, ops_limit, mem_limit, 
+                   recovery_salt, rk_ops_limit, rk_mem_limit
+            FROM system_keys WHERE id = 1
+        """) as cursor:
+            return await cursor.fetchone()
 
     async def load_recovery_keys(self) -> Optional[Tuple[bytes, bytes, int, int]]:
         """
@@ -80,12 +143,12 @@ class KeyStorage:
             Tuple of (recovery_salt, rk_wrapped_dek, rk_ops_limit, rk_mem_limit)
             or None if no recovery keys exist
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("""
-                SELECT recovery_salt, rk_wrapped_dek, rk_ops_limit, rk_mem_limit
-                FROM system_keys WHERE id = 1 AND rk_wrapped_dek IS NOT NULL
-            """) as cursor:
-                return await cursor.fetchone()
+        db = await self._get_db()
+        async with db.execute("""
+            SELECT recovery_salt, rk_wrapped_dek, rk_ops_limit, rk_mem_limit
+            FROM system_keys WHERE id = 1 AND rk_wrapped_dek IS NOT NULL
+        """) as cursor:
+            return await cursor.fetchone()
 
     async def update_passkey_wrap(self, new_salt: bytes, new_enc_dek: bytes):
         """
@@ -95,11 +158,11 @@ class KeyStorage:
             new_salt: New salt for passkey KDF
             new_enc_dek: New wrapped DEK with new passkey
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """UPDATE system_keys 
-                   SET salt = ?, enc_dek = ?
-                   WHERE id = 1""",
-                (new_salt, new_enc_dek)
-            )
-            await db.commit()
+        db = await self._get_db()
+        await db.execute(
+            """UPDATE system_keys 
+               SET salt = ?, enc_dek = ?
+               WHERE id = 1""",
+            (new_salt, new_enc_dek)
+        )
+        await db.commit()
@@ -124,12 +124,14 @@ class HeavyEventBus:
         if isinstance(event, dict) and "batch_id" in event:
             batch_id = event["batch_id"]
         
-        # Create envelope
+        # Create envelope (one clock read for both timestamps)
+        now = time.time()
         envelope = EventEnvelope(
             event_id=event_id,
             batch_id=batch_id,
-            timestamp=time.time(),
-            event=event
+            timestamp=now,
+            event=event,
+            publish_time=now
         )
         
         with self._queue_lock:
@@ -11,6 +11,7 @@ import hashlib
 from pathlib import Path
 from typing import List, Dict, Any
 from ..security.kms import KMS
+from ..crypto.hmac_service import DEFAULT_HMAC_ALG, LEGACY_HMAC_ALG
 from ..security.encryption import EncryptionService, TamperDetectedError
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,8 @@ class StorageAdapter:
                     enc_key_id TEXT DEFAULT 'v1',
                     enc_nonce BLOB,              -- 24 bytes
                     
-                    event_hmac BLOB NOT NULL,    -- HMAC-SHA3-256 (Chain)
+                    event_hmac BLOB NOT NULL,    -- HMAC (Chain), see hmac_alg
+                    hmac_alg TEXT NOT NULL DEFAULT 'sha256',
                     event_hash BLOB,             -- Current Hash (Simplification)
                     timestamp INTEGER NOT NULL,
                     
@@ -44,6 +46,16 @@ class StorageAdapter:
                     tamper_reason TEXT
                 )
             """)
+            # Databases created before hmac_alg existed only hold SHA3-256 chains
+            try:
+                await db.execute(
+                    "ALTER TABLE domain_events ADD COLUMN hmac_alg TEXT NOT NULL DEFAULT 'sha256'"
+                )
+            except aiosqlite.OperationalError as e:
+                if "duplicate column name" not in str(e).lower():
+                    raise
+            else:
+                await db.execute("UPDATE domain_events SET hmac_alg = ?", (LEGACY_HMAC_ALG,))
             await db.commit()
         self._init_done = True
 
@@ -52,21 +64,23 @@ class StorageAdapter:
         if not self.kms.is_unlocked or self.kms._master_key is None:
             raise RuntimeError("Vault Locked: Must unlock vault before saving events")
         
-        # Derive DEK and HMAC key from master key
-        dek, hmac_key = EncryptionService.derive_keys(self.kms._master_key)
+        # DEK and HMAC key, derived once at unlock
+        dek, hmac_key = self.kms.get_keys()
         await self._ensure_schema()
         
         json_bytes = orjson.dumps(payload)
         
         # Encrypt + Chain HMAC
-        enc_blob, nonce, event_hmac = EncryptionService.encrypt_event(dek, hmac_key, json_bytes)
+        enc_blob, nonce, event_hmac = EncryptionService.encrypt_event(
+            dek, hmac_key, json_bytes, DEFAULT_HMAC_ALG
+        )
         
         async with aiosqlite.connect(self.db_path) as db:
             cur = await db.execute(
                 """INSERT INTO domain_events 
-               (stream_type, stream_id, payload, enc_nonce, event_hmac, timestamp) 
-               VALUES (?, ?, ?, ?, ?, ?)""",
-                (stream_type, stream_id, enc_blob, nonce, event_hmac, int(time.time()))
+               (stream_type, stream_id, payload, enc_nonce, event_hmac, hmac_alg, timestamp) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (stream_type, stream_id, enc_blob, nonce, event_hmac, DEFAULT_HMAC_ALG, time.time_ns() // 1_000_000_000)
             )
             await db.commit()
             return cur.lastrowid
@@ -76,21 +90,21 @@ class StorageAdapter:
         if not self.kms.is_unlocked or self.kms._master_key is None:
             raise RuntimeError("Vault Locked: Must unlock vault before reading events")
         
-        # Derive DEK and HMAC key from master key
-        dek, hmac_key = EncryptionService.derive_keys(self.kms._master_key)
+        # DEK and HMAC key, derived once at unlock
+        dek, hmac_key = self.kms.get_keys()
         await self._ensure_schema()
         
         results = []
         async with aiosqlite.connect(self.db_path) as db:
             # SELECT matching the Rev 2 Schema
-            query = "SELECT event_id, stream_type, payload, enc_nonce, event_hmac, timestamp FROM domain_events WHERE quarantine=0 ORDER BY timestamp DESC LIMIT ?"
+            query = "SELECT event_id, stream_type, payload, enc_nonce, event_hmac, hmac_alg, timestamp FROM domain_events WHERE quarantine=0 ORDER BY timestamp DESC LIMIT ?"
             async with db.execute(query, (limit,)) as cur:
                 async for row in cur:
-                    eid, stype, payload, nonce, ehmac, ts = row
+                    eid, stype, payload, nonce, ehmac, alg, ts = row
                     try:
                         if nonce:
                             # Decrypt + Verify Chain
-                            plain = EncryptionService.decrypt_event(dek, hmac_key, payload, nonce, ehmac)
+                            plain = EncryptionService.decrypt_event(dek, hmac_key, payload, nonce, ehmac, alg)
                             data = orjson.loads(plain)
                             results.append({"id": eid, "type": stype, "payload": data})
                         else:
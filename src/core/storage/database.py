@@ -38,8 +38,9 @@ class DatabaseManager:
             enc_algorithm TEXT DEFAULT 'pass-through',
             enc_key_id TEXT, 
             enc_nonce BLOB, 
-            event_hmac TEXT NOT NULL,
+            event_hmac BLOB NOT NULL,
             hmac_key_version TEXT NOT NULL DEFAULT 'v1',
+            hmac_alg TEXT NOT NULL DEFAULT 'sha256',
             UNIQUE(stream_type, stream_id, stream_sequence)
         ) STRICT;
         
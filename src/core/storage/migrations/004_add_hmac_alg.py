@@ -0,0 +1,30 @@
+# src/core/storage/migrations/004_add_hmac_alg.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def upgrade(conn):
+    """Add hmac_alg column (existing rows were chained with HMAC-SHA3-256)."""
+    logger.info("Applying migration: 004_add_hmac_alg")
+    try:
+        # DEFAULT matches DEFAULT_HMAC_ALG for rows written after this migration
+        await conn.execute("""
+            ALTER TABLE domain_events 
+            ADD COLUMN hmac_alg TEXT NOT NULL DEFAULT 'sha256'
+        """)
+        
+        # Every row present now was chained with SHA3-256: backfill explicitly
+        await conn.execute("UPDATE domain_events SET hmac_alg = 'sha3-256'")
+        
+        logger.info("Migration 004 successful")
+    except Exception as e:
+        # Ignore if column already exists (idempotency)
+        if "duplicate column name" in str(e).lower():
+            logger.info("Migration 004: Column already exists, skipping.")
+        else:
+            raise
+
+async def downgrade(conn):
+    """Remove hmac_alg column."""
+    logger.warning("Downgrade not fully supported for SQLite (requires table recreation). Skipping.")
+    pass
@@ -0,0 +1,87 @@
+# src/core/storage/migrations/005_event_hmac_blob.py
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_TABLE = "domain_events"
+_NEW_TABLE = "domain_events_005"
+_PAGE_SIZE = 1000
+
+_CREATE_NAME = re.compile(
+    r'^(\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?)["`\[]?domain_events["`\]]?',
+    re.IGNORECASE,
+)
+_HMAC_TEXT = re.compile(r'(\bevent_hmac\s+)TEXT\b', re.IGNORECASE)
+
+
+async def _fetchall(conn, sql, params=()):
+    cursor = await conn.execute(sql, params)
+    return await cursor.fetchall()
+
+
+async def upgrade(conn):
+    """
+    Rebuild domain_events with event_hmac as BLOB.
+
+    Tables created before raw digests were stored declare event_hmac TEXT.
+    In a STRICT table that column rejects the bytes sign_digest() returns,
+    and SQLite cannot change a column type in place, so the table is copied
+    into a new one with the hex digests decoded to raw bytes.
+    """
+    logger.info("Applying migration: 005_event_hmac_blob")
+    columns = await _fetchall(conn, f"PRAGMA table_info({_TABLE})")
+    hmac_type = next((col[2] for col in columns if col[1] == "event_hmac"), None)
+    if hmac_type is None or hmac_type.upper() != "TEXT":
+        logger.info("Migration 005: event_hmac is not TEXT, skipping.")
+        return
+
+    (table_sql,), = await _fetchall(
+        conn, "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (_TABLE,)
+    )
+    extras = await _fetchall(
+        conn,
+        "SELECT sql FROM sqlite_master "
+        "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (_TABLE,),
+    )
+
+    new_sql = _HMAC_TEXT.sub(r"\1BLOB", table_sql, count=1)
+    new_sql = _CREATE_NAME.sub(rf"\1{_NEW_TABLE}", new_sql, count=1)
+    await conn.execute(new_sql)
+
+    names = [col[1] for col in columns]
+    hmac_index = names.index("event_hmac")
+    column_list = ", ".join(f'"{name}"' for name in names)
+    select_sql = (
+        f"SELECT rowid, {column_list} FROM {_TABLE} "
+        f"WHERE rowid > ? ORDER BY rowid LIMIT {_PAGE_SIZE}"
+    )
+    insert_sql = (
+        f"INSERT INTO {_NEW_TABLE} (rowid, {column_list}) "
+        f"VALUES (?, {', '.join('?' * len(names))})"
+    )
+
+    last_rowid = 0
+    while True:
+        rows = await _fetchall(conn, select_sql, (last_rowid,))
+        if not rows:
+            break
+        for row in rows:
+            values = list(row)
+            digest = values[1 + hmac_index]
+            if isinstance(digest, str):
+                values[1 + hmac_index] = bytes.fromhex(digest)
+            await conn.execute(insert_sql, values)
+        last_rowid = rows[-1][0]
+
+    await conn.execute(f"DROP TABLE {_TABLE}")
+    await conn.execute(f"ALTER TABLE {_NEW_TABLE} RENAME TO {_TABLE}")
+    for (sql,) in extras:
+        await conn.execute(sql)
+
+    logger.info("Migration 005 successful")
+
+async def downgrade(conn):
+    """Restore event_hmac TEXT."""
+    logger.warning("Downgrade not fully supported for SQLite (requires table recreation). Skipping.")
@@ -29,7 +29,8 @@ CREATE TABLE IF NOT EXISTS domain_events (
     enc_nonce BLOB,               -- 24 bytes (NULL = Legacy Plaintext)
     
     -- INTEGRITY & ROLLBACK PROTECTION
-    event_hmac BLOB NOT NULL,     -- HMAC-SHA3-256 of Plaintext (Raw Bytes)
+    event_hmac BLOB NOT NULL,     -- HMAC of Plaintext (Raw Bytes), digest per hmac_alg
+    hmac_alg TEXT NOT NULL DEFAULT 'sha256',
     prev_event_hash BLOB,         -- SHA3-256 of Previous Event
     event_hash BLOB NOT NULL,     -- SHA3-256 Chain
     
@@ -5,7 +5,7 @@
 
 import logging
 import sys
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 from ..security.provider import CryptoProvider
 
 logger = logging.getLogger(__name__)
@@ -48,16 +48,19 @@ class SodiumBackend(CryptoProvider):
     def is_available(self) -> bool:
         return self._available
     
-    def derive_key(self, passkey: str, salt: bytes, opslimit: int, memlimit: int, parallelism: int) -> bytes:
+    def derive_key(self, passkey: Union[bytes, str], salt: bytes, opslimit: int, memlimit: int, parallelism: int) -> bytes:
         if not self.is_available():
             raise CryptoUnavailableError("SodiumBackend not available")
         
+        # Only text passkeys are encoded; raw bytes go to Argon2 untouched
+        secret = passkey.encode('utf-8') if isinstance(passkey, str) else passkey
+        
         try:
             # Convert memlimit from bytes to KiB for argon2-cffi
             memory_cost_kib = memlimit // 1024
             
             key = self._argon2.hash_secret_raw(
-                secret=passkey.encode('utf-8'),
+                secret=secret,
                 salt=salt,
                 time_cost=opslimit,
                 memory_cost=memory_cost_kib,
@@ -148,3 +148,34 @@ def test_T25_04_docx_extraction_performance(sample_docx):
     p50 = times[49]
     p95 = times[94]
     
+
+
+def test_T25_05_flatten_table_contract():
+    """T25.05: Table flattening trims cells and drops blank rows"""
+    from src.core.indexer.extractors.docx_extractor import flatten_table
+    
+    rows = [[" Header 1 ", "Header 2"], ["  ", ""], ["Data 1", " "]]
+    expected = "Header 1\tHeader 2\nData 1\t"
+    
+    assert flatten_table(rows) == expected
+    assert flatten_table(iter(rows)) == expected
+    assert flatten_table([]) == ""
+
+
+@pytest.mark.skipif(not PYTHON_DOCX_AVAILABLE, reason="python-docx not installed")
+def test_T25_07_core_properties_opt_in(tmp_path):
+    """T25.07: Core properties are only read when requested"""
+    from src.core.indexer.extractors.docx_extractor import DOCXExtractor
+    
+    docx_path = tmp_path / "props.docx"
+    doc = Document()
+    doc.core_properties.title = "Quarterly Report"
+    doc.add_paragraph("body")
+    doc.save(str(docx_path))
+    
+    lean = DOCXExtractor().extract(docx_path)
+    full = DOCXExtractor(include_core_props=True).extract(docx_path)
+    
+    assert "title" not in lean.metadata
+    assert full.metadata["title"] == "Quarterly Report"
+    assert lean.total_text == full.total_text
@@ -0,0 +1,157 @@
+"""
+Idempotency Utility Tests
+Task 6.5 - Sprint 6 Background Services
+
+Covers EventIdempotency key generation and ProcessingRegistry expiry.
+"""
+
+import time
+
+from src.core.indexer.utils.idempotency import ProcessingRegistry
+
+
+def test_T31_01_expired_records_are_evicted():
+    """T31.01: Records older than TTL disappear from the registry"""
+    registry = ProcessingRegistry(ttl_seconds=0)
+    registry.mark_processing("a")
+    registry.mark_processing("b")
+    
+    assert registry.get_stats()["total"] == 0
+    assert registry.should_process("a")
+
+
+def test_T31_02_refreshed_record_outlives_stale_expiry():
+    """T31.02: Status updates push the expiry forward"""
+    registry = ProcessingRegistry(ttl_seconds=1)
+    registry.mark_processing("a")
+    registry.mark_processing("b")
+    
+    time.sleep(0.6)
+    registry.mark_completed("b")
+    time.sleep(0.6)
+    
+    stats = registry.get_stats()
+    assert stats["total"] == 1
+    assert stats["completed"] == 1
+    assert not registry.should_process("b")
+
+
+def test_T31_03_content_key_small_and_mmap_paths(tmp_path):
+    """T31.03: Content key depends on bytes only, for read and mmap paths"""
+    from src.core.indexer.utils.idempotency import EventIdempotency
+    
+    small_a = tmp_path / "a.txt"
+    small_b = tmp_path / "b.txt"
+    small_a.write_bytes(b"same content")
+    small_b.write_bytes(b"same content")
+    
+    big = tmp_path / "big.bin"
+    big.write_bytes(b"x" * (EventIdempotency.MMAP_THRESHOLD_BYTES * 2))
+    
+    assert EventIdempotency.generate_content_key(small_a) == EventIdempotency.generate_content_key(small_b)
+    assert EventIdempotency.generate_key(small_a) != EventIdempotency.generate_key(small_b)
+    assert EventIdempotency.generate_content_key(big) != EventIdempotency.generate_content_key(small_a)
+
+
+def test_T31_04_metadata_key_tracks_stat_fields(tmp_path):
+    """T31.04: Metadata key is stable, changes with size, and survives deletion"""
+    from src.core.indexer.utils.idempotency import EventIdempotency
+    
+    target = tmp_path / "doc.txt"
+    target.write_bytes(b"v1")
+    first = EventIdempotency.generate_key(target)
+    assert isinstance(first, int) and 0 <= first < 2 ** 64
+    
+    assert EventIdempotency.generate_key(str(target)) == first
+    
+    target.write_bytes(b"version 2")
+    second = EventIdempotency.generate_key(target)
+    assert second != first
+    
+    target.unlink()
+    assert EventIdempotency.generate_key(target) not in (first, second)
+
+
+def test_T31_05_lazy_expiry_between_sweeps():
+    """T31.05: An expired key is evicted on touch; others wait for the sweep"""
+    registry = ProcessingRegistry(ttl_seconds=0)
+    step = registry.SHARD_COUNT  # 1, 1 + step, 1 + 2 * step share a shard
+    shard = registry._shard(1)
+    registry.mark_processing(1)
+    registry.mark_processing(1 + step)
+    time.sleep(0.01)
+    
+    assert registry.should_process(1)
+    assert 1 not in shard.records
+    assert 1 + step in shard.records  # untouched, not yet swept
+    
+    shard.ops = registry.SWEEP_EVERY - 1
+    registry.should_process(1 + 2 * step)
+    assert shard.records == {}
+
+
+def test_T31_06_bulk_keys_match_single_keys(tmp_path):
+    """T31.06: generate_keys_bulk matches generate_key for paths and DirEntry"""
+    import os
+    
+    from src.core.indexer.utils.idempotency import EventIdempotency
+    
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text(name)
+    missing = tmp_path / "gone.txt"
+    
+    entries = sorted(os.scandir(tmp_path), key=lambda e: e.name)
+    paths = [e.path for e in entries] + [missing]
+    expected = [EventIdempotency.generate_key(p) for p in paths]
+    
+    assert EventIdempotency.generate_keys_bulk(paths) == expected
+    assert EventIdempotency.generate_keys_bulk(entries) == expected[:3]
+
+
+def test_T31_07_keys_spread_across_shards():
+    """T31.07: Keys land in per-key shards and stats aggregate all of them"""
+    registry = ProcessingRegistry()
+    for key in range(registry.SHARD_COUNT * 4):
+        registry.mark_processing(key)
+    registry.mark_completed(3)
+    registry.mark_failed(5)
+    
+    assert all(len(shard.records) == 4 for shard in registry._shards)
+    assert registry.get_stats() == {'total': 64, 'processing': 62, 'completed': 1, 'failed': 1}
+    assert not registry.should_process(3)
+    assert registry.should_process(5)
+
+
+def test_T31_08_pipeline_status_is_int_backed():
+    """T31.08: PipelineStatus compares as int but still prints its name"""
+    from src.core.indexer.utils.idempotency import PipelineStatus
+    
+    assert PipelineStatus.INDEXED == 1
+    assert len({PipelineStatus.INDEXED, PipelineStatus.RETRY}) == 2
+    assert str(PipelineStatus.QUARANTINED) == "QUARANTINED"
+    assert f"{PipelineStatus.DEGRADED}" == "DEGRADED"
+
+
+def test_T31_09_try_claim_is_exclusive():
+    """T31.09: Only one of many racing workers claims a key"""
+    import threading
+    
+    registry = ProcessingRegistry()
+    barrier = threading.Barrier(8)
+    wins = []
+    
+    def worker():
+        barrier.wait()
+        if registry.try_claim(42):
+            wins.append(threading.current_thread().name)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(wins) == 1
+    assert registry.get_stats()["processing"] == 1
+    registry.mark_failed(42)
+    assert registry.try_claim(42)
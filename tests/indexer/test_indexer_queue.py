@@ -427,6 +427,544 @@ class TestIndexerQueuePerformance(unittest.TestCase):
         
         print("\n   ✅ T10: Graceful shutdown persists pending events")
 
+    @pytest.mark.indexer_resilience
+    def test_T11_concurrent_producers_lose_no_events(self):
+        """T11: Lock-free ingress keeps every event across concurrent producers"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=50)
+        queue.start()
+        
+        def produce(worker):
+            for i in range(500):
+                queue._on_event_received({
+                    "event_id": f"w{worker}-event-{i:03d}",
+                    "data": f"file_{i}.md"
+                })
+        
+        producers = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+        for t in producers:
+            t.start()
+        for t in producers:
+            t.join()
+        
+        queue.stop(graceful=True)
+        
+        conn = sqlite3.connect(self.db_path)
+        total_persisted = conn.execute("SELECT SUM(event_count) FROM pending_batches").fetchone()[0]
+        conn.close()
+        
+        self.assertEqual(total_persisted, 2000)
+        print("\n   ✅ T11: 4 producers x 500 events all persisted")
+
+    @pytest.mark.indexer_resilience
+    def test_T12_bloom_filter_gates_database_lookup(self):
+        """T12: New IDs skip the SQLite lookup; replayed IDs survive restart"""
+        queue1 = IndexerQueue(db_path=self.db_path, batch_size=10)
+        queue1.start()
+        for i in range(10):
+            queue1._on_event_received({"event_id": f"event-{i:03d}"})
+        queue1.stop(graceful=True)
+        
+        queue2 = IndexerQueue(db_path=self.db_path, batch_size=10)
+        queue2.LOAD_PAGE_SIZE = 3  # force several pages on reload
+        queue2.start()
+        with patch.object(
+            queue2, "_is_event_in_database", wraps=queue2._is_event_in_database
+        ) as db_lookup:
+            queue2._on_event_received({"event_id": "event-003"})  # replay
+            queue2._on_event_received({"event_id": "brand-new-event"})
+            
+            self.assertEqual(db_lookup.call_count, 1)
+        
+        metrics = queue2.metrics()
+        queue2.stop()
+        
+        self.assertEqual(metrics.events_duplicate_total, 1)
+        self.assertEqual(metrics.events_received_total, 1)
+        print("\n   ✅ T12: Bloom filter skips DB for new IDs")
+
+    @pytest.mark.indexer_resilience
+    def test_T13_legacy_json_batches_still_decode(self):
+        """T13: Batches written as plain JSON before the binary format still load"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=10)
+        queue.start()
+        
+        legacy = [{"event_id": "old-001", "data": "file.md"}]
+        conn = queue._get_connection()
+        conn.execute(
+            "INSERT INTO pending_batches (batch_id, created_at, event_count, events_data) "
+            "VALUES (?, ?, ?, ?)",
+            ("legacy-batch", time.time() - 60, 1, json.dumps(legacy).encode("utf-8"))
+        )
+        for i in range(10):
+            queue._on_event_received({"event_id": f"event-{i:03d}", "sequence": i})
+        
+        first = queue.get_next_batch(timeout=0.5)
+        second = queue.get_next_batch(timeout=0.5)
+        queue.stop()
+        
+        self.assertEqual(first.events, legacy)
+        self.assertEqual([e["sequence"] for e in second.events], list(range(10)))
+        print("\n   ✅ T13: Legacy JSON and orjson batches both decode")
+
+    def test_T14_adaptive_flush_interval(self):
+        """T14: Flush timer follows sqrt(2*F0/lambda), capped by flush_timeout_ms"""
+        queue = IndexerQueue(db_path=self.db_path, flush_timeout_ms=500)
+        
+        # Unknown arrival rate -> fixed timeout
+        self.assertEqual(queue._next_flush_interval(), 0.5)
+        
+        # F0 = 2ms, one event every 100ms -> sqrt(2 * 0.002 * 0.1) = 20ms
+        queue._flush_latencies = [2.0, 2.0, 2.0]
+        queue._arrival_gap_ewma = 0.1
+        queue._last_arrival = time.monotonic()
+        self.assertAlmostEqual(queue._next_flush_interval(), 0.02, places=2)
+        
+        # Idle for a long time -> relaxes back to the cap
+        queue._last_arrival = time.monotonic() - 3600
+        self.assertEqual(queue._next_flush_interval(), 0.5)
+        print("\n   ✅ T14: Adaptive flush interval")
+
+    def test_T15_get_next_batch_wakes_on_flush(self):
+        """T15: A waiting consumer wakes when a batch is persisted, without polling"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5, flush_timeout_ms=10000)
+        queue.start()
+        
+        with patch.object(queue, "_try_get_batch", wraps=queue._try_get_batch) as try_get:
+            result = {}
+            consumer = threading.Thread(
+                target=lambda: result.setdefault("batch", queue.get_next_batch(timeout=5.0))
+            )
+            consumer.start()
+            time.sleep(0.2)
+            idle_checks = try_get.call_count
+            
+            start = time.time()
+            for i in range(5):
+                queue._on_event_received({"event_id": f"event-{i:03d}"})
+            consumer.join(timeout=5.0)
+            wake_latency = time.time() - start
+        
+        queue.stop()
+        
+        self.assertEqual(idle_checks, 1, "Consumer should not poll while idle")
+        self.assertIsNotNone(result["batch"])
+        self.assertEqual(result["batch"].event_count, 5)
+        self.assertLess(wake_latency, 1.0)
+        print(f"\n   ✅ T15: Consumer woke {wake_latency * 1000:.1f}ms after flush")
+
+    def test_T16_reads_do_not_wait_for_writer_lock(self):
+        """T16: metrics() runs on a per-thread read connection, not under _db_lock"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5)
+        queue.start()
+        for i in range(5):
+            queue._on_event_received({"event_id": f"event-{i:03d}"})
+        
+        result = {}
+        with queue._db_lock:  # simulate a long write transaction
+            reader = threading.Thread(target=lambda: result.setdefault("m", queue.metrics()))
+            reader.start()
+            reader.join(timeout=2.0)
+            self.assertFalse(reader.is_alive(), "metrics() blocked on the writer lock")
+        
+        self.assertEqual(result["m"].pending_batches, 1)
+        self.assertIsNot(queue._get_read_connection(), queue._get_connection())
+        queue.stop()
+        self.assertEqual(queue._read_conns, set())
+        print("\n   ✅ T16: Readers bypass the writer lock")
+
+    def test_T17_large_batch_round_trips(self):
+        """T17: A batch of a few hundred KB is stored and read back intact"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=200)
+        queue.start()
+        
+        payload = "x" * 1024
+        for i in range(200):
+            queue._on_event_received({"event_id": f"event-{i:03d}", "sequence": i, "blob": payload})
+        
+        batch = queue.get_next_batch(timeout=1.0)
+        queue.stop()
+        
+        self.assertIsNotNone(batch)
+        self.assertEqual([e["sequence"] for e in batch.events], list(range(200)))
+        self.assertTrue(all(e["blob"] == payload for e in batch.events))
+        print("\n   ✅ T17: Large batch round-tripped")
+
+    def test_T18_wal_checkpoint_runs_off_the_flush_path(self):
+        """T18: Auto-checkpoint is off; every Nth flush checkpoints in the background"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=1)
+        queue.CHECKPOINT_EVERY_BATCHES = 3
+        queue.start()
+        
+        autocheckpoint = queue._get_connection().execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+        self.assertEqual(autocheckpoint, 0)
+        
+        for i in range(2):
+            queue._on_event_received({"event_id": f"event-{i:03d}"})
+        self.assertIsNone(queue._checkpoint_thread)
+        
+        queue._on_event_received({"event_id": "event-002"})
+        checkpoint_thread = queue._checkpoint_thread
+        self.assertIsNotNone(checkpoint_thread)
+        checkpoint_thread.join(timeout=2.0)
+        self.assertFalse(checkpoint_thread.is_alive())
+        self.assertEqual(queue._batches_since_checkpoint, 0)
+        
+        queue.stop()
+        print("\n   ✅ T18: WAL checkpoint scheduled between flushes")
+
+    def test_T19_pending_pick_uses_index_without_sort(self):
+        """T19: SQL_GET_PENDING is served by idx_pending_batches_pick, no temp B-tree"""
+        from src.core.indexer.queue import SQL_GET_PENDING
+        
+        queue = IndexerQueue(db_path=self.db_path)
+        queue.start()
+        plan = " ".join(
+            row[-1] for row in
+            queue._get_connection().execute("EXPLAIN QUERY PLAN " + SQL_GET_PENDING)
+        )
+        queue.stop()
+        
+        self.assertIn("idx_pending_batches_pick", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        print(f"\n   ✅ T19: {plan}")
+
+    def test_T20_done_batches_archived_and_expired_ids_purged(self):
+        """T20: mark_batch_done archives the row; purge drops expired processed_events"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5)
+        queue.start()
+        for i in range(5):
+            queue._on_event_received({"event_id": f"event-{i:03d}"})
+        
+        batch = queue.get_next_batch(timeout=1.0)
+        self.assertTrue(queue.mark_batch_done(batch.batch_id))
+        self.assertFalse(queue.mark_batch_done(batch.batch_id))
+        
+        conn = queue._get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM pending_batches").fetchone()[0], 0)
+        self.assertEqual(
+            conn.execute("SELECT event_count FROM archived_batches").fetchall(), [(5,)]
+        )
+        self.assertEqual(queue.metrics().done_batches, 1)
+        
+        self.assertEqual(queue.purge_processed_events(), 0)  # still within TTL
+        queue.PURGE_CHUNK_SIZE = 2  # exercise the chunk loop
+        self.assertEqual(queue.purge_processed_events(max_age_s=-1), 5)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM processed_events").fetchone()[0], 0)
+        
+        queue.stop()
+        
+        # The archived count is seeded from the table on restart
+        queue = IndexerQueue(db_path=self.db_path)
+        queue.start()
+        self.assertEqual(queue.metrics().done_batches, 1)
+        queue.stop()
+        print("\n   ✅ T20: Done batch archived, expired IDs purged")
+
+    def test_T21_producers_not_blocked_during_persist(self):
+        """T21: _buffer_lock is released before the SQLite write"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5)
+        queue.start()
+        
+        in_persist = threading.Event()
+        release = threading.Event()
+        original_persist = queue._persist_batch
+        
+        def slow_persist(batch_id, events):
+            in_persist.set()
+            release.wait(timeout=5.0)
+            original_persist(batch_id, events)
+        
+        queue._persist_batch = slow_persist
+        flusher = threading.Thread(
+            target=lambda: [queue._on_event_received({"event_id": f"event-{i:03d}"}) for i in range(5)]
+        )
+        flusher.start()
+        self.assertTrue(in_persist.wait(timeout=2.0))
+        
+        producer = threading.Thread(
+            target=lambda: (queue._on_event_received({"event_id": "event-late"}), queue.metrics())
+        )
+        producer.start()
+        producer.join(timeout=1.0)
+        blocked = producer.is_alive()
+        
+        release.set()
+        flusher.join(timeout=5.0)
+        queue.stop()
+        
+        self.assertFalse(blocked, "Producer waited on an in-flight flush")
+        self.assertEqual(queue._events_processed, 6)
+        print("\n   ✅ T21: Producers append while a batch is persisted")
+
+    def test_T22_incremental_auto_vacuum_shrinks_file_after_purge(self):
+        """T22: A fresh queue DB uses auto_vacuum=INCREMENTAL and purges return pages"""
+        queue = IndexerQueue(db_path=self.db_path)
+        queue.start()
+        conn = queue._get_connection()
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        
+        conn.executemany(
+            "INSERT INTO processed_events (event_id, batch_id, processed_at) VALUES (?, 'b', 0)",
+            [(f"event-{i:06d}-{'x' * 64}",) for i in range(20000)]
+        )
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = os.path.getsize(self.db_path)
+        
+        self.assertEqual(queue.purge_processed_events(max_age_s=-1), 20000)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_after = os.path.getsize(self.db_path)
+        queue.stop()
+        
+        self.assertLess(size_after, size_before // 2)
+        print(f"\n   ✅ T22: {size_before} -> {size_after} bytes after purge")
+
+    def test_T23_large_wal_does_not_checkpoint_every_flush(self):
+        """T23: The WAL-size trigger fires on growth, not on every flush past the threshold"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=50)
+        queue.CHECKPOINT_EVERY_BATCHES = 10 ** 6  # size trigger only
+        queue.CHECKPOINT_WAL_BYTES = 256 * 1024
+        queue.start()
+        
+        checkpoints = []
+        original_maintenance = queue._run_maintenance
+        queue._run_maintenance = lambda: (checkpoints.append(1), original_maintenance())
+        
+        payload = "x" * 1024
+        flushes = 60
+        for i in range(flushes * 50):  # ~50 KB per flush
+            queue._on_event_received({"event_id": f"event-{i:05d}", "blob": payload})
+            if queue._checkpoint_thread is not None:
+                queue._checkpoint_thread.join()
+        queue.stop()
+        
+        self.assertGreater(len(checkpoints), 0)
+        self.assertLessEqual(len(checkpoints), flushes // 4)
+        print(f"\n   ✅ T23: {len(checkpoints)} checkpoints for {flushes} flushes")
+
+    def test_T24_size_trigger_hands_off_to_inflight_flush(self):
+        """T24: A full buffer during an in-flight flush is left to that flusher, not waited on"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5, flush_timeout_ms=60000)
+        queue.start()
+        
+        in_persist = threading.Event()
+        release = threading.Event()
+        original_persist = queue._persist_batch
+        
+        def slow_persist(batch_id, events):
+            if not in_persist.is_set():
+                in_persist.set()
+                release.wait(timeout=5.0)
+            original_persist(batch_id, events)
+        
+        queue._persist_batch = slow_persist
+        flusher = threading.Thread(
+            target=lambda: [queue._on_event_received({"event_id": f"first-{i}"}) for i in range(5)]
+        )
+        flusher.start()
+        self.assertTrue(in_persist.wait(timeout=2.0))
+        
+        producer = threading.Thread(
+            target=lambda: [queue._on_event_received({"event_id": f"second-{i}"}) for i in range(5)]
+        )
+        producer.start()
+        producer.join(timeout=1.0)
+        blocked = producer.is_alive()
+        
+        release.set()
+        flusher.join(timeout=5.0)
+        processed = queue._events_processed
+        queue.stop()
+        
+        self.assertFalse(blocked, "Size-triggered flush waited on the in-flight one")
+        self.assertEqual(processed, 10)  # second batch persisted by the first flusher
+        print("\n   ✅ T24: Size-triggered flush handed to the in-flight flusher")
+
+    def test_T25_batch_query_runs_outside_condition(self):
+        """T25: get_next_batch does not hold the Condition while querying SQLite"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5)
+        queue.start()
+        
+        in_query = threading.Event()
+        release = threading.Event()
+        original_try = queue._try_get_batch
+        
+        def slow_try():
+            in_query.set()
+            release.wait(timeout=5.0)
+            return original_try()
+        
+        queue._try_get_batch = slow_try
+        consumer = threading.Thread(target=queue.get_next_batch, kwargs={"timeout": 0.1})
+        consumer.start()
+        self.assertTrue(in_query.wait(timeout=2.0))
+        
+        acquired = queue._batch_available.acquire(timeout=1.0)
+        if acquired:
+            queue._batch_available.release()
+        release.set()
+        consumer.join(timeout=5.0)
+        queue.stop()
+        
+        self.assertTrue(acquired, "Condition held during the batch query")
+        print("\n   ✅ T25: Batch query runs outside the Condition")
+
+    def test_T26_batches_capped_at_batch_size_under_concurrent_producers(self):
+        """T26: Events appended during a slow persist are split into batch_size batches"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=20, flush_timeout_ms=60000)
+        queue.start()
+        
+        in_persist = threading.Event()
+        release = threading.Event()
+        original_persist = queue._persist_batch
+        
+        def slow_persist(batch_id, events):
+            if not in_persist.is_set():
+                in_persist.set()
+                release.wait(timeout=5.0)
+            original_persist(batch_id, events)
+        
+        queue._persist_batch = slow_persist
+        flusher = threading.Thread(
+            target=lambda: [queue._on_event_received({"event_id": f"first-{i:02d}"}) for i in range(20)]
+        )
+        flusher.start()
+        self.assertTrue(in_persist.wait(timeout=2.0))
+        
+        # These pile up behind the in-flight flush, which then drains them
+        def produce(worker):
+            for i in range(200):
+                queue._on_event_received({"event_id": f"w{worker}-event-{i:03d}"})
+        
+        producers = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+        for t in producers:
+            t.start()
+        for t in producers:
+            t.join(timeout=5.0)
+        release.set()
+        flusher.join(timeout=5.0)
+        queue.stop(graceful=True)
+        
+        conn = sqlite3.connect(self.db_path)
+        counts = [row[0] for row in conn.execute("SELECT event_count FROM pending_batches")]
+        conn.close()
+        
+        self.assertEqual(sum(counts), 820)
+        self.assertLessEqual(max(counts), 20)
+        print(f"\n   ✅ T26: {len(counts)} batches, largest {max(counts)} events")
+
+    def test_T27_timer_flush_takes_batches_handed_off_during_persist(self):
+        """T27: A full batch turned away by a timer flush is persisted by it, not the next tick"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5, flush_timeout_ms=60000)
+        queue.start()
+        
+        in_persist = threading.Event()
+        release = threading.Event()
+        original_persist = queue._persist_batch
+        
+        def slow_persist(batch_id, events):
+            if not in_persist.is_set():
+                in_persist.set()
+                release.wait(timeout=5.0)
+            original_persist(batch_id, events)
+        
+        queue._persist_batch = slow_persist
+        queue._on_event_received({"event_id": "early"})
+        timer_flush = threading.Thread(target=queue._flush_buffer)
+        timer_flush.start()
+        self.assertTrue(in_persist.wait(timeout=2.0))
+        
+        # Size trigger fires while the timer flush holds the lock
+        for i in range(5):
+            queue._on_event_received({"event_id": f"late-{i}"})
+        self.assertEqual(len(queue._buffer), 5)
+        
+        release.set()
+        timer_flush.join(timeout=5.0)
+        processed = queue._events_processed
+        buffered = len(queue._buffer)
+        queue.stop()
+        
+        self.assertEqual(processed, 6)
+        self.assertEqual(buffered, 0)
+        print("\n   ✅ T27: Timer flush served the size-triggered batch it turned away")
+    
+    def test_T28_partial_batch_waits_for_timer_after_handoff(self):
+        """T28: Only full batches are handed off; a partial one is left to the timer"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5, flush_timeout_ms=60000)
+        queue.start()
+        
+        in_persist = threading.Event()
+        release = threading.Event()
+        original_persist = queue._persist_batch
+        
+        def slow_persist(batch_id, events):
+            if not in_persist.is_set():
+                in_persist.set()
+                release.wait(timeout=5.0)
+            original_persist(batch_id, events)
+        
+        queue._persist_batch = slow_persist
+        flusher = threading.Thread(
+            target=lambda: [queue._on_event_received({"event_id": f"first-{i}"}) for i in range(5)]
+        )
+        flusher.start()
+        self.assertTrue(in_persist.wait(timeout=2.0))
+        for i in range(3):
+            queue._on_event_received({"event_id": f"partial-{i}"})
+        
+        release.set()
+        flusher.join(timeout=5.0)
+        processed = queue._events_processed
+        buffered = len(queue._buffer)
+        queue.stop(graceful=True)
+        
+        self.assertEqual(processed, 5)
+        self.assertEqual(buffered, 3)
+        self.assertEqual(queue._events_processed, 8)  # stop() flushes the rest
+        print("\n   ✅ T28: Partial batch left for the timer, flushed on stop")
+
+    def test_T29_read_connections_closed_when_thread_exits(self):
+        """T29: Short-lived reader threads do not leave connections behind"""
+        queue = IndexerQueue(db_path=self.db_path, batch_size=5)
+        queue.start()
+        baseline = len(queue._read_conns)
+        
+        opened = []
+        def read():
+            queue.metrics()
+            opened.append(queue._get_read_connection())
+        
+        for _ in range(10):
+            t = threading.Thread(target=read)
+            t.start()
+            t.join()
+        gc.collect()
+        
+        remaining = len(queue._read_conns)
+        queue.stop()
+        
+        self.assertEqual(remaining, baseline)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+        print("\n   ✅ T29: Reader connections closed with their threads")
+    
+    def test_T30_in_memory_reads_take_writer_lock(self):
+        """T30: ':memory:' reads share the writer connection under _db_lock"""
+        queue = IndexerQueue(db_path=":memory:", batch_size=5)
+        queue.start()
+        
+        with queue._reading() as conn:
+            self.assertIs(conn, queue._db_conn)
+            self.assertTrue(queue._db_lock.locked())
+        self.assertFalse(queue._db_lock.locked())
+        
+        for i in range(5):
+            queue._on_event_received({"event_id": f"mem-{i}"})
+        self.assertEqual(queue.metrics().pending_batches, 1)
+        self.assertEqual(queue._read_conns, set())
+        queue.stop()
+        print("\n   ✅ T30: In-memory reads serialized with writes")
+
 
 # ===================================================================
 # MAIN RUNNER
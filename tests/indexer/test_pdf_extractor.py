@@ -111,6 +111,11 @@ def test_T24_02_metadata_extraction(sample_pdf):
     assert result.metadata["author"] == "Test Author"
     
     print(f"\n   ✅ T24.02: Metadata extracted: {result.metadata}")
+    
+    # The indexing default skips the info dict but keeps page_count
+    from src.core.indexer.extractors.pdf_extractor import PDFExtractor
+    lean = PDFExtractor().extract(sample_pdf)
+    assert lean.metadata == {"page_count": 3}
 
 
 @pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
@@ -154,7 +159,7 @@ def test_T24_04_performance_benchmark(sample_pdf):
     p95 = times[94]  # 95th percentile
     p99 = times[98]  # 99th percentile
     
-    print(f"\n   📊 T24.04 Performance:")
+    print("\n   📊 T24.04 Performance:")
     print(f"      P50: {p50:.2f}ms")
     print(f"      P95: {p95:.2f}ms")
     print(f"      P99: {p99:.2f}ms")
@@ -179,7 +184,7 @@ def test_T24_05_file_not_found_handling(tmp_path):
     # Error should indicate file not found
     assert any("not found" in err.message.lower() for err in result.errors)
     
-    print(f"\n   ✅ T24.05: Missing file handled gracefully")
+    print("\n   ✅ T24.05: Missing file handled gracefully")
 
 
 @pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
@@ -202,4 +207,74 @@ def test_T24_06_empty_pdf_handling(tmp_path):
     assert len(result.segments) == 0
     assert result.metadata["page_count"] == 1
     
-    print(f"\n   ✅ T24.06: Empty PDF handled correctly")
+    print("\n   ✅ T24.06: Empty PDF handled correctly")
+
+
+@pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_T24_07_parallel_page_extraction(tmp_path):
+    """T24.07: Multi-process extraction matches serial output and page order"""
+    pdf_path = tmp_path / "large.pdf"
+    
+    # Create PDF above the parallel threshold
+    doc = fitz.open()
+    for i in range(40):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} body text")
+    doc.save(str(pdf_path))
+    doc.close()
+    
+    from src.core.indexer.extractors.pdf_extractor import extract_pdf
+    
+    serial = extract_pdf(pdf_path)
+    parallel = extract_pdf(pdf_path, max_workers=4)
+    
+    assert parallel.success
+    assert [seg.page for seg in parallel.segments] == list(range(1, 41))
+    assert [seg.text for seg in parallel.segments] == [seg.text for seg in serial.segments]
+    
+    print(f"\n   ✅ T24.07: Parallel extraction preserved {len(parallel.segments)} pages in order")
+
+
+@pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_T24_08_bad_page_does_not_drop_rest_of_range(sample_pdf):
+    """T24.08: A page that fails to load is logged and later pages are still extracted"""
+    from src.core.indexer.extractors.pdf_extractor import _extract_pages
+    
+    doc = fitz.open(str(sample_pdf))
+    
+    class OnePageBroken:
+        def load_page(self, i):
+            if i == 1:
+                raise RuntimeError("corrupt page object")
+            return doc.load_page(i)
+    
+    try:
+        segments, page_errors = _extract_pages(OnePageBroken(), 0, doc.page_count)
+    finally:
+        doc.close()
+    
+    assert page_errors == [(2, "corrupt page object")]
+    assert [seg.page for seg in segments] == [1, 3]
+    
+    print("\n   ✅ T24.08: Extraction continued past a bad page")
+
+
+@pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_T24_09_streaming_skips_bad_page(sample_pdf, monkeypatch):
+    """T24.09: iter_segments records a failing page and keeps streaming"""
+    from src.core.indexer.extractors.pdf_extractor import PDFExtractor
+    
+    real_load_page = fitz.Document.load_page
+    def load_page(self, i):
+        if i == 1:
+            raise RuntimeError("corrupt page object")
+        return real_load_page(self, i)
+    monkeypatch.setattr(fitz.Document, "load_page", load_page)
+    
+    page_errors = []
+    segments = list(PDFExtractor().iter_segments(sample_pdf, page_errors))
+    
+    assert page_errors == [(2, "corrupt page object")]
+    assert [seg.page for seg in segments] == [1, 3]
+    
+    print("\n   ✅ T24.09: Streaming continued past a bad page")
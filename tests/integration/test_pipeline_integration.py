@@ -308,5 +308,200 @@ class TestPipelineIntegration(unittest.TestCase):
         # Should return DEGRADED when no extractor is available
         self.assertEqual(status, PipelineStatus.DEGRADED)
 
+    def test_T30_10_batch_single_commit(self):
+        """T30.10: process_batch persists all files with a single commit"""
+        from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+        
+        # Arrange
+        self.pdf_file.touch()
+        self.docx_file.touch()
+        
+        self.mock_extractor.extract.side_effect = [
+            ExtractionResult(segments=[TextSegment(text="alpha batch", page=1)], extractor="pdf_pymupdf"),
+            ExtractionResult(segments=[TextSegment(text="beta batch", section="paragraph_0")], extractor="docx_python"),
+        ]
+        
+        commit_spy = MagicMock(wraps=self.db.commit)
+        self.db.commit = commit_spy
+        
+        # Act
+        statuses = self.pipeline.process_batch([self.pdf_file, self.docx_file])
+        
+        # Assert
+        self.assertEqual(statuses, [PipelineStatus.INDEXED, PipelineStatus.INDEXED])
+        self.assertEqual(commit_spy.call_count, 1)
+        
+        cursor = self.db.execute("SELECT count(*) FROM documents")
+        self.assertEqual(cursor.fetchone()[0], 2)
+        cursor = self.db.execute("SELECT count(*) FROM document_content WHERE document_content MATCH 'batch'")
+        self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_T30_11_mime_detection_fast_path_and_sniffing(self):
+        """T30.11: Known suffixes skip sniffing; misnamed files are sniffed"""
+        from src.core.indexer import pipeline as pipeline_module
+        
+        self.assertEqual(self.pipeline._detect_mime_type(Path("x.PDF")), "application/pdf")
+        
+        if not pipeline_module.LIBMAGIC_AVAILABLE:
+            self.skipTest("libmagic not available")
+        
+        misnamed = self.test_dir / "report.bin"
+        misnamed.write_bytes(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.assertEqual(self.pipeline._detect_mime_type(misnamed), "application/pdf")
+
+    def test_T30_12_streaming_pdf_pages(self):
+        """T30.12: Streaming path writes each page to FTS5 in one commit"""
+        try:
+            import fitz
+        except ImportError:
+            self.skipTest("PyMuPDF not available")
+        # Stateless registry (the pipeline's singleton is mocked in setUp)
+        from src.core.indexer.utils.registry import ExtractorRegistry
+        
+        # Arrange: real PDF + real registry
+        self.pipeline.registry = ExtractorRegistry()
+        doc = fitz.open()
+        for text in ("alpha streaming page", "beta streaming page"):
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(str(self.pdf_file))
+        doc.close()
+        
+        # Act
+        status = self.pipeline.process_file_streaming(self.pdf_file)
+        
+        # Assert
+        self.assertEqual(status, PipelineStatus.INDEXED)
+        cursor = self.db.execute("SELECT count(*) FROM document_content WHERE document_content MATCH 'streaming'")
+        self.assertEqual(cursor.fetchone()[0], 2)
+        cursor = self.db.execute("SELECT mime_type, total_chars FROM documents WHERE filename='sample.pdf'")
+        mime_type, total_chars = cursor.fetchone()
+        self.assertEqual(mime_type, "pdf_pymupdf")
+        self.assertGreater(total_chars, 0)
+        
+        # Corrupted PDF rolls back and is quarantined
+        self.corrupt_file.write_bytes(b"%PDF-1.4\nnot really a pdf")
+        self.assertEqual(
+            self.pipeline.process_file_streaming(self.corrupt_file),
+            PipelineStatus.QUARANTINED
+        )
+
+    def test_T30_13_batch_extracts_and_writes_on_caller(self):
+        """T30.13: process_batch extracts serially and commits once on the caller"""
+        import threading
+        from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+        
+        # Arrange
+        files = [self.test_dir / f"doc_{i}.pdf" for i in range(4)]
+        for f in files:
+            f.touch()
+        
+        extract_threads = set()
+        def fake_extract(path):
+            extract_threads.add(threading.current_thread().name)
+            return ExtractionResult(segments=[TextSegment(text=f"batched {path.stem}", page=1)])
+        self.mock_extractor.extract.side_effect = fake_extract
+        
+        commit_threads = []
+        real_commit = self.db.commit
+        def commit_spy():
+            commit_threads.append(threading.current_thread())
+            real_commit()
+        self.db.commit = commit_spy
+        
+        # Act
+        statuses = self.pipeline.process_batch(files)
+        
+        # Assert
+        self.assertEqual(statuses, [PipelineStatus.INDEXED] * 4)
+        self.assertEqual(extract_threads, {threading.current_thread().name})
+        self.assertEqual(commit_threads, [threading.current_thread()])
+        cursor = self.db.execute("SELECT count(*) FROM document_content WHERE document_content MATCH 'batched'")
+        self.assertEqual(cursor.fetchone()[0], 4)
+        
+        # The same path twice in one batch is claimed, extracted and stored once
+        dup = self.test_dir / "dup.pdf"
+        dup.touch()
+        self.mock_extractor.extract.reset_mock()
+        statuses = self.pipeline.process_batch([dup, dup])
+        self.assertEqual(statuses, [PipelineStatus.INDEXED] * 2)
+        self.assertEqual(self.mock_extractor.extract.call_count, 1)
+        cursor = self.db.execute("SELECT count(*) FROM document_content WHERE document_content MATCH 'dup'")
+        self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_T30_14_batch_db_error_rolls_back(self):
+        """T30.14: A failure midway through _save_to_fts leaves no rows behind"""
+        from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+        
+        # Arrange: documents insert succeeds, content insert fails
+        self.pdf_file.touch()
+        self.docx_file.touch()
+        self.mock_extractor.extract.side_effect = lambda path: ExtractionResult(
+            segments=[TextSegment(text=f"rollback {path.stem}", page=1)]
+        )
+        self.pipeline._SQL_CONTENT = "INSERT INTO missing_table (content) VALUES (?)"
+        
+        # Act
+        statuses = self.pipeline.process_batch([self.pdf_file, self.docx_file])
+        
+        # Assert: batch retried, and a later commit does not flush its rows
+        self.assertEqual(statuses, [PipelineStatus.RETRY, PipelineStatus.RETRY])
+        del self.pipeline._SQL_CONTENT
+        later = self.test_dir / "later.pdf"
+        later.touch()
+        self.assertEqual(self.pipeline.process_file(later), PipelineStatus.INDEXED)
+        
+        cursor = self.db.execute("SELECT filename FROM documents")
+        self.assertEqual([row[0] for row in cursor.fetchall()], ["later.pdf"])
+
+    def test_T30_15_key_error_isolated_to_one_file(self):
+        """T30.15: An OSError while keying one file does not abort the batch"""
+        from unittest.mock import patch
+        from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+        from src.core.indexer.utils.idempotency import EventIdempotency
+        
+        # Arrange
+        self.pdf_file.touch()
+        self.docx_file.touch()
+        self.mock_extractor.extract.side_effect = lambda path: ExtractionResult(
+            segments=[TextSegment(text=f"isolated {path.stem}", page=1)]
+        )
+        real_generate_key = EventIdempotency.generate_key
+        def flaky_generate_key(path):
+            if Path(path) == self.pdf_file:
+                raise OSError("stale file handle")
+            return real_generate_key(path)
+        
+        # Act
+        with patch.object(EventIdempotency, "generate_key", side_effect=flaky_generate_key):
+            statuses = self.pipeline.process_batch([self.pdf_file, self.docx_file])
+        
+        # Assert
+        self.assertEqual(statuses, [PipelineStatus.RETRY, PipelineStatus.INDEXED])
+        cursor = self.db.execute("SELECT filename FROM documents")
+        self.assertEqual([row[0] for row in cursor.fetchall()], ["sample.docx"])
+
+    def test_T30_16_streaming_fallback_detects_mime_once(self):
+        """T30.16: Non-streaming files reuse the MIME type detected by the streaming path"""
+        from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+        
+        # Arrange: extractor without iter_segments forces the fallback
+        self.docx_file.touch()
+        extractor = MagicMock(spec=["extract"])
+        extractor.extract.return_value = ExtractionResult(
+            segments=[TextSegment(text="fallback docx", section="paragraph_0")]
+        )
+        self.pipeline.registry.get_extractor = MagicMock(return_value=extractor)
+        detect_spy = MagicMock(wraps=self.pipeline._detect_mime_type)
+        self.pipeline._detect_mime_type = detect_spy
+        
+        # Act
+        status = self.pipeline.process_file_streaming(self.docx_file)
+        
+        # Assert
+        self.assertEqual(status, PipelineStatus.INDEXED)
+        self.assertEqual(detect_spy.call_count, 1)
+        cursor = self.db.execute("SELECT count(*) FROM document_content WHERE document_content MATCH 'fallback'")
+        self.assertEqual(cursor.fetchone()[0], 1)
+
 if __name__ == '__main__':
     unittest.main()
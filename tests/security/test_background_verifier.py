@@ -0,0 +1,147 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.crypto.hmac_service import HMACService
+from src.core.security.background_verifier import BackgroundChainVerifier
+
+
+def _make_db(path):
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE domain_events (
+            event_id TEXT PRIMARY KEY,
+            stream_type TEXT NOT NULL,
+            stream_id TEXT NOT NULL,
+            stream_sequence INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            event_hmac BLOB NOT NULL,
+            hmac_key_version TEXT NOT NULL DEFAULT 'v1',
+            hmac_alg TEXT NOT NULL DEFAULT 'sha256'
+        )
+    """)
+    return conn
+
+
+def _insert(conn, service, seq, key_version=None, hmac_alg=None):
+    payload = f"event-{seq}".encode()
+    if hmac_alg:
+        # Legacy rows: SHA3 chain stored as hex TEXT
+        event_hmac, version = service.sign(payload, "s1", key_version, hmac_alg=hmac_alg)
+    else:
+        event_hmac, version = service.sign_digest(payload, "s1", key_version)
+    conn.execute(
+        "INSERT INTO domain_events VALUES (?, 'domain', 's1', ?, ?, ?, ?, ?)",
+        (f"evt-{seq}", seq, payload, event_hmac, version, hmac_alg or "sha256"),
+    )
+
+
+@pytest.fixture
+def chain(tmp_path):
+    db_path = tmp_path / "events.db"
+    service = HMACService({"v1": b"old_key"})
+    conn = _make_db(db_path)
+
+    # Legacy SHA3 rows, then SHA-256 rows, then a key rotation mid-stream
+    for seq in range(1, 11):
+        _insert(conn, service, seq, hmac_alg="sha3-256")
+    for seq in range(11, 1500):
+        _insert(conn, service, seq)
+    service.rotate_key(b"new_key")
+    for seq in range(1500, 2501):
+        _insert(conn, service, seq)
+    conn.commit()
+
+    verifier = BackgroundChainVerifier(SimpleNamespace(db_path=db_path, hmac_service=service))
+    yield conn, verifier
+    verifier.shutdown()
+    conn.close()
+
+
+def test_verify_incremental_batches(chain):
+    _, verifier = chain
+    progress = []
+
+    result = verifier._verify_incremental("domain", "s1", 0, progress.append)
+    assert result == {"valid": True, "last_seq": 2500, "total_verified": 2500}
+    assert progress[-1] == 2500
+    assert progress == sorted(progress)
+
+    # Incremental: only rows after start_seq
+    result = verifier._verify_incremental("domain", "s1", 2400, None)
+    assert result["total_verified"] == 100
+
+
+def test_verify_incremental_stops_at_tamper(chain):
+    conn, verifier = chain
+    conn.execute("UPDATE domain_events SET payload = ? WHERE stream_sequence = 1200", (b"forged",))
+    conn.commit()
+
+    result = verifier._verify_incremental("domain", "s1", 0, None)
+    assert result == {"valid": False, "last_seq": 1199, "total_verified": 1199}
+
+
+def test_worker_connection_reused(tmp_path):
+    db_path = tmp_path / "events.db"
+    service = HMACService({"v1": b"key"})
+    conn = _make_db(db_path)
+    _insert(conn, service, 1)
+    conn.commit()
+
+    verifier = BackgroundChainVerifier(
+        SimpleNamespace(db_path=db_path, hmac_service=service), max_workers=1
+    )
+    try:
+        run = lambda start: verifier.executor.submit(
+            verifier._verify_incremental, "domain", "s1", start, None
+        ).result()
+        assert run(0)["last_seq"] == 1
+
+        # Read snapshot ended with the call, so the next one sees new rows
+        _insert(conn, service, 2)
+        conn.commit()
+        assert run(1) == {"valid": True, "last_seq": 2, "total_verified": 1}
+        assert len(verifier._connections) == 1
+    finally:
+        verifier.shutdown()
+        conn.close()
+    assert verifier._connections == []
+
+
+def test_progress_delivered_on_event_loop(chain):
+    import asyncio
+    import threading
+
+    _, verifier = chain
+    reports = []
+
+    async def run():
+        ok = await verifier.verify_stream_async(
+            "domain", "s1", lambda n: reports.append((n, threading.get_ident()))
+        )
+        await asyncio.sleep(0)  # let the last relayed report run
+        return ok
+
+    assert asyncio.run(run()) is True
+    assert reports
+    assert reports[-1][0] == 2500
+    assert {tid for _, tid in reports} == {threading.get_ident()}
+
+
+def test_verify_all_streams(chain):
+    import asyncio
+
+    conn, verifier = chain
+    service = verifier.adapter.hmac_service
+    payload = b"other"
+    event_hmac, version = service.sign_digest(payload, "s2")
+    conn.execute(
+        "INSERT INTO domain_events VALUES ('evt-s2', 'domain', 's2', 1, ?, ?, ?, 'sha256')",
+        (b"forged", event_hmac, version),
+    )
+    conn.commit()
+
+    streams = [("domain", "s1"), ("domain", "s2"), ("domain", "s1")]
+    results = asyncio.run(verifier.verify_all_streams(streams))
+    assert results == {("domain", "s1"): True, ("domain", "s2"): False}
@@ -0,0 +1,53 @@
+import pytest
+
+nacl_utils = pytest.importorskip("nacl.utils")
+
+from src.core.security import encryption
+from src.core.security.encryption import (
+    DEK_WRAP_AES256GCM,
+    DEK_WRAP_XCHACHA20,
+    EncryptionService,
+)
+
+
+def test_wrap_dek_xchacha20_roundtrip():
+    kek, dek = nacl_utils.random(32), nacl_utils.random(32)
+    wrapped = EncryptionService.wrap_dek(kek, dek, DEK_WRAP_XCHACHA20)
+    assert len(wrapped) == 24 + 32 + 16
+    assert EncryptionService.unwrap_dek(kek, wrapped, DEK_WRAP_XCHACHA20) == dek
+
+
+@pytest.mark.skipif(not encryption.HAS_AESGCM, reason="pycryptodome not installed")
+def test_wrap_dek_aes256gcm_roundtrip():
+    kek, dek = nacl_utils.random(32), nacl_utils.random(32)
+    wrapped = EncryptionService.wrap_dek(kek, dek, DEK_WRAP_AES256GCM)
+    assert len(wrapped) == 12 + 32 + 16
+    assert EncryptionService.unwrap_dek(kek, wrapped, DEK_WRAP_AES256GCM) == dek
+
+    tampered = wrapped[:-1] + bytes([wrapped[-1] ^ 1])
+    with pytest.raises(ValueError):
+        EncryptionService.unwrap_dek(kek, tampered, DEK_WRAP_AES256GCM)
+
+
+def test_dek_decrypt_defaults_to_xchacha20():
+    # Blobs written before AES-GCM wrapping must open on any host
+    kek, dek = nacl_utils.random(32), nacl_utils.random(32)
+    wrapped = EncryptionService.wrap_dek(kek, dek, DEK_WRAP_XCHACHA20)
+    assert EncryptionService.unwrap_dek(kek, wrapped) == dek
+    assert EncryptionService.unwrap_dek(kek, EncryptionService.wrap_dek(kek, dek)) == dek
+
+    result = EncryptionService.encrypt_dek(dek, kek, DEK_WRAP_XCHACHA20)
+    assert EncryptionService.decrypt_dek(result["ciphertext"], result["nonce"], kek) == dek
+
+
+def test_dek_encrypt_and_decrypt_defaults_match():
+    # Omitting the algorithm on both sides must round-trip on every host
+    kek, dek = nacl_utils.random(32), nacl_utils.random(32)
+    result = EncryptionService.encrypt_dek(dek, kek)
+    assert result["algorithm"] == DEK_WRAP_XCHACHA20
+    assert EncryptionService.decrypt_dek(result["ciphertext"], result["nonce"], kek) == dek
+
+
+def test_wrap_dek_unknown_algorithm():
+    with pytest.raises(ValueError):
+        EncryptionService.wrap_dek(b"k" * 32, b"d" * 32, "ROT13")
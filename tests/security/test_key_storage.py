@@ -0,0 +1,71 @@
+import asyncio
+import gc
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from src.core.security import key_storage, storage
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _worker_threads():
+    return [t for t in threading.enumerate() if "_connection_worker_thread" in t.name]
+
+
+@pytest.mark.parametrize("make", [
+    lambda p: storage.KeyStorage(p / "a.db"),
+    lambda p: key_storage.KeyStorage(str(p / "b" / "b.db")),
+])
+def test_unclosed_storage_stops_worker_when_collected(tmp_path, make):
+    before = len(_worker_threads())
+
+    async def use():
+        ks = make(tmp_path)
+        if isinstance(ks, storage.KeyStorage):
+            await ks.ensure_table_exists()
+        else:
+            await ks.key_exists()
+        assert len(_worker_threads()) == before + 1
+
+    asyncio.run(use())
+    gc.collect()
+    for t in _worker_threads()[before:]:
+        t.join(timeout=5)
+    assert len(_worker_threads()) == before
+
+
+def test_close_detaches_cleanup_hook(tmp_path):
+    async def use():
+        async with storage.KeyStorage(tmp_path / "a.db") as ks:
+            await ks.ensure_table_exists()
+            finalizer = ks._db_finalizer
+            assert finalizer.alive
+        assert not finalizer.alive
+        assert ks._db_finalizer is None
+
+    asyncio.run(use())
+
+
+def test_unclosed_module_level_storage_does_not_block_exit(tmp_path):
+    script = textwrap.dedent(f"""
+        import asyncio
+        from pathlib import Path
+        from src.core.security.storage import KeyStorage
+        ks = KeyStorage(Path({str(tmp_path / "g.db")!r}))
+        asyncio.run(ks.ensure_table_exists())
+        print("done")
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "done"
+    assert "Traceback" not in result.stderr
@@ -24,3 +24,57 @@ def test_kms_invalid_passkey(tmp_path):
     # Wrong pass
     assert kms.unlock('wrong') is False
     assert kms.is_unlocked is False
+
+def test_kms_async_vault_flow(tmp_path):
+    import asyncio
+
+    kms = KMS(storage_path=str(tmp_path / 'async.json'))
+
+    async def flow():
+        assert await kms.initialize_vault('secret') is True
+        assert await kms.unlock_vault('wrong') is False
+        return await kms.unlock_vault('secret')
+
+    assert asyncio.run(flow()) is True
+    assert kms.is_unlocked is True
+
+def test_kms_repeat_unlock_uses_cached_kek(tmp_path, monkeypatch):
+    from src.core.security import kms as kms_module
+
+    kms = KMS(storage_path=str(tmp_path / 'cache.json'))
+    kms.initialize('secret')
+
+    calls = []
+    real_kdf = kms_module.argon2id.kdf
+    monkeypatch.setattr(
+        kms_module.argon2id, 'kdf', lambda *a, **kw: calls.append(1) or real_kdf(*a, **kw)
+    )
+
+    # KEK from initialize() is reused; a wrong passphrase still pays for Argon2id
+    assert kms.unlock('secret') is True
+    assert calls == []
+    assert kms.unlock('wrong') is False
+    assert len(calls) == 1
+
+    kms.close()
+    assert kms.is_unlocked is False
+    assert kms.master_key is None
+    assert kms.unlock('secret') is True
+    assert len(calls) == 2
+
+def test_kms_get_keys_derived_once(tmp_path):
+    from src.core.security.encryption import EncryptionService
+
+    kms = KMS(storage_path=str(tmp_path / 'keys.json'))
+    kms.initialize('secret')
+    with pytest.raises(RuntimeError):
+        kms.get_keys()
+
+    kms.unlock('secret')
+    keys = kms.get_keys()
+    assert keys == EncryptionService.derive_keys(kms.master_key)
+    assert kms.get_keys() is keys
+
+    kms.close()
+    with pytest.raises(RuntimeError):
+        kms.get_keys()
@@ -11,6 +11,7 @@ from src.core.security.recovery import (
     generate_recovery_phrase,
     validate_phrase,
     phrase_to_seed,
+    phrases_to_seeds,
     derive_recovery_key,
     get_recovery_params,
     RecoveryError,
@@ -121,6 +122,17 @@ class TestSeedDerivation:
         """Test seed derivation with invalid phrase."""
         with pytest.raises(RecoveryPhraseInvalidError):
             await phrase_to_seed("invalid phrase here")
+    
+    @pytest.mark.asyncio
+    async def test_phrases_to_seeds_matches_single(self):
+        """Test concurrent seed derivation keeps order and results."""
+        phrases = [generate_recovery_phrase() for _ in range(4)]
+        
+        seeds = await phrases_to_seeds(phrases, passphrase="pw")
+        
+        assert seeds == [await phrase_to_seed(p, passphrase="pw") for p in phrases]
+        with pytest.raises(RecoveryPhraseInvalidError):
+            await phrases_to_seeds([phrases[0], "invalid phrase here"])
 
 
 class TestRecoveryKeyDerivation:
@@ -133,7 +145,7 @@ class TestRecoveryKeyDerivation:
         seed = await phrase_to_seed(phrase)
         salt = os.urandom(16)
         
-        key = derive_recovery_key(seed, salt)
+        key = await derive_recovery_key(seed, salt)
         
         assert isinstance(key, bytes)
         assert len(key) == 32  # Standard key length
@@ -145,8 +157,8 @@ class TestRecoveryKeyDerivation:
         seed = await phrase_to_seed(phrase)
         salt = os.urandom(16)
         
-        key1 = derive_recovery_key(seed, salt)
-        key2 = derive_recovery_key(seed, salt)
+        key1 = await derive_recovery_key(seed, salt)
+        key2 = await derive_recovery_key(seed, salt)
         
         assert key1 == key2
     
@@ -159,12 +171,13 @@ class TestRecoveryKeyDerivation:
         salt1 = os.urandom(16)
         salt2 = os.urandom(16)
         
-        key1 = derive_recovery_key(seed, salt1)
-        key2 = derive_recovery_key(seed, salt2)
+        key1 = await derive_recovery_key(seed, salt1)
+        key2 = await derive_recovery_key(seed, salt2)
         
         assert key1 != key2
     
-    def test_derive_recovery_key_invalid_salt_length(self):
+    @pytest.mark.asyncio
+    async def test_derive_recovery_key_invalid_salt_length(self):
         """Test that invalid salt length raises ValueError."""
         seed = os.urandom(64)
         
@@ -179,7 +192,7 @@ class TestRecoveryKeyDerivation:
         
         for salt in invalid_salts:
             with pytest.raises(ValueError, match="Salt must be exactly 16 bytes"):
-                derive_recovery_key(seed, salt)
+                await derive_recovery_key(seed, salt)
 
 
 class TestRecoveryParameters:
@@ -218,7 +231,7 @@ class TestIntegration:
         
         # Step 4: Derive recovery key
         salt = os.urandom(16)
-        key = derive_recovery_key(seed, salt)
+        key = await derive_recovery_key(seed, salt)
         assert len(key) == 32
     
     @pytest.mark.asyncio
@@ -230,11 +243,11 @@ class TestIntegration:
         
         # First run
         seed1 = await phrase_to_seed(phrase, passphrase)
-        key1 = derive_recovery_key(seed1, salt)
+        key1 = await derive_recovery_key(seed1, salt)
         
         # Second run with same inputs
         seed2 = await phrase_to_seed(phrase, passphrase)
-        key2 = derive_recovery_key(seed2, salt)
+        key2 = await derive_recovery_key(seed2, salt)
         
         # Should be identical
         assert seed1 == seed2
@@ -4,8 +4,9 @@ Tests Triple-Stream Event architecture validation
 FIXED for Python 3.14 + Pydantic 2.12.4 + Current Schema
 """
 
+import dataclasses
+
 import pytest
-from pydantic import ValidationError
 
 from src.core.schemas.events import (
     DomainEvent,
@@ -26,8 +27,8 @@ def test_create_domain_event_success():
         global_sequence=1,
         timestamp=1234567890,
         payload={"note_id": "n-abc", "action": "created"},
-        event_hash="hash123",
-        event_hmac="hmac123"
+        event_hash=b"hash123",
+        event_hmac=b"hmac123"
     )
     
     assert event.event_id == "evt-test123"
@@ -46,8 +47,8 @@ def test_create_interaction_event_success():
         global_sequence=2,
         timestamp=1234567891,
         payload={"action": "portal_opened", "target": "notes"},
-        event_hash="hash456",
-        event_hmac="hmac456"
+        event_hash=b"hash456",
+        event_hmac=b"hmac456"
     )
     
     assert event.event_id == "evt-test456"
@@ -65,8 +66,8 @@ def test_create_memory_event_success():
         global_sequence=3,
         timestamp=1234567892,
         payload={"decision": "use_argon2id", "rationale": "OWASP 2025 compliant"},
-        event_hash="hash789",
-        event_hmac="hmac789"
+        event_hash=b"hash789",
+        event_hmac=b"hmac789"
     )
     
     assert event.event_id == "evt-test789"
@@ -84,17 +85,17 @@ def test_event_immutability():
         global_sequence=4,
         timestamp=1234567893,
         payload={},
-        event_hash="hash",
-        event_hmac="hmac"
+        event_hash=b"hash",
+        event_hmac=b"hmac"
     )
     
-    with pytest.raises(ValidationError):
+    with pytest.raises(dataclasses.FrozenInstanceError):
         event.event_id = "new-id"
 
 
 def test_extra_fields_forbidden():
     """Test that extra fields are forbidden."""
-    with pytest.raises(ValidationError):
+    with pytest.raises(TypeError):
         DomainEvent(
             event_id="evt-extra",
             stream_type=StreamType.DOMAIN,
@@ -104,7 +105,7 @@ def test_extra_fields_forbidden():
             global_sequence=5,
             timestamp=1234567894,
             payload={},
-            event_hash="hash",
-            event_hmac="hmac",
+            event_hash=b"hash",
+            event_hmac=b"hmac",
             malicious_field="should_fail"
         )
\ No newline at end of file
@@ -0,0 +1,88 @@
+import pytest
+import orjson
+from src.core.indexer.extractors.result import ExtractionResult, TextSegment
+
+def test_add_segment_updates_aggregates():
+    result = ExtractionResult()
+    result.add_segment(TextSegment(text="hello"))
+    result.add_segment(TextSegment(text="world!"))
+    
+    assert result.total_chars == 11
+    assert result.total_text == "hello\n\nworld!"
+    
+    # Cache is invalidated by the next segment
+    result.add_segment(TextSegment(text="x"))
+    assert result.total_chars == 12
+    assert result.total_text == "hello\n\nworld!\n\nx"
+
+def test_aggregates_include_constructor_and_direct_segments():
+    result = ExtractionResult(segments=[TextSegment(text="ab")])
+    assert result.total_chars == 2
+    
+    # Legacy callers appending to the list directly are still counted
+    result.segments.append(TextSegment(text="cde"))
+    assert result.total_chars == 5
+    assert result.total_text == "ab\n\ncde"
+    assert result.to_dict()["total_chars"] == 5
+
+def test_aggregates_follow_replaced_segments():
+    result = ExtractionResult(segments=[TextSegment(text="alpha")])
+    assert result.total_text == "alpha"
+    
+    # Same length, different content: the cache must not be reused
+    result.segments[0] = TextSegment(text="omega-longer")
+    assert result.total_text == "omega-longer"
+    assert result.total_chars == 12
+    
+    result.segments = [TextSegment(text="beta")]
+    assert result.total_text == "beta"
+    assert result.total_chars == 4
+    
+    result.segments[0].text = "gamma!"
+    assert result.total_chars == 6
+    
+    result.segments.clear()
+    assert result.total_text == ""
+    assert result.total_chars == 0
+
+def test_add_segment_skips_the_identity_pass(monkeypatch):
+    calls = []
+    original = ExtractionResult._sync_aggregates
+    monkeypatch.setattr(
+        ExtractionResult, "_sync_aggregates",
+        lambda self: (calls.append(1), original(self))[1]
+    )
+    result = ExtractionResult()
+    for i in range(100):
+        result.add_segment(TextSegment(text=str(i)))
+    assert calls == []
+    
+    # A direct append followed by add_segment is still reconciled on read
+    result.segments.append(TextSegment(text="x"))
+    result.add_segment(TextSegment(text="yz"))
+    assert result.total_text.endswith("99\n\nx\n\nyz")
+    assert result.total_chars == 190 + 3
+
+def test_to_json_and_to_dict_shape():
+    result = ExtractionResult(extractor="pdf_pymupdf", metadata={"page_count": 1})
+    result.add_segment(TextSegment(text="hello", page=1))
+    result.add_error("CORRUPTED", "page 2 failed", recoverable=True)
+    
+    data = result.to_dict()
+    assert data == orjson.loads(result.to_json())
+    assert data["segments"] == [{"text": "hello", "page": 1, "section": None, "confidence": 1.0}]
+    assert data["errors"] == [{"code": "CORRUPTED", "message": "page 2 failed", "recoverable": True}]
+    assert data["total_chars"] == 5
+    assert data["success"] is False
+    assert data["partial_success"] is True
+    # Private cache fields are not serialized
+    assert not any(key.startswith("_") for key in data)
+
+
+def test_text_segment_validation_in_debug_builds():
+    if not __debug__:
+        pytest.skip("validation is compiled out under -O")
+    with pytest.raises(TypeError):
+        TextSegment(text=b"bytes")
+    with pytest.raises(ValueError):
+        TextSegment(text="x", confidence=1.5)
@@ -57,3 +57,53 @@ def test_hmac_service_key_rotation():
     
     # Cross verification should fail
     assert service.verify(payload, hmac_v1, stream_id, 'v2') is False
+
+def test_hmac_service_legacy_sha3_verify():
+    keys = {'v1': b'secret_key'}
+    service = HMACService(keys)
+    payload = b'test_payload'
+    stream_id = 'stream_1'
+
+    # Default chain is HMAC-SHA-256
+    hmac_sha256, _ = service.sign(payload, stream_id)
+    assert service.verify(payload, hmac_sha256, stream_id, 'v1') is True
+
+    # Rows written before the switch are verified with their stored algorithm
+    hmac_sha3, _ = service.sign(payload, stream_id, hmac_alg='sha3-256')
+    assert hmac_sha3 != hmac_sha256
+    assert service.verify(payload, hmac_sha3, stream_id, 'v1', 'sha3-256') is True
+    assert service.verify(payload, hmac_sha3, stream_id, 'v1') is False
+
+    with pytest.raises(ValueError):
+        service.sign(payload, stream_id, hmac_alg='md5')
+
+def test_hmac_service_verify_many():
+    keys = {'v1': b'secret_key'}
+    service = HMACService(keys)
+    stream_id = 'stream_1'
+    payloads = [f'payload-{i}'.encode() for i in range(10)]
+    hmacs = [service.sign(p, stream_id)[0] for p in payloads]
+
+    assert service.verify_many(payloads, hmacs, stream_id, 'v1') == 10
+
+    # Stops at the first mismatch
+    tampered = list(payloads)
+    tampered[4] = b'tampered'
+    assert service.verify_many(tampered, hmacs, stream_id, 'v1') == 4
+
+    assert service.verify_many(payloads, hmacs, stream_id, 'v9') == 0
+
+def test_hmac_service_raw_digest():
+    keys = {'v1': b'secret_key'}
+    service = HMACService(keys)
+    payload = b'test_payload'
+
+    digest, version = service.sign_digest(payload, 'stream_1')
+    assert version == 'v1'
+    assert len(digest) == 32
+    assert digest.hex() == service.sign(payload, 'stream_1')[0]
+
+    # BLOB rows hold the raw digest, legacy TEXT rows the hex form
+    assert service.verify(payload, digest, 'stream_1', 'v1') is True
+    assert service.verify(payload, digest.hex(), 'stream_1', 'v1') is True
+    assert service.verify(b'tampered', digest, 'stream_1', 'v1') is False
@@ -0,0 +1,83 @@
+import asyncio
+import importlib
+import sqlite3
+
+from src.core.crypto.hmac_service import HMAC_ALG_SHA256, LEGACY_HMAC_ALG
+
+
+class _AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+
+class _AsyncConn:
+    """Just enough of an aiosqlite connection for the migration scripts."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def execute(self, sql, params=()):
+        return _AsyncCursor(self._conn.execute(sql, params))
+
+
+def test_004_backfills_legacy_rows_and_defaults_to_current_alg():
+    migration = importlib.import_module("src.core.storage.migrations.004_add_hmac_alg")
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE domain_events (event_id INTEGER PRIMARY KEY, event_hmac BLOB NOT NULL)")
+    conn.execute("INSERT INTO domain_events (event_hmac) VALUES (x'00')")
+
+    asyncio.run(migration.upgrade(_AsyncConn(conn)))
+    conn.execute("INSERT INTO domain_events (event_hmac) VALUES (x'01')")
+
+    rows = conn.execute("SELECT hmac_alg FROM domain_events ORDER BY event_id").fetchall()
+    assert rows == [(LEGACY_HMAC_ALG,), (HMAC_ALG_SHA256,)]
+
+    # Re-running is a no-op and does not re-tag new rows as legacy
+    asyncio.run(migration.upgrade(_AsyncConn(conn)))
+    assert conn.execute("SELECT hmac_alg FROM domain_events ORDER BY event_id").fetchall() == rows
+
+
+def test_005_rebuilds_strict_text_hmac_as_blob():
+    migration = importlib.import_module("src.core.storage.migrations.005_event_hmac_blob")
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE domain_events (
+            event_id TEXT PRIMARY KEY,
+            stream_id TEXT NOT NULL,
+            event_hmac TEXT NOT NULL,
+            hmac_alg TEXT NOT NULL DEFAULT 'sha256'
+        ) STRICT
+    """)
+    conn.execute("CREATE INDEX idx_stream ON domain_events(stream_id)")
+    conn.execute("INSERT INTO domain_events VALUES ('e1', 's', ?, 'sha3-256')", ("ab" * 32,))
+
+    # Raw digests are rejected by the legacy column
+    try:
+        conn.execute("INSERT INTO domain_events VALUES ('e2', 's', ?, 'sha256')", (b"\x01" * 32,))
+    except sqlite3.IntegrityError:
+        pass
+    else:
+        raise AssertionError("STRICT TEXT column accepted bytes")
+
+    asyncio.run(migration.upgrade(_AsyncConn(conn)))
+
+    types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(domain_events)")}
+    assert types["event_hmac"] == "BLOB"
+    assert conn.execute("SELECT event_hmac, hmac_alg FROM domain_events").fetchall() == [
+        (b"\xab" * 32, "sha3-256")
+    ]
+    assert conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_stream'"
+    ).fetchone()
+    assert "STRICT" in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'domain_events'"
+    ).fetchone()[0]
+
+    conn.execute("INSERT INTO domain_events VALUES ('e2', 's', ?, 'sha256')", (b"\x01" * 32,))
+
+    # Re-running is a no-op
+    asyncio.run(migration.upgrade(_AsyncConn(conn)))
+    assert conn.execute("SELECT count(*) FROM domain_events").fetchone()[0] == 2
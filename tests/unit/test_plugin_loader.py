@@ -67,3 +67,10 @@ def test_reject_invalid_header(plugin_loader, invalid_header_plugin_file):
 def test_plugin_not_found(plugin_loader):
     with pytest.raises(FileNotFoundError):
         plugin_loader.load_plugin(Path("non_existent.py"))
+
+def test_reject_header_outside_scan_window(plugin_loader, tmp_path):
+    p = tmp_path / "late_header_plugin.py"
+    padding = "#" * PluginLoader.HEADER_SCAN_BYTES + "\n"
+    p.write_text(padding + VALID_PLUGIN_CODE, encoding='utf-8')
+    with pytest.raises(SecurityError, match="Missing 'PolyForm Noncommercial' header"):
+        plugin_loader.load_plugin(p)